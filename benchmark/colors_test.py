@@ -0,0 +1,38 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel import colors
+from bibliopixel.colors import palette
+
+LENGTH = 5000
+HSVS = [(i % 256, 200, 180) for i in range(LENGTH)]
+
+
+def test_hsv2rgb(benchmark):
+    benchmark(lambda: [colors.hsv2rgb(hsv) for hsv in HSVS])
+
+
+def test_hsv2rgb_many(benchmark):
+    benchmark(colors.hsv2rgb_many, HSVS)
+
+
+def test_hue_helper(benchmark):
+    benchmark(lambda: [colors.hue_helper(p, LENGTH, 7) for p in range(LENGTH)])
+
+
+def test_hue_helper_many(benchmark):
+    benchmark(colors.hue_helper_many, LENGTH, 7)
+
+
+def test_wheel_helper(benchmark):
+    benchmark(lambda: [colors.wheel_helper(p, LENGTH, 7)
+                       for p in range(LENGTH)])
+
+
+def test_wheel_helper_many(benchmark):
+    benchmark(colors.wheel_helper_many, LENGTH, 7)
+
+
+def test_palette_sample(benchmark):
+    p = palette.Palette(['red', 'yellow', 'blue'], wrap=True)
+    benchmark(p.sample, palette.strip_indices(LENGTH), 7)
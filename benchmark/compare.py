@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+
+"""
+Compare pytest-benchmark results against a stored baseline.
+
+Record results as JSON with:
+
+    python -m pytest benchmark --benchmark-json=results.json
+
+then compare them with:
+
+    python benchmark/compare.py results.json                # uses baseline.json
+    python benchmark/compare.py results.json --save         # new baseline
+
+Exits with status 1 if any benchmark is slower than the baseline by more
+than the tolerance.
+"""
+
+import argparse, json, os, shutil, sys
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline.json')
+
+
+def load(filename):
+    with open(filename) as fp:
+        data = json.load(fp)
+    return {b['fullname']: b['stats'] for b in data['benchmarks']}
+
+
+def compare(results, baseline, stat='median'):
+    """Yields name, baseline time, result time, ratio - sorted by ratio."""
+    rows = []
+    for name, stats in results.items():
+        if name in baseline:
+            old, new = baseline[name][stat], stats[stat]
+            rows.append((name, old, new, new / old))
+    return sorted(rows, key=lambda r: r[-1], reverse=True)
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('results', help='JSON from --benchmark-json')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='allowed slowdown, as a fraction')
+    parser.add_argument('--stat', default='median',
+                        choices=('min', 'max', 'mean', 'median'))
+    parser.add_argument('--save', action='store_true',
+                        help='save the results as the new baseline')
+    args = parser.parse_args(args)
+
+    if args.save:
+        shutil.copyfile(args.results, args.baseline)
+        print('Saved baseline to', args.baseline)
+        return 0
+
+    results, baseline = load(args.results), load(args.baseline)
+    rows = compare(results, baseline, args.stat)
+    regressions = [r for r in rows if r[-1] > 1 + args.tolerance]
+
+    for name, old, new, ratio in rows:
+        flag = '  SLOWER' if ratio > 1 + args.tolerance else ''
+        print('%7.2fx %12.6fs %12.6fs  %s%s' % (ratio, old, new, name, flag))
+
+    missing = sorted(set(baseline) - set(results))
+    if missing:
+        print('Not in results:', *missing, sep='\n    ')
+
+    print('%d benchmarks compared, %d regressions' % (
+        len(rows), len(regressions)))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
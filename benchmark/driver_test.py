@@ -0,0 +1,90 @@
+from unittest import mock
+
+import pytest
+import pytest_benchmark
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.drivers.network import Network
+from bibliopixel.drivers.return_codes import RETURN_CODES
+from bibliopixel.drivers.serial import Serial
+from bibliopixel.drivers.SimPixel import SimPixel
+from bibliopixel.drivers.SPI import SPI, SPI_INTERFACES
+from bibliopixel.project import data_maker
+
+
+PIXEL_COUNTS = 100, 1000, 10000, 100000
+
+
+def make_spi(ledtype):
+    def make(num):
+        try:
+            return SPI(ledtype=ledtype, num=num,
+                       interface=SPI_INTERFACES.DUMMY)
+        except ValueError as e:
+            pytest.skip(str(e))  # Too many pixels for this chipset.
+
+    return make
+
+
+def make_serial(num):
+    if 3 * num > 0xFFFF:
+        pytest.skip('Serial packets are limited to 64KB')
+
+    # Don't look for real hardware.
+    with mock.patch.object(Serial, '_connect',
+                           return_value=RETURN_CODES.SUCCESS):
+        return Serial(ledtype='WS2812', num=num)
+
+
+DRIVERS = {
+    'APA102': make_spi('APA102'),
+    'LPD8806': make_spi('LPD8806'),
+    'WS2801': make_spi('WS2801'),
+    'WS281X': make_spi('WS2812'),
+    'Serial': make_serial,
+    'Network': lambda num: Network(num=num),
+    'SimPixel': lambda num: SimPixel(num=num),
+}
+
+MAKERS = {
+    'list': data_maker.Maker(),
+    'shared': data_maker.Maker(shared_memory=True, floating=False),
+    'numpy': data_maker.Maker(use_numpy=True),
+    'indexed': data_maker.Maker(indexed=True),
+    'compact': data_maker.Maker(compact=True),
+}
+
+
+def make_colors(maker, num):
+    colors = maker[1](num)
+    colors[:] = [(i % 256, (2 * i) % 256, (3 * i) % 256) for i in range(num)]
+    return colors
+
+
+def make_driver(name, num, maker=data_maker.MAKER):
+    driver = DRIVERS[name](num)
+    driver.set_colors(make_colors(maker, num), 0)
+    return driver
+
+
+@pytest.mark.parametrize('num', PIXEL_COUNTS)
+@pytest.mark.parametrize('name', sorted(DRIVERS))
+def test_render(benchmark, name, num):
+    benchmark(make_driver(name, num)._render)
+
+
+@pytest.mark.parametrize('num', PIXEL_COUNTS)
+@pytest.mark.parametrize('name', sorted(DRIVERS))
+def test_compute_packet(benchmark, name, num):
+    benchmark(make_driver(name, num)._compute_packet)
+
+
+@pytest.mark.parametrize('num', PIXEL_COUNTS)
+@pytest.mark.parametrize('maker', sorted(MAKERS))
+def test_render_maker(benchmark, maker, num):
+    if maker == 'numpy' and not data_maker.numpy:
+        pytest.skip('numpy is not installed')
+
+    driver = DriverBase(num=num)
+    driver.set_colors(make_colors(MAKERS[maker], num), 0)
+    benchmark(driver._render)
@@ -0,0 +1,34 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Matrix, TextStrip, font
+
+WHITE = (255, 255, 255)
+TEXT = 'The quick brown fox jumps over the lazy dog'
+
+
+def make_matrix(width, height):
+    return Matrix(DriverBase(num=width * height), width=width, height=height)
+
+
+@pytest.mark.parametrize('font_scale', [1, 4])
+def test_draw_text(benchmark, font_scale):
+    matrix = make_matrix(256, 32)
+    benchmark(matrix.drawText, TEXT, color=WHITE, font_scale=font_scale)
+
+
+def test_str_dim(benchmark):
+    benchmark(font.str_dim, TEXT * 10)
+
+
+def test_scroll_text_strip(benchmark):
+    matrix = make_matrix(64, 8)
+    strip = TextStrip(TEXT * 10, WHITE)
+    strip.render()
+    benchmark(strip.draw, matrix, -1000)
+
+
+def test_scroll_draw_text(benchmark):
+    matrix = make_matrix(64, 8)
+    benchmark(matrix.drawText, TEXT * 10, -1000, color=WHITE)
@@ -0,0 +1,30 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel.animation.strip import BaseStripAnim
+from bibliopixel.drivers.dummy_driver import Dummy
+from bibliopixel.layout import Strip
+from bibliopixel.project import data_maker
+
+FRAMES = 100
+
+
+class Rainbow(BaseStripAnim):
+    def step(self, amt=1):
+        for i in range(self.layout.numLEDs):
+            self.layout.set(i, ((i + self._step) % 256, 128, 64))
+        self._step += amt
+
+
+@pytest.mark.parametrize('num', [100, 1000, 10000])
+@pytest.mark.parametrize('threaded_update', [False, True])
+def test_frames_per_second(benchmark, num, threaded_update):
+    layout = Strip(Dummy(num=num), threadedUpdate=threaded_update)
+    anim = Rainbow(layout)
+
+    def run():
+        anim.run(max_steps=FRAMES)
+
+    benchmark.pedantic(run, rounds=3)
+    if benchmark.stats:
+        benchmark.extra_info['fps'] = FRAMES / benchmark.stats.stats.mean
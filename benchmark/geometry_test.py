@@ -0,0 +1,37 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel.layout import (
+    make_circle_coord_map, make_cube_coord_map, make_matrix_coord_map)
+from bibliopixel.layout.geometry.rotation import Rotation
+
+
+@pytest.mark.parametrize('size', [16, 64, 256])
+def test_matrix_coord_map(benchmark, size):
+    benchmark(make_matrix_coord_map, size, size, serpentine=True,
+              rotation=Rotation.ROTATE_90, y_flip=True)
+
+
+@pytest.mark.parametrize('size', [4, 16, 32])
+def test_cube_coord_map(benchmark, size):
+    benchmark(make_cube_coord_map, size, size, size)
+
+
+def test_circle_coord_map(benchmark):
+    rings = [[0, 1], [1, 8], [9, 20], [21, 44], [45, 92], [93, 188]]
+    benchmark(make_circle_coord_map, rings=rings)
+
+
+@pytest.mark.parametrize('transpose', [False, True])
+def test_geometry_matrix_get(benchmark, transpose):
+    from bibliopixel.layout.geometry import matrix
+
+    m = matrix.Matrix(list(range(64 * 64)), 64, reflect_x=True,
+                      serpentine_x=True, transpose=transpose)
+
+    def get_all():
+        for y in range(64):
+            for x in range(64):
+                m.get(x, y)
+
+    benchmark(get_all)
@@ -0,0 +1,49 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Matrix
+from bibliopixel.util import image
+
+Image = pytest.importorskip('PIL.Image')
+
+
+@pytest.fixture(scope='module')
+def gif(tmpdir_factory):
+    frames = [Image.new('RGB', (64, 64), (i, 2 * i, 3 * i))
+              for i in range(0, 80, 8)]
+    path = str(tmpdir_factory.mktemp('image').join('test.gif'))
+    frames[0].save(path, save_all=True, append_images=frames[1:])
+    return path
+
+
+@pytest.mark.parametrize('size', [16, 64])
+def test_show_image(benchmark, size):
+    matrix = Matrix(DriverBase(num=size * size), width=size, height=size)
+    img = Image.new('RGBA', (size, size), (10, 20, 30, 128))
+    benchmark(image.showImage, matrix, imageObj=img)
+
+
+def test_load_gif(benchmark, gif):
+    def load():
+        return image.animated_gif_to_colorlists(Image.open(gif))
+
+    assert len(benchmark(load)) == 10
+
+
+def test_show_image_file(benchmark, gif):
+    matrix = Matrix(DriverBase(num=64 * 64), width=64, height=64)
+    benchmark(image.showImage, matrix, imagePath=gif)
+
+
+def test_stream_gif(benchmark, gif):
+    def load():
+        return sum(1 for frame in image.Frames(gif))
+
+    assert benchmark(load) == 10
+
+
+def test_stream_cached_gif(benchmark, gif, tmpdir):
+    frames = image.Frames(gif, (64, 64), str(tmpdir))
+    list(frames)
+    assert benchmark(lambda: sum(1 for f in frames)) == 10
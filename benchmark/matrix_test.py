@@ -215,12 +215,18 @@ def test_draw_triangle(benchmark):
     benchmark(test)
 
 
-def DISABLED_test_fill_triangle(benchmark):
+def test_fill_triangle(benchmark):
     matrix = make_matrix(width=16, height=16)
 
     def test():
         matrix.fillTriangle(0, 0, 11, 4, 5, 12, WHITE)
-        expected = []
+        expected = [
+            0, 29, 30, 31, 32, 33, 34, 35, 36, 37, 55, 56, 57, 58, 59, 60, 61,
+            62, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 84, 85, 86, 87, 88,
+            89, 90, 91, 92, 93, 98, 99, 100, 101, 102, 103, 104, 105, 106, 118,
+            119, 120, 121, 122, 123, 124, 125, 131, 132, 133, 134, 135, 136,
+            151, 152, 153, 154, 155, 156, 164, 165, 166, 167, 185, 186, 187,
+            197]
         assert_changed(matrix, expected)
     benchmark(test)
 
@@ -236,3 +242,37 @@ def test_draw_text(benchmark):
                     207]
         assert_changed(matrix, expected)
     benchmark(test)
+
+
+def test_set_per_pixel(benchmark):
+    matrix = make_matrix(width=64, height=64)
+    points = [(x, y) for y in range(64) for x in range(64)]
+
+    def test():
+        for x, y in points:
+            matrix.set(x, y, WHITE)
+    benchmark(test)
+
+
+def test_set_many(benchmark):
+    matrix = make_matrix(width=64, height=64)
+    points = [(x, y) for y in range(64) for x in range(64)]
+    colors = [WHITE] * len(points)
+    benchmark(matrix.set_many, points, colors)
+
+
+def test_set_block(benchmark):
+    matrix = make_matrix(width=64, height=64)
+    block = [[WHITE] * 64 for y in range(64)]
+    benchmark(matrix.set_block, 0, 0, block)
+
+
+def test_set_block_bytes(benchmark):
+    matrix = make_matrix(width=64, height=64)
+    block = bytes(range(256)) * 48
+    benchmark(matrix.set_block, 0, 0, block, 64)
+
+
+def test_get_block(benchmark):
+    matrix = make_matrix(width=64, height=64)
+    benchmark(matrix.get_block, 0, 0, 64, 64)
@@ -0,0 +1,42 @@
+import pytest
+import pytest_benchmark
+
+from bibliopixel.drivers import network_protocol
+from bibliopixel.drivers.network_protocol import COMPRESSION
+
+
+PIXEL_COUNTS = 10000, 50000, 100000
+COMPRESSIONS = {
+    'none': COMPRESSION.NONE,
+    'zlib': COMPRESSION.ZLIB,
+    'rle': COMPRESSION.RLE,
+}
+
+
+def make_frame(count):
+    # A mostly-dark frame with a few lit stripes, like a typical animation.
+    frame = bytearray(3 * count)
+    for i in range(0, count, 100):
+        frame[3 * i:3 * (i + 10)] = bytes((255, 128, 0)) * 10
+    return bytes(frame[:3 * count])
+
+
+@pytest.mark.parametrize('count', PIXEL_COUNTS)
+@pytest.mark.parametrize('name', sorted(COMPRESSIONS))
+def test_encode(benchmark, name, count):
+    frame = make_frame(count)
+    compression = COMPRESSIONS[name]
+    packet = benchmark(network_protocol.make_pixel_packet, frame, 2, 0, 0,
+                       compression)
+    benchmark.extra_info['wire_bytes'] = len(packet)
+
+
+@pytest.mark.parametrize('count', PIXEL_COUNTS)
+@pytest.mark.parametrize('name', sorted(COMPRESSIONS))
+def test_decode(benchmark, name, count):
+    frame = make_frame(count)
+    compression = COMPRESSIONS[name]
+    data = network_protocol.compress(frame, compression)
+    result = benchmark(network_protocol.decompress, data, compression)
+    assert result == frame
+    benchmark.extra_info['wire_bytes'] = len(data)
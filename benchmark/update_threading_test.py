@@ -0,0 +1,39 @@
+import time
+
+import pytest
+import pytest_benchmark
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Strip
+
+
+PIXEL_COUNT = 100
+FRAMES = 50
+SEND_TIME = 0.002  # Like a slow SPI or network write.
+
+
+class SlowDriver(DriverBase):
+    def _send_packet(self):
+        time.sleep(SEND_TIME)
+
+
+@pytest.mark.parametrize('drivers', [1, 4, 16])
+def test_threaded_update(benchmark, drivers):
+    layout = Strip([SlowDriver(num=PIXEL_COUNT) for i in range(drivers)],
+                   threadedUpdate=True)
+
+    def push_frames():
+        for i in range(FRAMES):
+            layout.fill((i, i, i))
+            layout.push_to_driver()
+        layout.threading.wait_for_update()
+
+    cpu, wall = time.process_time(), time.time()
+    benchmark.pedantic(push_frames, rounds=5)
+    cpu, wall = time.process_time() - cpu, time.time() - wall
+    layout.threading.stop()
+
+    # If nothing spins, the CPU time is much less than the wall time
+    # because the driver threads spend most of their time asleep.
+    benchmark.extra_info['cpu_fraction'] = cpu / wall
+    benchmark.extra_info['frame_latency'] = wall / (5 * FRAMES)
@@ -1,6 +1,8 @@
 import contextlib, threading, time
 from . runner import Runner
 from .. util import log
+from .. util.metrics import METRICS
+from .. threads.animation_process import AnimationProcess
 from .. threads.animation_threading import AnimationThreading
 from .. project import project
 from enum import IntEnum
@@ -25,6 +27,7 @@ class BaseAnimation(object):
         self.internal_delay = None
         self.on_completion = None
         self.state = STATE.ready
+        self.animation_process = None
 
     @property
     def _led(self):
@@ -85,13 +88,18 @@ class BaseAnimation(object):
         timestamps = []
 
         def stamp():
-            timestamps.append(time.time())
+            timestamps.append(time.perf_counter())
 
         self.check_delay()
 
         stamp()
 
-        self.step(self.runner.amt)
+        if self.animation_process:
+            self.state = STATE(self.animation_process.step())
+            # The worker's changes aren't tracked in this process.
+            self.layout.dirty.set_all()
+        else:
+            self.step(self.runner.amt)
 
         stamp()
 
@@ -100,7 +108,12 @@ class BaseAnimation(object):
 
         stamp()
 
-        _report_framerate(timestamps)
+        if METRICS.enabled:
+            METRICS.record('animation.step', timestamps[1] - timestamps[0])
+            METRICS.record('animation.push', timestamps[2] - timestamps[1])
+
+        if log.logger.isEnabledFor(log.DEBUG):
+            _report_framerate(timestamps)
 
         self.cur_step += 1
         if self.state == STATE.complete and self.runner.max_cycles > 0:
@@ -108,6 +121,15 @@ class BaseAnimation(object):
                 self.cycle_count += 1
                 self.state = STATE.running
 
+        if self.animation_process:
+            # If there will be another frame, render it while this one is
+            # sent and we wait - but only once the drivers are done reading
+            # the colors.
+            self.compute_state()
+            if self.state == STATE.running:
+                self.layout.threading.wait_for_update()
+                self.animation_process.request()
+
         stamp()
 
         self.threading.wait(self.sleep_time, timestamps)
@@ -126,8 +148,14 @@ class BaseAnimation(object):
 
         self.pre_run()
         try:
+            if self.runner.process:
+                self.animation_process = AnimationProcess(
+                    self, self.runner.amt)
             yield
         finally:
+            if self.animation_process:
+                self.animation_process.stop()
+                self.animation_process = None
             self.cleanup()
 
         self.on_completion and self.on_completion(self.state)
@@ -1,13 +1,15 @@
 import loady
 from .. util import log
 from .. project import project
+from .. threads.scheduler import Scheduler
 
 
 class Runner(object):
 
     def __init__(self, amt=1, fps=None, sleep_time=0, max_steps=0,
                  until_complete=False, max_cycles=0, seconds=None,
-                 threaded=False, main=None, **kwds):
+                 threaded=False, main=None, spin_time=0, overrun='skip',
+                 process=False, **kwds):
         project.raise_if_unknown(kwds, 'attribute', 'run')
 
         if max_steps < 0:
@@ -20,6 +22,10 @@ class Runner(object):
             log.error('max_cycles %s < 0', max_cycles)
             max_cycles = 0
 
+        if overrun not in Scheduler.OVERRUNS:
+            log.error('Unknown overrun policy %s', overrun)
+            overrun = 'skip'
+
         if sleep_time and fps:
             log.error('sleep_time=%s and fps=%s cannot both be set',
                       sleep_time, fps)
@@ -40,4 +46,7 @@ class Runner(object):
         self.max_cycles = max_cycles
         self.seconds = seconds
         self.threaded = threaded
+        self.spin_time = spin_time
+        self.overrun = overrun
+        self.process = process
         self.main = main and loady.code.load(main)
@@ -49,7 +49,8 @@ from . arithmetic import color_blend, color_scale
 from . conversions import hsv2rgb_spectrum, hsv2rgb_rainbow, hsv2rgb_360
 from . conversions import hsv2rgb, hue2rgb, hue_gradient, hue2rgb_360
 from . conversions import hue_helper, hue_helper360
-from . wheel import wheel_color, wheel_helper
+from . conversions import hsv2rgb_many, hue2rgb_many, hue_helper_many
+from . wheel import wheel_color, wheel_helper, wheel_helper_many
 from . names import COLORS
 
 # DEPRECATED methods and module name
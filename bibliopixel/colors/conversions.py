@@ -1,6 +1,11 @@
 from .. import util
 from .. util import log
-import colorsys
+import colorsys, functools
+
+try:
+    import numpy
+except:
+    numpy = None
 
 
 def hsv2rgb_raw(hsv):
@@ -206,6 +211,120 @@ hsv2rgb = hsv2rgb_rainbow
 hue2rgb = hue2rgb_rainbow
 
 
+# Batch conversions.
+#
+# These take many hues, or many (h, s, v) triples, and return the RGB
+# triples packed into one bytearray, with exactly the same results as the
+# functions above.  They work a channel at a time through 256-byte tables
+# and bytes.translate, so that converting a whole layout doesn't run any
+# Python code per pixel.
+
+def _channels(table):
+    """Split a table of RGB tuples into one bytes object per channel."""
+    return tuple(bytes(c) for c in zip(*table))
+
+
+def _pack(r, g, b):
+    """Interleave three channels of bytes into RGB triples."""
+    result = bytearray(3 * len(r))
+    result[0::3], result[1::3], result[2::3] = r, g, b
+    return result
+
+
+def _hue_bytes(hues):
+    if numpy and isinstance(hues, numpy.ndarray):
+        return hues.astype(numpy.uint8).tobytes()
+    return hues if isinstance(hues, (bytes, bytearray)) else bytes(hues)
+
+
+def _scale8_video(i, scale):
+    return ((i * scale) >> 8) + (scale != 0) if i else 0
+
+
+@functools.lru_cache(512)
+def rainbow_table(s=255, v=255):
+    """Return a 256-byte table that takes a channel of HUE_RAINBOW to its
+    value at saturation s and value v, as in hsv2rgb_rainbow."""
+    table = range(256)
+    if s != 255:
+        desat = ((255 - s) * (255 - s)) >> 8
+        table = [_scale8_video(c, s) + desat for c in table]
+    if v != 255:
+        v = _scale8_video(v, v)
+        table = [_scale8_video(c, v) for c in table]
+    return bytes(table)
+
+
+@functools.lru_cache(512)
+def spectrum_table(s=255, v=255):
+    """Return a 256-byte table that takes a ramp in SPECTRUM_RAMPS, from 0
+    to 63, to its value at saturation s and value v, as in
+    hsv2rgb_spectrum."""
+    floor = (v * (255 - s)) // 256
+    amplitude = v - floor
+    table = bytes(floor + (i * amplitude) // 64 for i in range(64))
+    return table + bytes(192)
+
+
+# How far up the ramp of each channel hsv2rgb_spectrum is for each hue.
+SPECTRUM_RAMPS = [hsv2rgb_spectrum((hue, 255, 64)) for hue in range(256)]
+
+_RAINBOW_CHANNELS = _channels(HUE_RAINBOW)
+_SPECTRUM_CHANNELS = _channels(SPECTRUM_RAMPS)
+
+
+def hue2rgb_rainbow_many(hues, s=255, v=255):
+    """Return hsv2rgb_rainbow((h, s, v)) for each h in hues, packed."""
+    hues, table = _hue_bytes(hues), rainbow_table(s, v)
+    return _pack(*(hues.translate(c).translate(table)
+                   for c in _RAINBOW_CHANNELS))
+
+
+def hue2rgb_spectrum_many(hues, s=255, v=255):
+    """Return hsv2rgb_spectrum((h, s, v)) for each h in hues, packed."""
+    hues, table = _hue_bytes(hues), spectrum_table(s, v)
+    return _pack(*(hues.translate(c).translate(table)
+                   for c in _SPECTRUM_CHANNELS))
+
+
+def hsv2rgb_rainbow_many(hsvs):
+    """Return hsv2rgb_rainbow(hsv) for each hsv in hsvs, packed.  hsvs is a
+    sequence of (h, s, v) triples or an (n, 3) numpy array."""
+    return _hsv2rgb_many(hsvs, _RAINBOW_CHANNELS, rainbow_table)
+
+
+def hsv2rgb_spectrum_many(hsvs):
+    """Return hsv2rgb_spectrum(hsv) for each hsv in hsvs, packed.  hsvs is a
+    sequence of (h, s, v) triples or an (n, 3) numpy array."""
+    return _hsv2rgb_many(hsvs, _SPECTRUM_CHANNELS, spectrum_table)
+
+
+def _hsv2rgb_many(hsvs, channels, make_table):
+    if numpy and isinstance(hsvs, numpy.ndarray):
+        hsvs = hsvs.astype(numpy.uint8).reshape(-1, 3)
+        h, s, v = hsvs.T
+        # Only build tables for the saturations and values that are used.
+        sv, which = numpy.unique(s.astype(int) * 256 + v, return_inverse=True)
+        tables = numpy.array([numpy.frombuffer(
+            make_table(int(i) >> 8, int(i) & 0xFF), numpy.uint8) for i in sv])
+        which = which.reshape(-1)
+        rgb = numpy.empty((len(hsvs), 3), numpy.uint8)
+        for i, c in enumerate(channels):
+            rgb[:, i] = tables[which, numpy.frombuffer(c, numpy.uint8)[h]]
+        return bytearray(rgb.tobytes())
+
+    r, g, b = channels
+    result = bytearray()
+    for h, s, v in hsvs:
+        table = make_table(s, v)
+        result += bytes((table[r[h]], table[g[h]], table[b[h]]))
+    return result
+
+
+hsv2rgb_many = hsv2rgb_rainbow_many
+hue2rgb_many = hue2rgb_rainbow_many
+
+
 def hue_gradient(start, stop, steps):
     if not (0 <= start <= 255 and 0 <= stop <= 255):
         log.error(
@@ -229,5 +348,17 @@ def hue_helper(pos, length, cycle_step):
     return hue2rgb(((pos * 255 // length) + cycle_step) % 255)
 
 
+@functools.lru_cache(16)
+def _hue_sweep(length):
+    return bytes(pos * 255 // length for pos in range(length))
+
+
+def hue_helper_many(length, cycle_step):
+    """Return hue_helper(pos, length, cycle_step) for every pos in
+    range(length), packed into one bytearray."""
+    shift = bytes((i + int(cycle_step)) % 255 for i in range(256))
+    return hue2rgb_many(_hue_sweep(length).translate(shift))
+
+
 def hue_helper360(pos, length, cycle_step):
     return hue2rgb_360(((pos * 360 // length) + cycle_step) % 360)
@@ -13,6 +13,11 @@ class Gamma(object):
     def get(self, i):
         return self.table[max(0, min(255, int(i)))]
 
+    def batch_table(self, level=1.0):
+        """Return a 256-byte table combining a brightness level with gamma,
+        suitable for bytes.translate."""
+        return bytes(max(0, min(255, self.get(level * i))) for i in range(256))
+
 
 # From https://github.com/scottjgibson/PixelPi/blob/master/pixelpi.py
 APA102 = Gamma(gamma=2.5, offset=0.5)
@@ -0,0 +1,199 @@
+"""
+Palettes are gradients between colors, computed once into a table so that
+coloring a pixel is a lookup rather than an interpolation.
+
+    p = Palette(['red', 'yellow', (0, 0, 255)], wrap=True)
+    p.get(0.5)                  # The color halfway along
+    p.sample(strip_indices(100), offset=frame)  # Packed RGB bytes
+
+The *_indices helpers compute the palette index of each pixel of a layout
+once.  sample() then colors a whole layout in bulk from those indices, and
+its offset argument scrolls the palette without recomputing them.
+"""
+
+import itertools, math, numbers
+from . names import name_to_color
+
+try:
+    import numpy
+except:
+    numpy = None
+
+
+class Palette(object):
+    """
+    A gradient through a list of colors, computed into a table of `size`
+    colors.
+
+    Each entry of colors is either a color, or a (position, color) pair with
+    a position from 0 to 1.  Colors without positions are evenly spaced
+    between their neighbors.  A color is an RGB triple or a name from
+    colors.COLORS.
+
+    If wrap is True, the last color blends back into the first, so that the
+    palette can be scrolled around forever without a seam.  Otherwise,
+    indices past either end get the first or last color.
+    """
+
+    def __init__(self, colors, size=256, wrap=False):
+        if not colors:
+            raise ValueError('A Palette needs at least one color')
+        if size < 1:
+            raise ValueError('A Palette needs a size of at least 1')
+
+        self.size = size
+        self.wrap = wrap
+        self.stops = _make_stops(colors, wrap)
+
+        scale = size if wrap else max(size - 1, 1)
+        self.table = [_interpolate(self.stops, i / scale) for i in range(size)]
+        self.channels = tuple(bytes(c) for c in zip(*self.table))
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        """Return the color at an integer index into the table."""
+        return self.table[self.index(index)]
+
+    def index(self, index):
+        """Bring an integer index into the table, by wrapping or clamping."""
+        if self.wrap:
+            return index % self.size
+        return min(max(index, 0), self.size - 1)
+
+    def get(self, position):
+        """Return the color at a position from 0 to 1."""
+        return self[int(position * self.size)]
+
+    def sample(self, indices, offset=0):
+        """Return the colors at many integer indices, plus offset, as RGB
+        triples packed into one bytearray.
+
+        indices can be a sequence or a numpy array.  Indices from 0 to 255,
+        as bytes or from one of the *_indices helpers, are looked up
+        without running any Python code per pixel."""
+        if numpy and isinstance(indices, numpy.ndarray):
+            indices = numpy.asarray(indices, int).reshape(-1) + offset
+            if self.wrap:
+                indices %= self.size
+            else:
+                indices = indices.clip(0, self.size - 1)
+            table = numpy.array(self.table, numpy.uint8)
+            return bytearray(table[indices].tobytes())
+
+        if not isinstance(indices, (bytes, bytearray)):
+            try:
+                indices = bytes(indices)
+            except ValueError:
+                table, index = self.table, self.index
+                return bytearray(itertools.chain.from_iterable(
+                    table[index(i + offset)] for i in indices))
+
+        result = bytearray(3 * len(indices))
+        for i in range(3):
+            result[i::3] = indices.translate(self._channel_table(i, offset))
+        return result
+
+    def sample_positions(self, positions, offset=0):
+        """Like sample(), but with positions from 0 to 1."""
+        return self.sample([int(p * self.size) for p in positions], offset)
+
+    def _channel_table(self, channel, offset):
+        """Return a 256-byte table from index to one channel of the color at
+        that index plus offset, for bytes.translate."""
+        c = self.channels[channel]
+        if self.wrap and self.size == 256:
+            offset %= 256
+            return c[offset:] + c[:offset]
+        return bytes(c[self.index(i + offset)] for i in range(256))
+
+
+def strip_indices(length, size=256, repeats=1):
+    """Return the palette index of each pixel in a strip, so that the
+    palette goes from one end to the other `repeats` times."""
+    return _packed(pos * size * repeats // length % size
+                   for pos in range(length))
+
+
+def matrix_indices(width, height, size=256, angle=0, repeats=1):
+    """Return the palette index of each pixel in a matrix, row by row, for a
+    linear gradient in the direction angle, in degrees counterclockwise from
+    the x axis, that crosses the matrix `repeats` times."""
+    dx, dy = math.cos(math.radians(angle)), -math.sin(math.radians(angle))
+    corners = [x * dx + y * dy for x in (0, width - 1) for y in (0, height - 1)]
+    low, span = min(corners), (max(corners) - min(corners)) or 1
+    scale = size * repeats / span * (1 - 1 / size)
+    return _packed(int((x * dx + y * dy - low) * scale) % size
+                   for y in range(height) for x in range(width))
+
+
+def radial_indices(width, height, size=256, center=None, repeats=1):
+    """Return the palette index of each pixel in a matrix, row by row, for
+    rings around center, by default the middle of the matrix.  The farthest
+    corner is `repeats` times through the palette."""
+    if center is None:
+        center = (width - 1) / 2, (height - 1) / 2
+    cx, cy = center
+    radius = max(math.hypot(x - cx, y - cy)
+                 for x in (0, width - 1) for y in (0, height - 1)) or 1
+    scale = size * repeats / radius * (1 - 1 / size)
+    return _packed(int(math.hypot(x - cx, y - cy) * scale) % size
+                   for y in range(height) for x in range(width))
+
+
+def _packed(indices):
+    """Return indices as bytes if they fit, so sample() can translate them."""
+    indices = list(indices)
+    return bytes(indices) if max(indices, default=0) < 256 else indices
+
+
+def _make_color(color):
+    if isinstance(color, str):
+        return name_to_color(color)
+    if isinstance(color, numbers.Number):
+        return (color, color, color)
+    return tuple(color)
+
+
+def _make_stops(colors, wrap):
+    """Return a list of (position, color), with positions filled in evenly
+    where they are missing, and a stop at either end."""
+    stops = []
+    for c in colors:
+        if isinstance(c, (list, tuple)) and len(c) == 2:
+            stops.append((float(c[0]), _make_color(c[1])))
+        else:
+            stops.append((None, _make_color(c)))
+
+    # Colors without positions go evenly between the stops either side.
+    if stops[0][0] is None:
+        stops[0] = 0.0, stops[0][1]
+    if stops[-1][0] is None and not wrap:
+        stops[-1] = 1.0, stops[-1][1]
+    if wrap:
+        stops.append((1.0, stops[0][1]))
+
+    known = [i for i, (p, c) in enumerate(stops) if p is not None]
+    for begin, end in zip(known, known[1:]):
+        p0, p1 = stops[begin][0], stops[end][0]
+        for i in range(begin + 1, end):
+            step = (i - begin) / (end - begin)
+            stops[i] = p0 + step * (p1 - p0), stops[i][1]
+
+    stops.sort(key=lambda s: s[0])
+    if stops[0][0] > 0:
+        stops.insert(0, (0.0, stops[0][1]))
+    if stops[-1][0] < 1:
+        stops.append((1.0, stops[-1][1]))
+    return stops
+
+
+def _interpolate(stops, position):
+    for (p0, c0), (p1, c1) in zip(stops, stops[1:]):
+        if position <= p1:
+            break
+    if p1 <= p0:
+        return c1
+    ratio = (position - p0) / (p1 - p0)
+    return tuple(int(round(a + ratio * (b - a))) for a, b in zip(c0, c1))
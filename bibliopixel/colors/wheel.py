@@ -1,3 +1,5 @@
+import bisect, functools
+
 WHEEL_MAX = 384
 
 
@@ -40,3 +42,28 @@ def wheel_helper(pos, length, cycle_step):
     """Helper for wheel_color that distributes colors over length and
     allows shifting position."""
     return wheel_color(((pos * WHEEL_MAX // length) + cycle_step) % WHEEL_MAX)
+
+
+@functools.lru_cache(16)
+def _wheel_sweep(length):
+    # The positions only increase, so split them at 256 into two runs of
+    # bytes that can each go through bytes.translate.
+    positions = [pos * WHEEL_MAX // length for pos in range(length)]
+    split = bisect.bisect_left(positions, 256)
+    return bytes(positions[:split]), bytes(p - 256 for p in positions[split:])
+
+
+def wheel_helper_many(length, cycle_step):
+    """Return wheel_helper(pos, length, cycle_step) for every pos in
+    range(length), packed into one bytearray."""
+    low, high = _wheel_sweep(length)
+    result = bytearray(3 * length)
+    for i in range(3):
+        result[i::3] = (low.translate(_wheel_table(i, cycle_step)) +
+                        high.translate(_wheel_table(i, cycle_step + 256)))
+    return result
+
+
+def _wheel_table(channel, start):
+    positions = range(start, start + 256)
+    return bytes(_WHEEL[p % WHEEL_MAX][channel] for p in positions)
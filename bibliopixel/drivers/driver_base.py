@@ -1,7 +1,11 @@
 from . channel_order import ChannelOrder
 from .. colors import gamma as _gamma
 from .. project import data_maker, project
-import threading, time
+from .. project.color_list import ByteColorList, IndexedColorList
+from .. threads import producer_consumer, threads
+from .. util import log
+from .. util.metrics import METRICS
+import itertools, threading, time
 
 
 class DriverBase(object):
@@ -14,6 +18,10 @@ class DriverBase(object):
     # the pixels.
     set_device_brightness = None
 
+    # If skip_unchanged is True, update_colors() does nothing for frames where
+    # no pixels for this driver have changed. The Layout sets this.
+    skip_unchanged = False
+
     def __init__(self, num=0, width=0, height=0, c_order=ChannelOrder.RGB,
                  gamma=None, maker=data_maker.MAKER, **kwds):
         project.raise_if_unknown_attributes(kwds, 'driver', self)
@@ -44,6 +52,18 @@ class DriverBase(object):
         self.brightness_lock = threading.Lock()
         self._brightness = 255
         self._waiting_brightness = None
+        self._render_key = self._render_table = None
+        self._palette_key = self._palette_tables = None
+
+        # The range of changed pixels, relative to this driver, since the
+        # last update. The range is empty if the first element is not smaller.
+        self.changed_lock = threading.Lock()
+        self._changed = 0, self.numLEDs
+        self._update_range = 0, self.numLEDs
+        self._pipeline = None
+        self._pipeline_depth = 1
+        self._pipeline_error = None
+        self.metrics_name = 'driver.' + type(self).__name__
 
     def set_pixel_positions(self, pixel_positions):
         pass
@@ -52,6 +72,77 @@ class DriverBase(object):
         self._colors = colors
         self._pos = pos
 
+    def start_pipeline(self, depth):
+        """Compute and send packets on a separate thread, so that up to
+        `depth` frames are in flight at once.
+
+        update_colors() only copies this driver's colors into a free buffer,
+        waiting for one if all `depth - 1` buffers are still queued.
+
+        The pipeline thread calls sync() after it sends each frame, so the
+        layout doesn't call it for this driver.
+
+        If computing or sending a frame raises an exception, it is logged and
+        raised again by the next call to update_colors() or
+        wait_for_pipeline().
+        """
+        self._pipeline_depth = depth
+        if depth < 2 or self._pipeline:
+            return
+
+        self._source_colors = self._colors, self._pos
+        frames = ([self._make_frame_colors(), None, None]
+                  for i in range(depth - 1))
+        self._pipeline = producer_consumer.Queues(*frames)
+        self._pipeline_thread = threads.Loop(self._consume_frame)
+        self._pipeline_thread.start()
+
+    @property
+    def pipelined(self):
+        """True if this driver sends its frames on a pipeline thread, which
+        also calls sync()."""
+        return self._pipeline_depth > 1
+
+    def _make_frame_colors(self):
+        """Make a color list like this driver's part of the layout's."""
+        colors, pos = self._colors, self._pos
+        if data_maker.is_numpy(colors):
+            return colors[pos:pos + self.numLEDs].copy()
+        if isinstance(colors, list):
+            return [(0, 0, 0)] * self.numLEDs
+        if isinstance(colors, IndexedColorList):
+            return IndexedColorList(self.numLEDs)
+        if isinstance(colors, ByteColorList):
+            return ByteColorList(self.numLEDs)
+        # Shared memory.
+        return (colors._type_ * self.numLEDs)()
+
+    def wait_for_pipeline(self):
+        """Wait until every frame passed to update_colors() has been sent."""
+        if self._pipeline:
+            self._pipeline.join()
+            self._raise_pipeline_error()
+
+    def stop_pipeline(self):
+        """Wait until every frame has been sent, then stop the pipeline
+        thread.  The next call to update_colors() starts it again."""
+        if not self._pipeline:
+            return
+
+        self._pipeline.join()
+        self._pipeline_thread.stop()
+        with self._pipeline.produce():
+            pass  # Wake the pipeline thread so that it sees it has stopped.
+        self._pipeline_thread.join()
+
+        self._pipeline = self._pipeline_error = None
+        self._colors, self._pos = self._source_colors
+
+    def _raise_pipeline_error(self):
+        error, self._pipeline_error = self._pipeline_error, None
+        if error:
+            raise error
+
     def cleanup(self):
         pass
 
@@ -85,33 +176,184 @@ class DriverBase(object):
         pass
 
     def update_colors(self):
-        start = time.time()
-
         with self.brightness_lock:
             # Swap in a new brightness.
             brightness, self._waiting_brightness = (
                 self._waiting_brightness, None)
 
+        with self.changed_lock:
+            # Swap out the changed range.
+            changed, self._changed = self._changed, (self.numLEDs, 0)
+
+        if not self._pipeline:
+            if self._pipeline_depth < 2:
+                return self._update(brightness, changed)
+            self.start_pipeline(self._pipeline_depth)
+
+        self._raise_pipeline_error()
+        colors, pos = self._source_colors
+        with self._pipeline.produce() as frame:
+            frame[0][:] = colors[pos:pos + self.numLEDs]
+            frame[1:] = brightness, changed
+
+    def _consume_frame(self):
+        with self._pipeline.consume() as frame:
+            if not self._pipeline_thread.running:
+                return
+
+            # Only this thread reads self._colors in pipeline mode.
+            self._colors, self._pos = frame[0], 0
+            try:
+                self._update(*frame[1:])
+                self.sync()
+            except Exception as e:
+                # Keep consuming frames, so that update_colors() never blocks.
+                log.exception(e)
+                self._pipeline_error = e
+
+    def _update(self, brightness, changed):
+        start = time.time()
+
         if brightness is not None:
             self._brightness = brightness
             if self.set_device_brightness:
                 self.set_device_brightness(brightness)
 
-        self._compute_packet()
-        self._send_packet()
+        if brightness is not None or not self.skip_unchanged:
+            changed = 0, self.numLEDs
+
+        if changed[0] < changed[1]:
+            # Drivers that can do partial updates can use self._update_range.
+            self._update_range = changed
+            if METRICS.enabled:
+                self._update_with_metrics()
+            else:
+                self._compute_packet()
+                self._send_packet()
 
         self.lastUpdate = time.time() - start
 
+    def _update_with_metrics(self):
+        name = self.metrics_name
+        with METRICS.timer(name + '.compute'):
+            self._compute_packet()
+        with METRICS.timer(name + '.send'):
+            self._send_packet()
+
+        byte_count, packet_count = self._packet_sizes()
+        METRICS.record(name + '.bytes', byte_count)
+        METRICS.record(name + '.packets', packet_count)
+
+    def _packet_sizes(self):
+        """Return the number of bytes and packets sent for the last frame."""
+        packet = getattr(self, '_packet', None)
+        try:
+            return len(packet), 1
+        except TypeError:
+            return self.bufByteCount(), 1
+
+    def set_changed(self, begin, end):
+        """Add the range [begin, end) to the pixels changed since the last
+        update."""
+        if begin < end:
+            with self.changed_lock:
+                b, e = self._changed
+                if b < e:
+                    begin, end = min(b, begin), max(e, end)
+                self._changed = begin, end
+
     def set_brightness(self, brightness):
         with self.brightness_lock:
             self._waiting_brightness = brightness
 
-    def _render(self):
+    def _get_render_table(self):
+        """Return the fused brightness and gamma table, rebuilding it only if
+        the brightness or gamma has changed since the last frame."""
         if self.set_device_brightness:
             level = 1.0
         else:
             level = self._brightness / 255.0
-        gam, (r, g, b) = self.gamma.get, self.c_order
-        for i in range(self.numLEDs):
-            c = [int(level * x) for x in self._colors[i + self._pos]]
-            self._buf[i * 3:(i + 1) * 3] = gam(c[r]), gam(c[g]), gam(c[b])
+
+        key = level, self.gamma
+        if key != self._render_key:
+            self._render_key = key
+            self._render_table = self.gamma.batch_table(level)
+        return self._render_table
+
+    def _render(self):
+        table = self._get_render_table()
+        if data_maker.is_numpy(self._colors):
+            return self._render_numpy(table)
+        if isinstance(self._colors, IndexedColorList):
+            return self._render_indexed(table)
+
+        self._render_bytes(bytes(self._color_bytes()).translate(table))
+
+    def _color_bytes(self):
+        """Return this driver's colors as RGB bytes, with no brightness or
+        gamma correction.  The result might be a memoryview of the colors
+        themselves."""
+        if isinstance(self._colors, ByteColorList):
+            begin = 3 * self._pos
+            return memoryview(self._colors.data)[begin:begin + 3 * self.numLEDs]
+
+        colors = self._colors[self._pos:self._pos + self.numLEDs]
+        if data_maker.is_numpy(colors):
+            numpy = data_maker.numpy
+            return numpy.clip(colors, 0, 255).astype(numpy.uint8).tobytes()
+        if isinstance(colors, IndexedColorList):
+            return colors.to_bytes()
+
+        try:
+            return bytes(itertools.chain.from_iterable(colors))
+        except (TypeError, ValueError):
+            # Floating point or out of range colors.
+            return bytes(max(0, min(255, int(c)))
+                         for c in itertools.chain.from_iterable(colors))
+
+    def _render_bytes(self, flat):
+        """Copy gamma corrected RGB bytes into self._buf in channel order."""
+        count = 3 * self.numLEDs
+        if self.c_order == ChannelOrder.RGB:
+            self._buf[0:count] = flat
+        else:
+            r, g, b = self.c_order
+            self._buf[0:count:3] = flat[r::3]
+            self._buf[1:count:3] = flat[g::3]
+            self._buf[2:count:3] = flat[b::3]
+
+    def _render_numpy(self, table):
+        numpy = data_maker.numpy
+        colors = self._colors[self._pos:self._pos + self.numLEDs]
+
+        # Clipping before the integer cast does the same job as Gamma.get.
+        indexes = numpy.clip(colors, 0, 255).astype(numpy.uint8)
+        table = numpy.frombuffer(table, numpy.uint8)
+
+        # Write straight into self._buf, which might have trailing bytes.
+        count = 3 * self.numLEDs
+        out = numpy.frombuffer(self._buf, numpy.uint8, count).reshape(-1, 3)
+        numpy.take(table, indexes[:, self.c_order], out=out)
+
+    def _render_indexed(self, table):
+        """Expand palette indices straight into self._buf, one channel at a
+        time, through tables that combine the palette with gamma, brightness
+        and channel order."""
+        indices = self._colors.indices[self._pos:self._pos + self.numLEDs]
+        count = 3 * self.numLEDs
+        for i, t in enumerate(self._get_palette_tables(table)):
+            self._buf[i:count:3] = indices.translate(t)
+
+    def _get_palette_tables(self, table):
+        """Return three 256-byte tables from palette index to output byte,
+        rebuilding them only if the palette or render table has changed."""
+        palette = self._colors.palette
+        key = tuple(palette), table, self.c_order
+        if key != self._palette_key:
+            self._palette_key = key
+            pad = bytes(256 - len(palette))
+            self._palette_tables = [
+                bytes(table[max(0, min(255, int(c[channel])))]
+                      for c in palette) + pad
+                for channel in self.c_order]
+        return self._palette_tables
@@ -59,7 +59,9 @@ class Hue(DriverBase):
         return (h, s)
 
     def _send_packet(self):
-        for i in range(len(self._ids)):
+        # Only send the lights that changed - each one is an HTTP request.
+        begin, end = self._update_range
+        for i in range(begin, min(end, len(self._ids))):
             h, s = self._rgb2hs(self._colors[i + self._pos])
             bri = min(254, self._brightness)
             if s == 0:
@@ -1,69 +1,191 @@
-import socket, sys, time, os
+import socket, sys, threading, time, os
 
 from . driver_base import DriverBase
-from .. import util
+from . import network_protocol
+from . network_protocol import CMDTYPE, COMPRESSION
 from .. util import log
 from .. drivers.return_codes import RETURN_CODES
 
 
-class CMDTYPE:
-    SETUP_DATA = 1  # reserved for future use
-    PIXEL_DATA = 2
-    BRIGHTNESS = 3
+class Connection(object):
+    """
+    A long-lived TCP connection to a NetworkReceiver.
+
+    Up to `window` packets can be sent before their acknowledgements are
+    received.  The acknowledgements are read on a separate thread so that
+    sending never waits for a round trip unless the window is full.
+
+    If `protocol` is 2, the connection tries to negotiate protocol version 2
+    with one of `compressions`, and falls back to version 1 if the receiver
+    doesn't understand it.
+    """
+
+    def __init__(self, address, window=1, protocol=1, compressions=()):
+        self.protocol = 1
+        self.compression = COMPRESSION.NONE
+        self.sequence = 0
+
+        self.socket = self._open(address)
+        if protocol >= 2 and not self._negotiate(compressions):
+            # Old receivers hang up on commands they don't understand.
+            self.socket.close()
+            self.socket = self._open(address)
+
+        self.window = threading.Semaphore(window)
+        self.running = True
+        self.reader = threading.Thread(target=self._read, daemon=True)
+        self.reader.start()
+
+    def send_pixels(self, data, timestamp=None):
+        packet = network_protocol.make_pixel_packet(
+            data, self.protocol, self.sequence, timestamp, self.compression)
+        self.sequence += 1
+        self.send(packet)
+
+    def send(self, packet):
+        self.window.acquire()
+        if not self.running:
+            raise IOError('Connection to network receiver was closed')
+        self.socket.sendall(packet)
+
+    def close(self):
+        self.running = False
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.socket.close()
+
+    def _open(self, address):
+        try:
+            s = socket.create_connection(address)
+        except socket.gaierror:
+            error = "Unable to connect to or resolve host: {}".format(
+                address[0])
+            log.error(error)
+            raise IOError(error)
+
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return s
+
+    def _negotiate(self, compressions):
+        """Returns False if the receiver closed the connection."""
+        self.socket.sendall(network_protocol.make_setup_packet(compressions))
+        resp = self.socket.recv(1)
+        if not resp:
+            return False
+
+        if resp[0] != RETURN_CODES.SUCCESS:
+            log.info('Network receiver only understands protocol 1')
+            return True
+
+        compression = self.socket.recv(1)
+        if not compression:
+            return False
+
+        self.protocol = network_protocol.VERSION
+        self.compression = compression[0]
+        return True
+
+    def _read(self):
+        try:
+            while self.running:
+                resp = self.socket.recv(1)
+                if not resp:
+                    break
+                if resp[0] != RETURN_CODES.SUCCESS:
+                    log.warning("Network receiver returned error %s", resp[0])
+                self.window.release()
+
+        except OSError:
+            pass
+
+        finally:
+            self.running = False
+            self.window.release()  # Wake up any waiting sender.
 
 
 class Network(DriverBase):
     """Driver for communicating with another device on the network."""
 
-    def __init__(self, num=0, width=0, height=0, host="localhost", port=3142, **kwds):
+    def __init__(self, num=0, width=0, height=0, host="localhost", port=3142,
+                 window=1, protocol=network_protocol.VERSION, compression=None,
+                 **kwds):
+        """
+        Args:
+            window: how many frames can be sent before waiting for an
+                acknowledgement from the receiver
+            protocol: the highest protocol version to use. Version 1 is
+                limited to 21,845 pixels.
+            compression: for protocol 2: None, 'zlib' or 'rle' - or a list
+                of these, in order of preference
+        """
         super().__init__(num, width, height, **kwds)
 
         self._host = host
         self._port = port
+        self._window = window
+        self._protocol = protocol
+        if isinstance(compression, (list, tuple)):
+            self._compressions = [
+                network_protocol.make_compression(c) for c in compression]
+        else:
+            self._compressions = [network_protocol.make_compression(
+                compression)]
+        self._connection = None
+
+        if protocol < 2 and self.bufByteCount() > network_protocol.MAX_V1_SIZE:
+            raise ValueError('Protocol 1 cannot send more than %s pixels' %
+                             (network_protocol.MAX_V1_SIZE // 3))
 
     def _connect(self):
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            s.connect((self._host, self._port))
-            return s
-        except socket.gaierror:
-            error = "Unable to connect to or resolve host: {}".format(
-                self._host)
-            log.error(error)
-            raise IOError(error)
+        if not self._connection:
+            address = self._host, self._port
+            self._connection = Connection(
+                address, self._window, self._protocol, self._compressions)
+        return self._connection
+
+    def _disconnect(self):
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+    def _send(self, packet=None):
+        # If the connection has gone away, reconnect and try once more.
+        for retry in (False, True):
+            try:
+                if packet is None:
+                    self._connect().send_pixels(self._packet, self._timestamp)
+                else:
+                    self._connect().send(packet)
+                return
+
+            except Exception as e:
+                self._disconnect()
+                if retry:
+                    log.exception(e)
+                    error = "Problem communicating with network receiver!"
+                    log.error(error)
+                    raise IOError(error)
+
+    def cleanup(self):
+        self._disconnect()
 
     def _compute_packet(self):
-        count = self.bufByteCount()
-        self._packet = util.generate_header(CMDTYPE.PIXEL_DATA, count)
-        indexes = range(self._pos, self._pos + self.numLEDs)
-        self._packet.extend(int(c) for i in indexes for c in self._colors[i])
+        # The header depends on the protocol negotiated with the receiver,
+        # so it's added when the packet is sent.
+        self._packet = self._color_bytes()
+        self._timestamp = time.time()
 
     # Push new data to strand
     def _send_packet(self):
-        try:
-            s = self._connect()
-            s.sendall(self._packet)
-
-            resp = ord(s.recv(1))
-
-            s.close()
-
-            if resp != RETURN_CODES.SUCCESS:
-                log.warning("Bytecount mismatch! %s", resp)
-
-        except Exception as e:
-            log.exception(e)
-            error = "Problem communicating with network receiver!"
-            log.error(error)
-            raise IOError(error)
+        self._send()
 
     def set_device_brightness(self, brightness):
-        packet = util.generate_header(CMDTYPE.BRIGHTNESS, 1)
+        packet = network_protocol.generate_header(CMDTYPE.BRIGHTNESS, 1)
         packet.append(self._brightness)
-        s = self._connect()
-        s.sendall(packet)
-        resp = ord(s.recv(1))
-        return resp == RETURN_CODES.SUCCESS
+        self._send(packet)
+        return True
 
 
 # This is DEPRECATED.
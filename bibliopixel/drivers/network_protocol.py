@@ -0,0 +1,266 @@
+"""
+Framing for the network drivers and receivers.
+
+Version 1 frames have a three byte header: the command, followed by a 16-bit
+little-endian payload size - so a frame can hold at most 21,845 RGB pixels.
+
+Version 2 pixel frames have an eighteen byte header: the command
+PIXEL_DATA_V2, the compression, a 32-bit frame sequence number, a 64-bit
+presentation timestamp in microseconds and a 32-bit payload size.
+
+A client that wants version 2 sends a SETUP_DATA command whose payload is
+the protocol version followed by the compressions it can use, in order of
+preference.  A version 2 receiver responds with RETURN_CODES.SUCCESS followed
+by the compression it chose.  Older receivers respond with an error or close
+the connection, and the client falls back to version 1.
+
+Over UDP, a packet that doesn't fit into one datagram is split into
+PIXEL_FRAGMENT datagrams.  Each has a twelve byte header after the command:
+a 32-bit frame id, the offset of the fragment in the packet and the total
+size of the packet.  Packets that fit are sent unchanged, so small frames
+still reach older UDP receivers.
+"""
+
+import itertools, struct, time, zlib
+
+from .. util import util
+
+VERSION = 2
+
+
+class CMDTYPE:
+    SETUP_DATA = 1  # Negotiate the protocol version and compression
+    PIXEL_DATA = 2
+    BRIGHTNESS = 3
+    PIXEL_DATA_V2 = 4
+    PIXEL_FRAGMENT = 5
+
+
+class COMPRESSION:
+    NONE = 0
+    ZLIB = 1
+    RLE = 2
+
+
+COMPRESSIONS = COMPRESSION.NONE, COMPRESSION.ZLIB, COMPRESSION.RLE
+
+COMPRESSION_NAMES = {
+    None: COMPRESSION.NONE,
+    'none': COMPRESSION.NONE,
+    'zlib': COMPRESSION.ZLIB,
+    'rle': COMPRESSION.RLE,
+}
+
+MAX_V1_SIZE = 0xFFFF
+MAX_RUN = 0xFF
+
+# The largest UDP payload that fits in a 1500 byte Ethernet frame.
+UDP_MTU = 1472
+
+# The largest UDP payload over IPv4.
+UDP_MAX_DATAGRAM = 65507
+
+# The headers after the command byte.
+HEADER_V2 = struct.Struct('<BIQI')
+FRAGMENT_HEADER = struct.Struct('<III')
+
+
+def make_compression(c):
+    """Return a COMPRESSION value from a name or a number."""
+    if isinstance(c, str):
+        c = c.lower()
+    try:
+        return COMPRESSION_NAMES[c]
+    except KeyError:
+        if c in COMPRESSIONS:
+            return c
+        raise ValueError('Unknown compression %s' % c)
+
+
+def generate_header(cmd, size):
+    if size > MAX_V1_SIZE:
+        raise ValueError('Packet of %s bytes is too big for protocol 1' % size)
+    return util.generate_header(cmd, size)
+
+
+def generate_header_v2(size, sequence, timestamp=None,
+                       compression=COMPRESSION.NONE):
+    if timestamp is None:
+        timestamp = time.time()
+
+    packet = bytearray((CMDTYPE.PIXEL_DATA_V2,))
+    packet.extend(HEADER_V2.pack(
+        compression, sequence & 0xFFFFFFFF, int(timestamp * 1000000), size))
+    return packet
+
+
+def parse_header_v2(data):
+    """Returns compression, sequence, timestamp, size from a version 2 header,
+    not including the command byte."""
+    compression, sequence, timestamp, size = HEADER_V2.unpack(data)
+    return compression, sequence, timestamp / 1000000, size
+
+
+def rle_encode(data):
+    """Run-length encode RGB bytes into (count, r, g, b) quadruples."""
+    result = bytearray()
+    for pixel, run in itertools.groupby(zip(*(iter(data),) * 3)):
+        count = sum(1 for i in run)
+        while count > 0:
+            n = min(count, MAX_RUN)
+            result.append(n)
+            result.extend(pixel)
+            count -= n
+    return bytes(result)
+
+
+def rle_decode(data):
+    if len(data) % 4:
+        raise ValueError('RLE data has length %s' % len(data))
+    return b''.join(bytes(data[i + 1:i + 4]) * data[i]
+                    for i in range(0, len(data), 4))
+
+
+def compress(data, compression):
+    if compression == COMPRESSION.ZLIB:
+        return zlib.compress(data, 1)
+    if compression == COMPRESSION.RLE:
+        return rle_encode(data)
+    return data
+
+
+def decompress(data, compression):
+    if compression == COMPRESSION.ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION.RLE:
+        return rle_decode(data)
+    if compression == COMPRESSION.NONE:
+        return data
+    raise ValueError('Unknown compression %s' % compression)
+
+
+def make_pixel_packet(data, protocol=1, sequence=0, timestamp=None,
+                      compression=COMPRESSION.NONE):
+    """Return a complete pixel data packet for the given protocol version."""
+    if protocol == 1:
+        packet = generate_header(CMDTYPE.PIXEL_DATA, len(data))
+    else:
+        data = compress(data, compression)
+        packet = generate_header_v2(len(data), sequence, timestamp, compression)
+
+    packet.extend(data)
+    return packet
+
+
+def make_setup_packet(compressions):
+    payload = bytes((VERSION,) + tuple(compressions))
+    packet = generate_header(CMDTYPE.SETUP_DATA, len(payload))
+    packet.extend(payload)
+    return packet
+
+
+def choose_compression(payload):
+    """Given a SETUP_DATA payload, return the compression to use."""
+    for c in payload[1:]:
+        if c in COMPRESSIONS:
+            return c
+    return COMPRESSION.NONE
+
+
+def parse_packet(packet):
+    """Returns cmd, sequence, payload from a complete packet.  For version 1
+    packets, sequence is None."""
+    cmd = packet[0]
+    if cmd == CMDTYPE.PIXEL_DATA_V2:
+        end = 1 + HEADER_V2.size
+        compression, sequence, timestamp, size = parse_header_v2(
+            packet[1:end])
+        return cmd, sequence, decompress(bytes(packet[end:end + size]),
+                                         compression)
+
+    size = packet[1] | (packet[2] << 8)
+    return cmd, None, packet[3:3 + size]
+
+
+def fragment(packet, frame, mtu=UDP_MTU):
+    """Yield datagrams of at most `mtu` bytes that carry `packet`."""
+    if len(packet) <= mtu:
+        yield packet
+        return
+
+    header_size = 1 + FRAGMENT_HEADER.size
+    chunk = mtu - header_size
+    if chunk <= 0:
+        raise ValueError('mtu %s is too small' % mtu)
+
+    frame &= 0xFFFFFFFF
+    view = memoryview(packet)
+    for offset in range(0, len(packet), chunk):
+        datagram = bytearray((CMDTYPE.PIXEL_FRAGMENT,))
+        datagram.extend(FRAGMENT_HEADER.pack(frame, offset, len(packet)))
+        datagram.extend(view[offset:offset + chunk])
+        yield datagram
+
+
+def parse_fragment(datagram):
+    """Returns frame, offset, total, data from a PIXEL_FRAGMENT datagram."""
+    end = 1 + FRAGMENT_HEADER.size
+    frame, offset, total = FRAGMENT_HEADER.unpack(datagram[1:end])
+    return frame, offset, total, datagram[end:]
+
+
+class Reassembler(object):
+    """
+    Reassemble fragmented packets, one frame at a time.
+
+    When a fragment of a newer frame arrives, any incomplete older frame is
+    dropped rather than shown torn, and later fragments of older frames are
+    ignored.
+    """
+
+    def __init__(self):
+        self.frame = None
+        self.buffer = None
+        self.offsets = set()
+        self.received = 0
+        self.complete = False
+        self.dropped = 0
+        self.stale = 0
+
+    def add(self, datagram):
+        """Add one datagram. Returns the complete packet, or None."""
+        if datagram[0] != CMDTYPE.PIXEL_FRAGMENT:
+            return datagram
+
+        frame, offset, total, data = parse_fragment(datagram)
+        if frame != self.frame:
+            if self.frame is not None and not _is_newer(frame, self.frame):
+                self.stale += 1
+                return None
+            if self.frame is not None and not self.complete:
+                self.dropped += 1
+            self.frame = frame
+            self.buffer = bytearray(total)
+            self.offsets.clear()
+            self.received = 0
+            self.complete = False
+
+        if self.complete or offset in self.offsets:
+            return None
+        if offset + len(data) > len(self.buffer):
+            raise ValueError('Fragment at %s overflows a packet of %s bytes' %
+                             (offset, len(self.buffer)))
+
+        self.buffer[offset:offset + len(data)] = data
+        self.offsets.add(offset)
+        self.received += len(data)
+        if self.received < len(self.buffer):
+            return None
+
+        self.complete = True
+        return self.buffer
+
+
+def _is_newer(a, b):
+    """Is 32-bit frame id a newer than b, allowing for wraparound?"""
+    return 0 < ((a - b) & 0xFFFFFFFF) < 0x80000000
@@ -1,97 +1,132 @@
-import threading
-import os
+import selectors, socket, threading
 
-try:
-    import SocketServer
-except:
-    import socketserver as SocketServer
 from .. drivers.return_codes import RETURN_CODES
-from . network import CMDTYPE
-
-os.sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from . import network_protocol
+from . network_protocol import CMDTYPE
 from .. util import log
 
+# How often the receiver thread checks whether it has been stopped.
+POLL_TIME = 0.1
 
-class ThreadedDataHandler(SocketServer.BaseRequestHandler):
 
-    def handle(self):
-        try:
-            cmd = ord(self.request.recv(1))
-            r = bytes(self.request.recv(2))
-            size = (ord(r[1]) << 8) | ord(r[0])
-
-            if cmd == CMDTYPE.PIXEL_DATA:
-                data = bytearray()
-                emptyCount = 0
-                while len(data) < size:
-                    buf = self.request.recv(4096)
-                    if len(buf) == 0:
-                        emptyCount += 1
-                    if emptyCount >= 5:
-                        log.exception(
-                            "Failed to receive expected amount of data! Expected: %s bytes / Received: %s bytes", size, len(data))
-                        self.request.sendall(RETURN_CODES.ERROR_SIZE)
-                        return
-
-                    data.extend(buf)
-
-                if len(data) != size:
-                    log.exception(
-                        "Received data size incorrect! "
-                        "Expected: %s bytes / Received: {%s bytes",
-                        size, len(data))
-                    return
-
-                self.server.update(data)
-
-                if self.server.hasFrame:
-                    while self.server.hasFrame():
-                        pass
-
-                packet = bytearray()
-                packet.append(RETURN_CODES.SUCCESS)
-                self.request.sendall(packet)
-
-            elif cmd == CMDTYPE.BRIGHTNESS:
-                res = self.request.recv(1)
-                bright = ord(res)
-                result = RETURN_CODES.ERROR_UNSUPPORTED
-                if self.server.set_brightness:
-                    if self.server.set_brightness(bright):
-                        result = RETURN_CODES.SUCCESS
-                    else:
-                        # Try again.
-                        self.server.set_brightness(bright)
+class ReceiverConnection(object):
+    """
+    Read commands from one client without blocking.
 
-                packet = bytearray()
-                packet.append(result)
-                self.request.sendall(packet)
+    Each part of a command is read with recv_into straight into buffers that
+    are allocated once and reused for every frame.
+    """
 
-        except Exception as e:
-            log.exception(e)
-            pass  # if there's a comm error, just move on
-        return
+    def __init__(self, receiver, sock):
+        self.receiver = receiver
+        self.socket = sock
+        self.header = bytearray(1 + network_protocol.HEADER_V2.size)
+        self.data = bytearray()
+        self.sequence = None
+        self.view = None
+        self._expect(self.header, 1, self._on_command)
 
+    def read(self):
+        """Read whatever is available.  Returns False when the connection has
+        closed."""
+        try:
+            count = self.socket.recv_into(self.view[self.position:])
+        except (BlockingIOError, InterruptedError):
+            return True
+        if not count:
+            return False
+
+        self.position += count
+        while self.position == len(self.view):
+            # A zero length command has no payload, so loop.
+            if not self.on_complete():
+                return False
+        return True
+
+    def close(self):
+        self.socket.close()
+
+    def _expect(self, buffer, size, on_complete):
+        self.view = None  # A bytearray can't be resized while it's viewed.
+        if len(buffer) < size:
+            buffer.extend(bytes(size - len(buffer)))
+        self.view = memoryview(buffer)[:size]
+        self.position = 0
+        self.on_complete = on_complete
+
+    def _on_command(self):
+        self.cmd = self.header[0]
+        if self.cmd == CMDTYPE.PIXEL_DATA_V2:
+            size = 1 + network_protocol.HEADER_V2.size
+        else:
+            size = 3
+        self.view = memoryview(self.header)[1:size]
+        self.position = 0
+        self.on_complete = self._on_header
+        return True
+
+    def _on_header(self):
+        if self.cmd == CMDTYPE.PIXEL_DATA_V2:
+            end = 1 + network_protocol.HEADER_V2.size
+            self.compression, sequence, timestamp, size = (
+                network_protocol.parse_header_v2(self.header[1:end]))
+            self._check_sequence(sequence)
+        else:
+            size = self.header[1] | (self.header[2] << 8)
+
+        self._expect(self.data, size, self._on_data)
+        return True
+
+    def _on_data(self):
+        data = self.view
+        if self.cmd == CMDTYPE.PIXEL_DATA_V2:
+            data = network_protocol.decompress(data, self.compression)
 
-class ThreadedDataServer(SocketServer.ThreadingMixIn, SocketServer.TCPServer):
-    update = None
-    set_brightness = None
-    hasFrame = None
+        try:
+            response = self.receiver.handle_command(self.cmd, data)
+        finally:
+            self._expect(self.header, 1, self._on_command)
+
+        self.socket.sendall(response)
+        return True
+
+    def _check_sequence(self, sequence):
+        if self.sequence is not None and sequence != self.sequence:
+            log.warning('Dropped %s frames', (sequence - self.sequence) &
+                        0xFFFFFFFF)
+        self.sequence = (sequence + 1) & 0xFFFFFFFF
 
 
 class NetworkReceiver:
+    """
+    Receive frames from Network drivers and display them on a layout.
+
+    All connections are served from one thread with a selector.  `frames`
+    counts the frames pushed to the layout; use wait_for_frames() to wait
+    for more of them.
+    """
 
     def __init__(self, layout, port=3142, interface='0.0.0.0'):
         self.layout = layout
-        self.address = (interface, port)
-        SocketServer.TCPServer.allow_reuse_address = True
-        self._server = ThreadedDataServer(self.address, ThreadedDataHandler)
-        self._server.update = self.update
-        self._server.set_brightness = self.layout.set_brightness
+        self.frames = 0
+        self.frame_condition = threading.Condition()
+        self.connections = {}
+        self.running = False
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((interface, port))
+        self._socket.listen(5)
+        self._socket.setblocking(False)
+        self.address = self._socket.getsockname()
+
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._socket, selectors.EVENT_READ)
 
     def start(self, join=False):
-        self._t = threading.Thread(target=self._server.serve_forever)
-        self._t.setDaemon(True)  # don't hang on exit
+        self.running = True
+        self._t = threading.Thread(target=self._serve)
+        self._t.daemon = True  # don't hang on exit
         self._t.start()
         log.info("Listening on %s", self.address)
         if join:
@@ -99,10 +134,79 @@ class NetworkReceiver:
 
     def stop(self):
         log.info("Closing server...")
-        self._server.shutdown()
-        self._server.server_close()
-        # self._t.join()
+        self.running = False
+        self._t.join()
+
+    def wait_for_frames(self, count, timeout=None):
+        """Wait until `count` frames in all have been pushed to the layout.
+        Returns False if the timeout ran out first."""
+        with self.frame_condition:
+            return self.frame_condition.wait_for(
+                lambda: self.frames >= count, timeout)
+
+    def handle_command(self, cmd, data):
+        """Handle one complete command, and return the response bytes."""
+        if cmd in (CMDTYPE.PIXEL_DATA, CMDTYPE.PIXEL_DATA_V2):
+            self.update(data)
+            with self.frame_condition:
+                self.frames += 1
+                self.frame_condition.notify_all()
+            result = RETURN_CODES.SUCCESS
+
+        elif cmd == CMDTYPE.SETUP_DATA:
+            compression = network_protocol.choose_compression(data)
+            return bytes((RETURN_CODES.SUCCESS, compression))
+
+        elif cmd == CMDTYPE.BRIGHTNESS and len(data) == 1:
+            self.layout.set_brightness(data[0])
+            result = RETURN_CODES.SUCCESS
+
+        else:
+            log.error('Unknown command %s', cmd)
+            result = RETURN_CODES.ERROR_BAD_CMD
+
+        return bytes((result,))
 
     def update(self, data):
-        self.layout.setBuffer(list(data))
+        self.layout.set_color_bytes(data)
         self.layout.push_to_driver()
+
+    def _serve(self):
+        try:
+            while self.running:
+                for key, events in self._selector.select(POLL_TIME):
+                    if key.fileobj is self._socket:
+                        self._accept()
+                    else:
+                        self._read(key.data)
+        finally:
+            for connection in list(self.connections.values()):
+                self._close(connection)
+            self._selector.close()
+            self._socket.close()
+
+    def _accept(self):
+        try:
+            sock, address = self._socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+
+        sock.setblocking(False)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection = ReceiverConnection(self, sock)
+        self.connections[sock] = connection
+        self._selector.register(sock, selectors.EVENT_READ, connection)
+
+    def _read(self, connection):
+        try:
+            if connection.read():
+                return
+        except Exception as e:
+            log.exception(e)  # if there's a comm error, just move on
+
+        self._close(connection)
+
+    def _close(self, connection):
+        self.connections.pop(connection.socket, None)
+        self._selector.unregister(connection.socket)
+        connection.close()
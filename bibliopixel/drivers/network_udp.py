@@ -1,65 +1,101 @@
 import socket, sys, time, os
 
 from . driver_base import DriverBase
-from .. util import log, util
+from . import network_protocol
+from . network_protocol import CMDTYPE
+from .. util import log
 from .. drivers.return_codes import RETURN_CODES
 
 
-class CMDTYPE:
-    SETUP_DATA = 1  # reserved for future use
-    PIXEL_DATA = 2
-    BRIGHTNESS = 3
-
-
 class NetworkUDP(DriverBase):
     """Driver for communicating with another device on the network."""
 
     def __init__(self, num=0, width=0, height=0, host="localhost",
-                 broadcast=False, port=3142, broadcast_interface='', **kwds):
+                 broadcast=False, port=3142, broadcast_interface='',
+                 protocol=1, compression=None,
+                 mtu=network_protocol.UDP_MAX_DATAGRAM, **kwds):
+        """
+        Args:
+            protocol: the protocol version to send.  There is no
+                negotiation over UDP, so the receiver must understand it.
+            compression: for protocol 2: None, 'zlib' or 'rle'
+            mtu: the largest datagram to send.  Larger frames are split
+                into fragments, which need a NetworkUDPReceiver.  By
+                default, only frames too big for one datagram are split;
+                use network_protocol.UDP_MTU to avoid IP fragmentation.
+        """
         super().__init__(num, width, height, **kwds)
 
+        if protocol < 2 and self.bufByteCount() > network_protocol.MAX_V1_SIZE:
+            raise ValueError('Protocol 1 cannot send more than %s pixels' %
+                             (network_protocol.MAX_V1_SIZE // 3))
+
         self._host = host
         self._port = port
         self._sock = None
         self._broadcast = broadcast
         self._broadcast_interface = broadcast_interface
+        self._protocol = protocol
+        self._compression = network_protocol.make_compression(compression)
+        self._mtu = mtu
+        self._sequence = 0
 
-    def _generateHeader(self, cmd, size):
-        packet = bytearray()
-        packet.append(cmd)
-        packet.append(size & 0xFF)
-        packet.append(size >> 8)
-        return packet
+        self.frames_sent = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
 
     def _connect(self):
+        if self._sock:
+            return self._sock
+
         try:
-            self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
 
             if self._broadcast:
-                self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
 
-            return self._sock
+            sock.connect((self._host, self._port))
         except socket.gaierror:
+            sock.close()
             error = "Unable to connect to or resolve host: {}".format(
                 self._host)
             log.error(error)
             raise IOError(error)
 
+        self._sock = sock
+        return sock
+
+    def _disconnect(self):
+        if self._sock:
+            self._sock.close()
+            self._sock = None
+
+    def cleanup(self):
+        self._disconnect()
+
     def _compute_packet(self):
-        count = self.bufByteCount()
-        self._packet = util.generate_header(CMDTYPE.PIXEL_DATA, count)
-        indexes = range(self._pos, self._pos + self.numLEDs)
-        self._packet.extend(int(c) for i in indexes for c in self._colors[i])
+        packet = network_protocol.make_pixel_packet(
+            self._color_bytes(), self._protocol, self._sequence,
+            compression=self._compression)
+        self._packet = list(network_protocol.fragment(
+            packet, self._sequence, self._mtu))
+        self._sequence += 1
+
+    def _packet_sizes(self):
+        return sum(len(d) for d in self._packet), len(self._packet)
 
     # Push new data to strand
     def _send_packet(self):
         try:
             s = self._connect()
-            s.sendto(self._packet, (self._host, self._port))
-
-            s.close()
+            for datagram in self._packet:
+                s.send(datagram)
+                self.bytes_sent += len(datagram)
+            self.packets_sent += len(self._packet)
+            self.frames_sent += 1
 
         except Exception as e:
+            self._disconnect()
             log.exception(e)
             error = "Problem communicating with network receiver!"
             log.error(error)
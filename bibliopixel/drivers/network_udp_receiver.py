@@ -0,0 +1,113 @@
+import threading, time
+
+try:
+    import SocketServer
+except:
+    import socketserver as SocketServer
+from . import network_protocol
+from . network_protocol import CMDTYPE
+from .. util import log
+
+
+class UDPDataHandler(SocketServer.BaseRequestHandler):
+
+    def handle(self):
+        try:
+            self.server.receive(self.request[0])
+        except Exception as e:
+            log.exception(e)
+            pass  # if there's a comm error, just move on
+
+
+class UDPDataServer(SocketServer.UDPServer):
+    # Fragments must be reassembled in order, so there's only one thread.
+    max_packet_size = 0x10000
+    receive = None
+
+
+class NetworkUDPReceiver:
+    """
+    Receive frames from NetworkUDP drivers, reassembling fragmented frames.
+
+    An incomplete frame is dropped as soon as a fragment from a newer frame
+    arrives, so torn frames are never displayed.
+    """
+
+    def __init__(self, layout, port=3142, interface='0.0.0.0'):
+        self.layout = layout
+        self.address = (interface, port)
+        self.reassembler = network_protocol.Reassembler()
+        self.sequence = None
+        self.reset_stats()
+
+        UDPDataServer.allow_reuse_address = True
+        self._server = UDPDataServer(self.address, UDPDataHandler)
+        self._server.receive = self.receive
+
+    def start(self, join=False):
+        self._t = threading.Thread(target=self._server.serve_forever)
+        self._t.daemon = True  # don't hang on exit
+        self._t.start()
+        log.info("Listening on %s", self.address)
+        if join:
+            self._t.join()
+
+    def stop(self):
+        log.info("Closing server...")
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_stats(self):
+        self.start_time = time.time()
+        self.packets_received = 0
+        self.frames_received = 0
+        self.frames_lost = 0
+        self.reassembler.dropped = self.reassembler.stale = 0
+
+    def stats(self):
+        """Return the packet and frame counters, and the packet rate in
+        packets per second since the last reset_stats()."""
+        elapsed = time.time() - self.start_time
+        return {
+            'packets_received': self.packets_received,
+            'packets_per_second': self.packets_received / (elapsed or 1),
+            'frames_received': self.frames_received,
+            'frames_dropped': self.reassembler.dropped,
+            'frames_lost': self.frames_lost,
+            'fragments_stale': self.reassembler.stale,
+        }
+
+    def receive(self, datagram):
+        self.packets_received += 1
+        packet = self.reassembler.add(datagram)
+        if packet is None:
+            return
+
+        cmd, sequence, data = network_protocol.parse_packet(packet)
+        if cmd in (CMDTYPE.PIXEL_DATA, CMDTYPE.PIXEL_DATA_V2):
+            if sequence is not None and not self.check_sequence(sequence):
+                return
+            self.frames_received += 1
+            self.update(data)
+
+        elif cmd == CMDTYPE.BRIGHTNESS:
+            self.layout.set_brightness(data[0])
+
+        else:
+            log.error('Unknown command %s', cmd)
+
+    def check_sequence(self, sequence):
+        """Count skipped frames. Returns False for frames that arrive after
+        a newer one."""
+        if self.sequence is not None:
+            gap = (sequence - self.sequence) & 0xFFFFFFFF
+            if not 0 < gap < 0x80000000:
+                self.reassembler.stale += 1
+                return False
+            self.frames_lost += gap - 1
+        self.sequence = sequence
+        return True
+
+    def update(self, data):
+        self.layout.setBuffer(data)
+        self.layout.push_to_driver()
@@ -3,6 +3,7 @@ from . matrix import Matrix
 from . cube import Cube
 from . pov import POV
 from . strip import Strip
+from . text import TextStrip
 from . geometry import Rotation
 from . geometry.matrix import make_matrix_coord_map
 from . geometry.circle import make_circle_coord_map
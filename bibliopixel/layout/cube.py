@@ -4,7 +4,8 @@ from .. import colors
 from .. util import log
 from . import font
 from . layout import Layout
-from . geometry.cube import make_cube_coord_map, make_cube_coord_map_positions
+from . geometry.coord_map import compile_coord_map
+from . geometry.cube import make_cube_coord_map
 
 
 class Cube(Layout):
@@ -28,10 +29,12 @@ class Cube(Layout):
             else:
                 raise TypeError("Must provide coord_map if using multiple drivers!")
 
-        self.set_pixel_positions(make_cube_coord_map_positions(self.coord_map))
+        self.compiled_map = compile_coord_map(self.coord_map)
+        self.coord_map = self.compiled_map.rows()
+        self.set_pixel_positions(self.compiled_map.positions())
 
     def get_pixel_positions(self):
-        return make_cube_coord_map_positions(self.coord_map)
+        return self.compiled_map.positions()
 
     def set(self, x, y, z, color):
         try:
@@ -47,6 +50,14 @@ class Cube(Layout):
         except IndexError:
             return 0, 0, 0
 
+    def set_many(self, points, colors):
+        """Set many points at once, one color each.
+
+        points is a sequence of (x, y, z) triples or an (n, 3) numpy array,
+        and colors a sequence of colors or an (n, 3) numpy array.  Points
+        outside the cube are skipped."""
+        self._set_pixels(self.compiled_map.lookup(points), colors)
+
     def setHSV(self, x, y, z, hsv):
         color = colors.hsv2rgb(hsv)
         self._set(x, y, z, color)
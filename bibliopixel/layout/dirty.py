@@ -0,0 +1,36 @@
+class Dirty(object):
+    """
+    Keep track of the range of pixel indices that have changed since the last
+    time the layout was pushed to its drivers.
+
+    The range is half-open and is empty when begin >= end.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.set_all()
+
+    def set(self, index):
+        if index < self.begin:
+            self.begin = index
+        if index >= self.end:
+            self.end = index + 1
+
+    def set_range(self, begin, end):
+        if begin < end:
+            self.begin = min(self.begin, begin)
+            self.end = max(self.end, end)
+
+    def set_all(self):
+        self.begin, self.end = 0, self.size
+
+    def clear(self):
+        self.begin, self.end = self.size, 0
+
+    def slice(self, pos, num):
+        """Return the changed range within [pos, pos + num), relative to pos.
+        """
+        return max(self.begin, pos) - pos, min(self.end, pos + num) - pos
+
+    def __bool__(self):
+        return self.begin < self.end
@@ -1,3 +1,5 @@
+import collections
+
 GLCDFONT = [
     [0x00, 0x00, 0x00, 0x00, 0x00],
     [0x3E, 0x5B, 0x4F, 0x5B, 0x3E],
@@ -674,11 +676,81 @@ fonts = {
 
 default_font = '8x6'
 
+# How many rasterized glyphs to keep.
+GLYPH_CACHE_SIZE = 1024
+
+# A glyph rasterized at one scale.  `foreground` and `background` are bit
+# planes: one bytes object for each row of pixels, with a 1 for each pixel
+# that is in the plane.  `advance` is the width of the character cell before
+# scaling, including the separator.
+Glyph = collections.namedtuple('Glyph', 'advance foreground background')
+
+# A bytes.translate table that inverts a bit plane.
+INVERT = bytes((1, 0)) + bytes(254)
+
+
+def glyph_columns(f, c):
+    """Return the column bitmaps of character code c in font f."""
+    data = f['data']
+    first, last = f.get('bounds', (0, len(data) - 1))
+    if first <= c <= last:
+        return data[c - first]
+    return f.get('undef', [0] * f.get('width', 0))
+
+
+def make_glyph(f, c, font_scale=1):
+    columns = glyph_columns(f, c)
+    advance = len(columns) + f.get('sep', 1)
+    foreground = []
+
+    for j in range(f['height']):
+        row = bytes(i < len(columns) and (columns[i] >> j) & 1
+                    for i in range(advance) for k in range(font_scale))
+        foreground.extend([row] * font_scale)
+
+    background = [row.translate(INVERT) for row in foreground]
+    return Glyph(advance, foreground, background)
+
+
+class GlyphCache(object):
+    """A least-recently-used cache of rasterized glyphs."""
+
+    def __init__(self, size=GLYPH_CACHE_SIZE):
+        self.size = size
+        self.glyphs = collections.OrderedDict()
+
+    def get(self, fonts, name, c, font_scale=1):
+        f = fonts[name]
+        key = name, c, font_scale
+        entry = self.glyphs.get(key)
+
+        # A font loaded under the same name replaces the old glyphs.
+        if entry and entry[0] is f:
+            self.glyphs.move_to_end(key)
+            return entry[1]
+
+        glyph = make_glyph(f, c, font_scale)
+        self.glyphs[key] = f, glyph
+        if len(self.glyphs) > self.size:
+            self.glyphs.popitem(last=False)
+        return glyph
+
+    def clear(self):
+        self.glyphs.clear()
+
+
+GLYPHS = GlyphCache()
+
+
+def get_glyph(fonts, name, c, font_scale=1):
+    """Return the Glyph for character c, from the shared cache."""
+    return GLYPHS.get(fonts, name, ord(c), font_scale)
+
 
 def str_dim(text, font=default_font, font_scale=1, final_sep=True):
     f = fonts[font]
     fh = f['height']
-    FONT = f['data']
+    sep = f.get('sep', 1)
     y = font_scale * fh
     x_list = []
     x = 0
@@ -689,21 +761,14 @@ def str_dim(text, font=default_font, font_scale=1, final_sep=True):
         elif c == '\r':
             pass  # skip it
         else:
-            c = ord(c)  # make it the int value
-            if c < f['bounds'][0] or c > f['bounds'][1]:
-                c_data = f['undef']
-            else:
-                c_data = FONT[c - f['bounds'][0]]
-
-            fw = len(c_data)
-            fw += f['sep']
+            fw = len(glyph_columns(f, ord(c))) + sep
             x += font_scale * fw
         x_list.append(x)
 
-        if not final_sep:
-            x_list = [xi - font_scale * f['sep'] for xi in x_list]
+    if not final_sep:
+        x_list = [xi - font_scale * sep for xi in x_list]
 
-    return (max(x_list), y)
+    return (max(x_list, default=0), y)
 
 
 def get_font_menu_options():
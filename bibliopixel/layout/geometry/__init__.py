@@ -1,5 +1,6 @@
 from . circle import (calc_ring_pixel_count, calc_ring_steps, make_circle_coord_map,
                       make_circle_coord_map_positions)
+from . coord_map import CoordMap, compile_coord_map
 from . cube import make_cube_coord_map, make_cube_coord_map_positions
 from . matrix import make_matrix_coord_map, make_matrix_coord_map_multi, make_matrix_coord_map_positions
 from . strip import make_strip_coord_map, make_strip_coord_map_multi, make_strip_coord_map_positions
@@ -0,0 +1,201 @@
+"""
+Coordinate maps compiled into one flat array of strip indices.
+
+A coordinate map is written as nested lists - coord_map[y][x] for a matrix,
+coord_map[z][y][x] for a cube - but it is compiled once into a CoordMap: a
+flat array('I') in which x varies fastest, with any rotation, reflection or
+transposition already folded in.  Cells that don't map to a pixel hold
+MISSING, which is past the end of every strip.
+"""
+
+import functools, numbers, operator
+from array import array
+from . rotation import Rotation
+from ... project import data_maker
+
+MISSING = 0xFFFFFFFF
+
+
+class CoordMap(object):
+    def __init__(self, shape, index=None):
+        self.shape = tuple(shape)
+        self.size = functools.reduce(operator.mul, self.shape, 1)
+        if index is None:
+            index = array('I', [MISSING]) * self.size
+        elif len(index) != self.size:
+            raise ValueError('A map of shape %s needs %s entries, not %s' %
+                             (self.shape, self.size, len(index)))
+        self.index = index
+
+        self.strides = []
+        stride = 1
+        for s in self.shape:
+            self.strides.append(stride)
+            stride *= s
+
+    def offset(self, *coords):
+        """Return the position of coords in self.index."""
+        result = 0
+        for c, s, stride in zip(coords, self.shape, self.strides):
+            if not 0 <= c < s:
+                raise IndexError('Index out of range.')
+            result += c * stride
+        return result
+
+    def get(self, *coords):
+        """Return the strip index at coords."""
+        i = self.index[self.offset(*coords)]
+        if i == MISSING:
+            raise IndexError('Index out of range.')
+        return i
+
+    def lookup(self, points):
+        """Return the strip index of each point in a sequence or a numpy
+        array of coordinates, or MISSING for points outside the map."""
+        if data_maker.is_numpy(points):
+            return self._lookup_numpy(points)
+
+        index = self.index
+        if len(self.shape) == 1:
+            size = self.size
+            return [index[p] if 0 <= p < size else MISSING for p in points]
+
+        if len(self.shape) == 2:
+            w, h = self.shape
+            return [index[x + y * w] if 0 <= x < w and 0 <= y < h
+                    else MISSING for x, y in points]
+
+        w, h, d = self.shape
+        wh = w * h
+        return [index[x + y * w + z * wh]
+                if 0 <= x < w and 0 <= y < h and 0 <= z < d
+                else MISSING for x, y, z in points]
+
+    def _lookup_numpy(self, points):
+        numpy = data_maker.numpy
+        points = numpy.asarray(points, numpy.int64).reshape(-1, len(self.shape))
+        inside = numpy.all((points >= 0) & (points < self.shape), axis=1)
+        offsets = points[inside].dot(self.strides)
+        result = numpy.full(len(points), MISSING, numpy.uint32)
+        result[inside] = numpy.frombuffer(self.index, numpy.uint32)[offsets]
+        return result
+
+    def window(self, x, y, width, height):
+        """Clip a rectangle of a two-dimensional map.
+
+        Returns (x0, y0, x1, y1, pixels): the clipped rectangle relative to
+        (x, y), and the strip indices inside it, row by row."""
+        w, h = self.shape
+        x0, y0 = max(0, -x), max(0, -y)
+        x1, y1 = min(width, w - x), min(height, h - y)
+        pixels = array('I')
+        for row in range(y + y0, y + y1):
+            begin = x + x0 + row * w
+            pixels.extend(self.index[begin:begin + x1 - x0])
+        return x0, y0, max(x0, x1), max(y0, y1), pixels
+
+    def span_pixels(self, spans):
+        """Return the strip indices of horizontal spans (x, y, width) of a
+        two-dimensional map, clipped to the map."""
+        w, h = self.shape
+        index = self.index
+        pixels = array('I')
+        for x, y, width in spans:
+            if 0 <= y < h:
+                x0, x1 = max(x, 0), min(x + width, w)
+                if x0 < x1:
+                    pixels.extend(index[x0 + y * w:x1 + y * w])
+        return pixels
+
+    def rows(self):
+        """Return the map as nested lists, as accepted by the layouts.
+
+        The MISSING entries that pad out the rows and planes of a ragged map
+        are left off, so the rows of a ragged map come back as they went in."""
+        if len(self.shape) == 1:
+            return self.index.tolist()
+
+        width = self.shape[0]
+        result = [_unpad(self.index[i:i + width].tolist())
+                  for i in range(0, self.size, width)]
+        for s in self.shape[1:-1]:
+            result = [_unpad(result[i:i + s])
+                      for i in range(0, len(result), s)]
+        return result
+
+    def positions(self):
+        """Return a list of [x, y, z] positions, one for each strip index."""
+        width, height = (self.shape + (1, 1))[:2]
+        pixels = [i for i in self.index if i != MISSING]
+        result = [None] * max(self.size, max(pixels, default=-1) + 1)
+        for i, pixel in enumerate(self.index):
+            if pixel != MISSING:
+                result[pixel] = [i % width, (i // width) % height,
+                                 i // (width * height)]
+        return result
+
+    def rotate(self, rotation=Rotation.ROTATE_0, flip=False):
+        """Return a new two-dimensional map, rotated clockwise `rotation`
+        times by 90 degrees and then optionally flipped top to bottom."""
+        w, h = self.shape
+        rotation %= 4
+        if rotation % 2:
+            nw, nh = h, w
+        else:
+            nw, nh = w, h
+
+        # Cell (x, y) of the result comes from cell base + x * dx + y * dy
+        # of self.
+        base, dx, dy = {
+            0: (0, 1, w),
+            1: ((h - 1) * w, -w, 1),
+            2: (w * h - 1, -1, -w),
+            3: (w - 1, w, -1),
+        }[rotation]
+
+        index = self.index
+        result = array('I')
+        for y in range(nh):
+            begin = base + (nh - 1 - y if flip else y) * dy
+            result.extend(index[begin + x * dx] for x in range(nw))
+
+        return CoordMap((nw, nh), result)
+
+
+def _unpad(items):
+    """Remove trailing MISSING entries or empty rows from a list."""
+    end = len(items)
+    while end and items[end - 1] in (MISSING, []):
+        end -= 1
+    del items[end:]
+    return items
+
+
+def compile_coord_map(coord_map):
+    """Compile nested lists of strip indices into a CoordMap.
+
+    Ragged maps are padded out with MISSING."""
+    if isinstance(coord_map, CoordMap):
+        return coord_map
+
+    depth, item = 0, coord_map
+    while not isinstance(item, numbers.Integral):
+        depth += 1
+        item = item[0] if len(item) else 0
+
+    if depth == 1:
+        return CoordMap((len(coord_map),), array('I', coord_map))
+
+    planes = [coord_map] if depth == 2 else coord_map
+    height = max((len(p) for p in planes), default=0)
+    width = max((len(r) for p in planes for r in p), default=0)
+
+    index = array('I')
+    for plane in planes:
+        for row in plane:
+            index.extend(row)
+            index.extend([MISSING] * (width - len(row)))
+        index.extend([MISSING] * (width * (height - len(plane))))
+
+    shape = (width, height) if depth == 2 else (width, height, len(planes))
+    return CoordMap(shape, index)
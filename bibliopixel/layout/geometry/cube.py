@@ -1,3 +1,4 @@
+from . coord_map import compile_coord_map
 from . rotation import Rotation, rotate_and_flip
 from . matrix import make_matrix_coord_map
 
@@ -20,20 +21,4 @@ def make_cube_coord_map(dx, dy, dz, xy_serpentine=True, offset=0,
 
 
 def make_cube_coord_map_positions(coord_map):
-    num = 0
-    dx, dy, dz = (0, 0, len(coord_map))
-
-    for xy in coord_map:
-        if len(xy) > dx:
-            dy = len(xy)
-        for x in xy:
-            if len(x) > dx:
-                dx = len(x)
-            num += len(x)
-
-    result = [None] * num
-    for z in range(dz):
-        for y in range(dy):
-            for x in range(dx):
-                result[coord_map[z][y][x]] = [x, y, z]
-    return result
+    return compile_coord_map(coord_map).positions()
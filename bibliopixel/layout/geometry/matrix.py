@@ -1,5 +1,7 @@
 from . import index_ops
+from . coord_map import MISSING, CoordMap, compile_coord_map
 from . rotation import Rotation, rotate_and_flip
+from array import array
 import copy
 
 
@@ -29,13 +31,37 @@ class Matrix(object):
                serpentine_y and index_ops.serpentine_y,
                transpose and index_ops.transpose)
         self.operations = list(filter(None, ops))
+        self._compile()
+
+    def _compile(self):
+        """Fold self.operations into a CoordMap.
+
+        Each operation is its own inverse, so running them backwards from
+        each cell of the strip finds the x, y that maps to it."""
+        cells = {}
+        for i in range(self.columns * self.rows):
+            x, y = i % self.columns, i // self.columns
+            for o in reversed(self.operations):
+                x, y = o(x, y, self)
+            cells[x, y] = i
+
+        xs, ys = [x for x, y in cells], [y for x, y in cells]
+        x0, y0 = min(xs, default=0), min(ys, default=0)
+        self._origin = x0, y0
+        self.compiled_map = CoordMap(
+            (max(xs, default=-1) + 1 - x0, max(ys, default=-1) + 1 - y0))
+        for (x, y), i in cells.items():
+            self.compiled_map.index[
+                self.compiled_map.offset(x - x0, y - y0)] = i
 
     def _index(self, x, y):
-        for o in self.operations:
-            x, y = o(x, y, self)
-
-        if 0 <= x < self.columns and 0 <= y < self.rows:
-            return x + y * self.columns
+        x -= self._origin[0]
+        y -= self._origin[1]
+        width, height = self.compiled_map.shape
+        if 0 <= x < width and 0 <= y < height:
+            i = self.compiled_map.index[x + y * width]
+            if i != MISSING:
+                return i
 
         raise IndexError('Index out of range.')
 
@@ -49,16 +75,21 @@ class Matrix(object):
 def make_matrix_coord_map(dx, dy, serpentine=True, offset=0,
                           rotation=Rotation.ROTATE_0, y_flip=False):
     """Helper method to generate X,Y coordinate maps for strips"""
-    result = []
-    for y in range(dy):
-        if not serpentine or y % 2 == 0:
-            result.append([(dx * y) + x + offset for x in range(dx)])
-        else:
-            result.append([((dx * (y + 1)) - 1) - x + offset for x in range(dx)])
+    return compile_matrix_coord_map(
+        dx, dy, serpentine, offset, rotation, y_flip).rows()
+
 
-    result = rotate_and_flip(result, rotation, y_flip)
+def compile_matrix_coord_map(dx, dy, serpentine=True, offset=0,
+                             rotation=Rotation.ROTATE_0, y_flip=False):
+    """Like make_matrix_coord_map, but return a CoordMap."""
+    index = array('I')
+    for y in range(dy):
+        row = range(dx * y + offset, dx * (y + 1) + offset)
+        if serpentine and y % 2:
+            row = reversed(row)
+        index.extend(row)
 
-    return result
+    return CoordMap((dx, dy), index).rotate(rotation, y_flip)
 
 
 DEFAULT_CONFIG = {
@@ -119,16 +150,4 @@ def make_matrix_coord_map_multi(config, rotation=Rotation.ROTATE_0, y_flip=False
 
 
 def make_matrix_coord_map_positions(coord_map):
-    max_width = 0
-    for x in coord_map:
-        if len(x) > max_width:
-            max_width = len(x)
-
-    num = len(coord_map) * max_width
-    result = [None] * num
-
-    for y in range(len(coord_map)):
-        for x in range(len(coord_map[y])):
-            result[coord_map[y][x]] = [x, y, 0]
-
-    return result
+    return compile_coord_map(coord_map).positions()
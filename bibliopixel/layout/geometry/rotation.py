@@ -10,7 +10,7 @@ class Rotation(IntEnum):
 
 def rotate_and_flip(coord_map, rotation, flip):
     for i in range(rotation):
-        coord_map = list(zip(*coord_map[::-1]))
+        coord_map = [list(i) for i in zip(*coord_map[::-1])]
 
     if flip:
         coord_map = coord_map[::-1]
@@ -1,14 +1,28 @@
-import time
+import array, ctypes, time
 from .. import colors, util
 from .. project import data_maker, project
+from .. project.color_list import ByteColorList
 from .. threads.update_threading import UpdateThreading
+from . dirty import Dirty
 
 
 class Layout(object):
 
     def __init__(self, drivers, threadedUpdate, brightness,
-                 maker=data_maker.MAKER, **kwds):
-        """Base LED class. Use Strip or Matrix instead!"""
+                 maker=data_maker.MAKER, skip_unchanged=False, pipeline=1,
+                 **kwds):
+        """Base LED class. Use Strip or Matrix instead!
+
+        skip_unchanged - if True, drivers skip the pixels that have not
+            changed since the last frame.  Only use this if all animations
+            change pixels through the layout methods, rather than writing
+            directly into the color list.
+
+        pipeline - how many frames can be in flight at once.  If it's more
+            than 1, each driver computes and sends its packets on its own
+            thread while the animation renders the following frames, at the
+            cost of `pipeline - 1` frames of extra latency.
+        """
         project.raise_if_unknown_attributes(kwds, 'layout', self)
         self.drivers = drivers if isinstance(drivers, list) else [drivers]
 
@@ -18,10 +32,16 @@ class Layout(object):
         # This buffer will always be the same list - i.e. is guaranteed to only
         # be changed by list surgery, never assignment.
         self._colors = maker[1](self.numLEDs)
+        self._is_numpy = data_maker.is_numpy(self._colors)
+        self.dirty = Dirty(len(self._colors))
+        self.skip_unchanged = skip_unchanged
 
         pos = 0
-        for d in self.drivers:
+        for i, d in enumerate(self.drivers):
+            d.metrics_name = 'driver.%s.%d' % (type(d).__name__, i)
             d.set_colors(self._colors, pos)
+            d.skip_unchanged = skip_unchanged
+            d.start_pipeline(pipeline)
             pos += d.numLEDs
 
         self.frame_render_time = 0
@@ -40,9 +60,15 @@ class Layout(object):
         return self.push_to_driver()
 
     def cleanup(self):
-        self.all_off()
-        self.push_to_driver()
-        self.threading.wait_for_update()
+        try:
+            self.all_off()
+            self.push_to_driver()
+            self.threading.wait_for_update()
+            for d in self.drivers:
+                d.wait_for_pipeline()
+        finally:
+            for d in self.drivers:
+                d.stop_pipeline()
 
     def _get_base(self, pixel):
         if pixel >= 0 and pixel < self.numLEDs:
@@ -52,6 +78,76 @@ class Layout(object):
     def _set_base(self, pixel, color):
         if pixel >= 0 and pixel < self.numLEDs:
             self._colors[pixel] = tuple(color)
+            self.dirty.set(pixel)
+
+    def _set_pixels(self, pixels, colors):
+        """Set many strip indices at once, one color each.  Indices outside
+        the layout, like geometry.coord_map.MISSING, are skipped."""
+        n = self.numLEDs
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            pixels = numpy.asarray(pixels, numpy.int64).reshape(-1)
+            colors = numpy.asarray(colors).reshape(-1, 3)[:len(pixels)]
+            pixels = pixels[:len(colors)]
+            inside = (pixels >= 0) & (pixels < n)
+            pixels = pixels[inside]
+            if len(pixels):
+                self._colors[pixels] = colors[inside]
+                self.dirty.set_range(int(pixels.min()), int(pixels.max()) + 1)
+            return
+
+        target = self._colors
+        for p, c in zip(pixels, colors):
+            if 0 <= p < n:
+                target[p] = c if type(c) is tuple else tuple(c)
+
+        pixels = pixels[:len(colors)]
+        self._set_dirty(pixels)
+
+    def _fill_pixels(self, pixels, color):
+        """Set many strip indices at once to the same color.  Indices outside
+        the layout are skipped."""
+        n = self.numLEDs
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            pixels = numpy.asarray(pixels, numpy.int64).reshape(-1)
+            pixels = pixels[(pixels >= 0) & (pixels < n)]
+            if len(pixels):
+                self._colors[pixels] = color
+                self.dirty.set_range(int(pixels.min()), int(pixels.max()) + 1)
+            return
+
+        color = tuple(color)
+        target = self._colors
+        for p in pixels:
+            if 0 <= p < n:
+                target[p] = color
+
+        self._set_dirty(pixels)
+
+    def _set_dirty(self, pixels):
+        if len(pixels):
+            n = self.numLEDs
+            begin, end = min(pixels), max(pixels) + 1
+            if begin < 0 or end > n:
+                inside = [p for p in pixels if 0 <= p < n] or [0]
+                begin, end = min(inside), max(inside) + 1
+            self.dirty.set_range(begin, end)
+
+    def _get_pixels(self, pixels):
+        """Get the colors of many strip indices at once.  Indices outside the
+        layout are black."""
+        n = self.numLEDs
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            pixels = numpy.asarray(pixels, numpy.int64).reshape(-1)
+            inside = (pixels >= 0) & (pixels < n)
+            result = numpy.zeros((len(pixels), 3), self._colors.dtype)
+            result[inside] = self._colors[pixels[inside]]
+            return result
+
+        colors = self._colors
+        return [colors[p] if 0 <= p < n else (0, 0, 0) for p in pixels]
 
     def get_pixel_positions(self):
         result = []
@@ -62,6 +158,11 @@ class Layout(object):
     def push_to_driver(self):
         """Push the current pixel state to the driver"""
         # This is overridden elsewhere.
+        if self.skip_unchanged:
+            for d in self.drivers:
+                d.set_changed(*self.dirty.slice(d._pos, d.numLEDs))
+            self.dirty.clear()
+
         self.threading.push_to_driver()
 
     # use with caution!
@@ -75,11 +176,59 @@ class Layout(object):
                           "Expected: {} bytes / Received: {} bytes"
                           .format(len(self._colors), len(buf)))
         self._colors[:] = buf
+        self.dirty.set_all()
+
+    def set_color_bytes(self, data):
+        """Set all the colors from a bytes-like object of RGB triples, without
+        creating a Python object for each pixel where the color list allows.
+        """
+        size = 3 * len(self._colors)
+        if len(data) != size:
+            raise IOError("Data buffer size incorrect! "
+                          "Expected: {} bytes / Received: {} bytes"
+                          .format(size, len(data)))
+
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            self._colors.reshape(-1)[:] = numpy.frombuffer(data, numpy.uint8)
+
+        elif isinstance(self._colors, ByteColorList):
+            self._colors.data[:] = data
+
+        elif isinstance(self._colors, ctypes.Array):
+            # Shared memory: copy straight into the ctypes buffer.
+            target = memoryview(self._colors).cast('B')
+            if ctypes.sizeof(self._colors) == size:
+                target[:] = data
+            else:
+                target.cast('f')[:] = array.array('f', iter(data))
+
+        else:
+            # https://stackoverflow.com/questions/1624883
+            self._colors[:] = list(zip(*(iter(bytes(data)),) * 3))
+
+        self.dirty.set_all()
 
     def setBuffer(self, buf):
         """DEPRECATED!"""
-        # https://stackoverflow.com/questions/1624883
-        self.set_colors(buf=list(zip(*(iter(buf),) * 3)))
+        if isinstance(buf, (bytes, bytearray, memoryview)):
+            self.set_color_bytes(buf)
+        elif self._is_numpy:
+            self.set_colors(buf=data_maker.numpy.reshape(buf, (-1, 3)))
+        else:
+            # https://stackoverflow.com/questions/1624883
+            self.set_colors(buf=list(zip(*(iter(buf),) * 3)))
+
+    def set_palette(self, palette):
+        """Replace the palette of an indexed color list - see
+        data_maker.Maker.  Every pixel keeps its palette index, so this
+        recolors the whole layout at once."""
+        try:
+            set_palette = self._colors.set_palette
+        except AttributeError:
+            raise ValueError('set_palette needs a Maker with indexed=True')
+        set_palette(palette)
+        self.dirty.set_all()
 
     def set_brightness(self, brightness):
         self.brightness = brightness
@@ -103,7 +252,11 @@ class Layout(object):
 
     def all_off(self):
         """Set all pixels off"""
-        self._colors[:] = [(0, 0, 0)] * self.numLEDs
+        if self._is_numpy:
+            self._colors[:] = 0
+        else:
+            self._colors[:] = [(0, 0, 0)] * len(self._colors)
+        self.dirty.set_all()
 
     # Fill the strand (or a subset) with a single color using a Color object
     def fill(self, color, start=0, end=-1):
@@ -111,8 +264,15 @@ class Layout(object):
         start = max(start, 0)
         if end < 0 or end >= self.numLEDs:
             end = self.numLEDs - 1
-        for led in range(start, end + 1):  # since 0-index include end in range
-            self._set_base(led, color)
+        if start > end:
+            return
+
+        # since 0-index include end in range
+        if self._is_numpy:
+            self._colors[start:end + 1] = color
+        else:
+            self._colors[start:end + 1] = [tuple(color)] * (end + 1 - start)
+        self.dirty.set_range(start, end + 1)
 
     # Fill the strand (or a subset) with a single color using RGB values
     def fillRGB(self, r, g, b, start=0, end=-1):
@@ -1,11 +1,13 @@
-import math, threading, time
+import itertools, math, threading, time
 
 from .. import colors
+from .. project import data_maker
 from .. util import log
 from . import matrix_drawing as matrix
 from . import font
 from . layout import Layout
-from . geometry.matrix import make_matrix_coord_map, make_matrix_coord_map_positions
+from . geometry.coord_map import compile_coord_map
+from . geometry.matrix import make_matrix_coord_map
 from . geometry.rotation import Rotation
 
 
@@ -59,7 +61,17 @@ class Matrix(Layout):
                 raise TypeError(
                     "Must provide coord_map if using multiple drivers!")
 
-        self.set_pixel_positions(make_matrix_coord_map_positions(self.coord_map))
+        # Compile the map once; the scalar setters index its rows, which is
+        # quicker in Python than computing a flat offset.
+        self.compiled_map = compile_coord_map(self.coord_map)
+        self.coord_map = self.compiled_map.rows()
+        self.set_pixel_positions(self.compiled_map.positions())
+
+        # Does the map cover the whole strip, so fillScreen can fill it all?
+        index = self.compiled_map.index
+        self._map_is_strip = (
+            len(index) == self.numLEDs and len(set(index)) == len(index) and
+            max(index, default=0) < self.numLEDs)
 
         # if 90 or 270 rotation dimensions need to be swapped so they match the
         # matrix rotation
@@ -90,7 +102,7 @@ class Matrix(Layout):
         self.fonts = font.fonts
 
     def get_pixel_positions(self):
-        return make_matrix_coord_map_positions(self.coord_map)
+        return self.compiled_map.positions()
 
     def loadFont(self, name, height, width, data):
         self.fonts[name] = {
@@ -156,6 +168,79 @@ class Matrix(Layout):
         except IndexError:
             return 0, 0, 0
 
+    def set_many(self, points, colors):
+        """Set many points at once, one color each.
+
+        points is a sequence of (x, y) pairs or an (n, 2) numpy array, and
+        colors a sequence of colors or an (n, 3) numpy array.  Points outside
+        the matrix are skipped."""
+        if tuple(self.pixelSize) != (1, 1):
+            for (x, y), color in zip(points, colors):
+                self._set(x, y, color)
+        else:
+            self._set_pixels(self.compiled_map.lookup(points), colors)
+
+    def set_block(self, x, y, block, width=None):
+        """Copy a block of colors into the rectangle whose top-left corner is
+        at x, y, clipped to the matrix.
+
+        block is a list of rows of colors, an (h, w, 3) numpy array, or a
+        bytes-like object of RGB triples, `width` pixels wide."""
+        if isinstance(block, (bytes, bytearray, memoryview)):
+            block = self._bytes_to_block(block, width)
+
+        height = len(block)
+        width = len(block[0]) if height else 0
+
+        if tuple(self.pixelSize) != (1, 1):
+            for j, row in enumerate(block):
+                for i, color in enumerate(row):
+                    self._set(x + i, y + j, color)
+            return
+
+        x0, y0, x1, y1, pixels = self.compiled_map.window(x, y, width, height)
+        if data_maker.is_numpy(block):
+            colors = block[y0:y1, x0:x1].reshape(-1, 3)
+        else:
+            colors = list(itertools.chain.from_iterable(
+                row[x0:x1] for row in block[y0:y1]))
+        self._set_pixels(pixels, colors)
+
+    def get_block(self, x, y, width, height):
+        """Return the colors of a rectangle whose top-left corner is at x, y,
+        as a list of rows, or an (h, w, 3) numpy array if the color list is
+        a numpy array.  Points outside the matrix are black."""
+        x0, y0, x1, y1, pixels = self.compiled_map.window(x, y, width, height)
+        colors = self._get_pixels(pixels)
+
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            result = numpy.zeros((height, width, 3), self._colors.dtype)
+            result[y0:y1, x0:x1] = colors.reshape(y1 - y0, x1 - x0, 3)
+            return result
+
+        black = [(0, 0, 0)] * width
+        result = [list(black) for i in range(height)]
+        w = x1 - x0
+        for j, row in enumerate(result[y0:y1]):
+            row[x0:x1] = colors[j * w:(j + 1) * w]
+        return result
+
+    def _bytes_to_block(self, data, width):
+        if not width:
+            raise ValueError('width is needed to copy a block of bytes')
+        if len(data) % (3 * width):
+            raise ValueError('%s bytes is not a whole number of rows %s wide'
+                             % (len(data), width))
+
+        if self._is_numpy:
+            numpy = data_maker.numpy
+            return numpy.frombuffer(data, numpy.uint8).reshape(-1, width, 3)
+
+        # https://stackoverflow.com/questions/1624883
+        triples = list(zip(*(iter(bytes(data)),) * 3))
+        return [triples[i:i + width] for i in range(0, len(triples), width)]
+
     def setHSV(self, x, y, hsv):
         color = colors.hsv2rgb(hsv)
         self._set(x, y, color)
@@ -170,13 +255,42 @@ class Matrix(Layout):
     # https://github.com/adafruit/Adafruit-GFX-Library/blob/master/Adafruit_GFX.cpp
     ##########################################################################
 
+    def fill_spans(self, spans, color=None):
+        """Fill horizontal spans (x, y, width) with one color, clipped to the
+        matrix.  Spans are drawn one pixel at a time through self.set if
+        there is a texture or the pixels are scaled."""
+        if self._is_fast_fill():
+            pixels = self.compiled_map.span_pixels(spans)
+            self._fill_pixels(pixels, color or (0, 0, 0))
+        else:
+            matrix.set_spans(self.set, spans, color)
+
+    def fill_mask(self, x, y, rows, color=None):
+        """Fill the pixels of a bit plane with one color, clipped to the
+        matrix.  The bit plane is a list of bytes-like rows, with a 1 for each
+        pixel to fill, and its top-left corner is at x, y."""
+        if not self._is_fast_fill():
+            matrix.set_mask(self.set, self.width, self.height, x, y, rows,
+                            color)
+            return
+
+        width = len(rows[0]) if rows else 0
+        x0, y0, x1, y1, pixels = self.compiled_map.window(x, y, width,
+                                                          len(rows))
+        mask = b''.join(row[x0:x1] for row in rows[y0:y1])
+        self._fill_pixels(list(itertools.compress(pixels, mask)),
+                          color or (0, 0, 0))
+
+    def _is_fast_fill(self):
+        return self.texture is None and tuple(self.pixelSize) == (1, 1)
+
     def drawCircle(self, x0, y0, r, color=None):
         """Draws a circle at point x0, y0 with radius r of the specified RGB color"""
         matrix.draw_circle(self.set, x0, y0, r, color)
 
     def fillCircle(self, x0, y0, r, color=None):
         """Draws a filled circle at point x0,y0 with radius r and specified color"""
-        matrix.fill_circle(self.set, x0, y0, r, color)
+        self.fill_spans(matrix.circle_spans(x0, y0, r), color)
 
     def drawLine(self, x0, y0, x1, y1, color=None, colorFunc=None, aa=False):
         matrix.draw_line(self.set, x0, y0, x1, y1, color, colorFunc, aa)
@@ -192,15 +306,19 @@ class Matrix(Layout):
 
     def drawRect(self, x, y, w, h, color=None, aa=False):
         """Draw rectangle with top-left corner at x,y, width w and height h"""
-        matrix.draw_rect(self.set, x, y, w, h, color, aa)
+        self.fill_spans(matrix.rect_outline_spans(x, y, w, h), color)
 
     def fillRect(self, x, y, w, h, color=None, aa=False):
         """Draw solid rectangle with top-left corner at x,y, width w and height h"""
-        matrix.fill_rect(self.set, x, y, w, h, color, aa)
+        self.fill_spans(matrix.rect_spans(x, y, w, h), color)
 
     def fillScreen(self, color=None):
         """Fill the matrix with the given RGB color"""
-        matrix.fill_rect(self.set, 0, 0, self.width, self.height, color)
+        if self._map_is_strip and self._is_fast_fill():
+            self.fill(color or (0, 0, 0))
+        else:
+            self.fill_spans(
+                matrix.rect_spans(0, 0, self.width, self.height), color)
 
     def drawRoundRect(self, x, y, w, h, r, color=None, aa=False):
         """Draw rectangle with top-left corner at x,y, width w, height h, and corner radius r"""
@@ -208,7 +326,7 @@ class Matrix(Layout):
 
     def fillRoundRect(self, x, y, w, h, r, color=None, aa=False):
         """Draw solid rectangle with top-left corner at x,y, width w, height h, and corner radius r"""
-        matrix.fill_round_rect(self.set, x, y, w, h, r, color, aa)
+        self.fill_spans(matrix.round_rect_spans(x, y, w, h, r), color)
 
     def drawTriangle(self, x0, y0, x1, y1, x2, y2, color=None, aa=False):
         """Draw triangle with points x0,y0 - x1,y1 - x2,y2"""
@@ -216,17 +334,18 @@ class Matrix(Layout):
 
     def fillTriangle(self, x0, y0, x1, y1, x2, y2, color=None, aa=False):
         """Draw solid triangle with points x0,y0 - x1,y1 - x2,y2"""
-        matrix.fill_triangle(self.set, x0, y0, x1, y1, x2, y2, color, aa)
+        self.fill_spans(matrix.triangle_spans(x0, y0, x1, y1, x2, y2), color)
 
     fillTrangle = fillTriangle  # DEPRECATED!
 
     def drawChar(self, x, y, c, color, bg, aa=False, font=font.default_font, font_scale=1):
         matrix.draw_char(self.fonts, self.set, self.width, self.height,
-                         x, y, c, color, bg, aa, font, font_scale)
+                         x, y, c, color, bg, aa, font, font_scale,
+                         self.fill_mask)
 
     def drawText(self, text, x=0, y=0, color=None, bg=colors.Off, aa=False, font=font.default_font, font_scale=1):
         matrix.draw_text(self.fonts, self.set, text, self.width, self.height,
-                         x, y, color, bg, aa, font, font_scale)
+                         x, y, color, bg, aa, font, font_scale, self.fill_mask)
 
 
 # This is DEPRECATED
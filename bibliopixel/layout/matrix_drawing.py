@@ -1,7 +1,8 @@
-import math
+import functools, math
 from .. import colors
 from .. util import log
 from . import font
+from . font import Glyph, get_glyph
 
 ##########################################################################
 # Drawing Functions
@@ -74,35 +75,9 @@ def _draw_circle_helper(setter, x0, y0, r, cornername, color=None):
             setter(x0 - x, y0 - y, color)
 
 
-def _fill_circle_helper(setter, x0, y0, r, cornername, delta, color=None):
-    f = 1 - r
-    ddF_x = 1
-    ddF_y = -2 * r
-    x = 0
-    y = r
-
-    while (x < y):
-        if (f >= 0):
-            y -= 1
-            ddF_y += 2
-            f += ddF_y
-        x += 1
-        ddF_x += 2
-        f += ddF_x
-
-        if (cornername & 0x1):
-            _draw_fast_vline(setter, x0 + x, y0 - y, 2 * y + 1 + delta, color)
-            _draw_fast_vline(setter, x0 + y, y0 - x, 2 * x + 1 + delta, color)
-
-        if (cornername & 0x2):
-            _draw_fast_vline(setter, x0 - x, y0 - y, 2 * y + 1 + delta, color)
-            _draw_fast_vline(setter, x0 - y, y0 - x, 2 * x + 1 + delta, color)
-
-
 def fill_circle(setter, x0, y0, r, color=None):
     """Draws a fillayout circle at point x0,y0 with radius r and specified color"""
-    _draw_fast_vline(setter, x0, y0 - r, 2 * r + 1, color)
-    _fill_circle_helper(setter, x0, y0, r, 3, 0, color)
+    set_spans(setter, circle_spans(x0, y0, r), color)
 
 
 def draw_line(setter, x0, y0, x1, y1, color=None, colorFunc=None, aa=False):
@@ -232,25 +207,21 @@ def wu_line(setter, x0, y0, x1, y1, color=None, colorFunc=None):
 
 
 def _draw_fast_vline(setter, x, y, h, color=None, aa=False):
-    draw_line(setter, x, y, x, y + h - 1, color, aa)
+    set_spans(setter, [(x, i, 1) for i in range(y, y + h)], color)
 
 
 def _draw_fast_hline(setter, x, y, w, color=None, aa=False):
-    draw_line(setter, x, y, x + w - 1, y, color, aa)
+    set_spans(setter, [(x, y, w)], color)
 
 
 def draw_rect(setter, x, y, w, h, color=None, aa=False):
     """Draw rectangle with top-left corner at x,y, width w and height h"""
-    _draw_fast_hline(setter, x, y, w, color, aa)
-    _draw_fast_hline(setter, x, y + h - 1, w, color, aa)
-    _draw_fast_vline(setter, x, y, h, color, aa)
-    _draw_fast_vline(setter, x + w - 1, y, h, color, aa)
+    set_spans(setter, rect_outline_spans(x, y, w, h), color)
 
 
 def fill_rect(setter, x, y, w, h, color=None, aa=False):
     """Draw solid rectangle with top-left corner at x,y, width w and height h"""
-    for i in range(x, x + w):
-        _draw_fast_vline(setter, i, y, h, color, aa)
+    set_spans(setter, rect_spans(x, y, w, h), color)
 
 
 def draw_round_rect(setter, x, y, w, h, r, color=None, aa=False):
@@ -271,10 +242,7 @@ def draw_round_rect(setter, x, y, w, h, r, color=None, aa=False):
 def fill_round_rect(setter, x, y, w, h, r, color=None, aa=False):
     """Draw solid rectangle with top-left corner at x,y, width w, height h,
     and corner radius r"""
-    fill_rect(setter, x + r, y, w - 2 * r, h, color, aa)
-    _fill_circle_helper(setter, x + w - r - 1, y + r, r,
-                        1, h - 2 * r - 1, color, aa)
-    _fill_circle_helper(setter, x + r, y + r, r, 2, h - 2 * r - 1, color, aa)
+    set_spans(setter, round_rect_spans(x, y, w, h, r), color)
 
 
 def draw_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
@@ -286,8 +254,103 @@ def draw_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
 
 def fill_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
     """Draw solid triangle with points x0,y0 - x1,y1 - x2,y2"""
-    a = b = y = last = 0
+    set_spans(setter, triangle_spans(x0, y0, x1, y1, x2, y2), color)
 
+
+##########################################################################
+# Spans
+#
+# The filled shapes are rasterized into spans: horizontal runs of pixels
+# (x, y, width).  Spans can be drawn one pixel at a time with a setter, or
+# all at once by Matrix.fill_spans.
+##########################################################################
+
+
+def set_spans(setter, spans, color=None):
+    """Draw spans by calling setter once for each pixel"""
+    for x, y, w in spans:
+        for i in range(x, x + w):
+            setter(i, y, color)
+
+
+def rect_spans(x, y, w, h):
+    if w <= 0:
+        return []
+    return [(x, i, w) for i in range(y, y + h)]
+
+
+def rect_outline_spans(x, y, w, h):
+    if w <= 0 or h <= 0:
+        return []
+    if h <= 2:
+        return rect_spans(x, y, w, h)
+    sides = [(x, i, 1) for i in range(y + 1, y + h - 1)]
+    if w > 1:
+        sides += [(x + w - 1, i, 1) for i in range(y + 1, y + h - 1)]
+    return [(x, y, w), (x, y + h - 1, w)] + sides
+
+
+def _circle_half_widths(r):
+    """Return the half width of each row of a filled circle of radius r,
+    from the center row outwards, as drawn by the Adafruit circle algorithm.
+    """
+    # The half height of each column, from the center column outwards.
+    heights = [0] * (r + 1)
+    heights[0] = r
+    f = 1 - r
+    ddF_x = 1
+    ddF_y = -2 * r
+    x = 0
+    y = r
+
+    while x < y:
+        if f >= 0:
+            y -= 1
+            ddF_y += 2
+            f += ddF_y
+        x += 1
+        ddF_x += 2
+        f += ddF_x
+        heights[x] = max(heights[x], y)
+        heights[y] = max(heights[y], x)
+
+    # The column heights never increase going outwards, so each row is
+    # as wide as the last column that still reaches it.
+    widths = []
+    column = r
+    for row in range(r + 1):
+        while heights[column] < row:
+            column -= 1
+        widths.append(column)
+    return widths
+
+
+def _rounded_spans(left, top, right, bottom, r):
+    """Return the spans covered by a circle of radius r while its center
+    moves over the rectangle from left, top to right, bottom inclusive."""
+    if r < 0 or right < left or bottom < top:
+        return []
+
+    widths = _circle_half_widths(r)
+    spans = [(left - widths[i], top - i, right - left + 1 + 2 * widths[i])
+             for i in range(r, 0, -1)]
+    spans.extend((left - r, y, right - left + 1 + 2 * r)
+                 for y in range(top, bottom + 1))
+    spans.extend((left - widths[i], bottom + i, right - left + 1 + 2 * widths[i])
+                 for i in range(1, r + 1))
+    return spans
+
+
+def circle_spans(x0, y0, r):
+    return _rounded_spans(x0, y0, x0, y0, r)
+
+
+def round_rect_spans(x, y, w, h, r):
+    return _rounded_spans(x + r, y + r, x + w - r - 1, y + h - r - 1, r)
+
+
+def triangle_spans(x0, y0, x1, y1, x2, y2):
+    # Sort coordinates by Y order (y2 >= y1 >= y0)
     if y0 > y1:
         y0, y1 = y1, y0
         x0, x1 = x1, x0
@@ -299,16 +362,8 @@ def fill_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
         x0, x1 = x1, x0
 
     if y0 == y2:  # Handle awkward all-on-same-line case as its own thing
-        a = b = x0
-        if x1 < a:
-            a = x1
-        elif x1 > b:
-            b = x1
-        if x2 < a:
-            a = x2
-        elif x2 > b:
-            b = x2
-            _draw_fast_hline(setter, a, y0, b - a + 1, color, aa)
+        a, b = min(x0, x1, x2), max(x0, x1, x2)
+        return [(a, y0, b - a + 1)]
 
     dx01 = x1 - x0
     dy01 = y1 - y0
@@ -318,6 +373,12 @@ def fill_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
     dy12 = y2 - y1
     sa = 0
     sb = 0
+    spans = []
+
+    def span(a, b, y):
+        if a > b:
+            a, b = b, a
+        spans.append((a, y, b - a + 1))
 
     # For upper part of triangle, find scanline crossings for segments
     # 0-1 and 0-2.  If y1=y2 (flat-bottomed triangle), the scanline y1
@@ -325,88 +386,108 @@ def fill_triangle(setter, x0, y0, x1, y1, x2, y2, color=None, aa=False):
     # error there), otherwise scanline y1 is skipped here and handled
     # in the second loop...which also avoids a /0 error here if y0=y1
     # (flat-topped triangle).
-
     if y1 == y2:
         last = y1  # include y1 scanline
     else:
         last = y1 - 1  # skip it
 
-    for y in range(y, last + 1):
-        a = x0 + sa / dy01
-        b = x0 + sb / dy02
+    for y in range(y0, last + 1):
+        span(x0 + int(sa / dy01), x0 + int(sb / dy02), y)
         sa += dx01
         sb += dx02
 
-        if a > b:
-            a, b = b, a
-            _draw_fast_hline(setter, a, y, b - a + 1, color, aa)
-
     # For lower part of triangle, find scanline crossings for segments
     # 0-2 and 1-2.  This loop is skipped if y1=y2.
-    sa = dx12 * (y - y1)
-    sb = dx02 * (y - y0)
+    sa = dx12 * (last + 1 - y1)
+    sb = dx02 * (last + 1 - y0)
 
-    for y in range(y, y2 + 1):
-        a = x1 + sa / dy12
-        b = x0 + sb / dy02
+    for y in range(last + 1, y2 + 1):
+        span(x1 + int(sa / dy12), x0 + int(sb / dy02), y)
         sa += dx12
         sb += dx02
 
-        if a > b:
-            a, b = b, a
-            _draw_fast_hline(setter, a, y, b - a + 1, color, aa)
+    return spans
 
 
-def draw_char(fonts, setter, width, height, x, y, c, color, bg, aa=False, font=font.default_font, font_scale=1):
+def draw_char(fonts, setter, width, height, x, y, c, color, bg, aa=False,
+              font=font.default_font, font_scale=1, fill_mask=None):
+    """Draw one character and return its width before scaling.
+
+    The glyph's bit planes come from the glyph cache, and are drawn with
+    fill_mask(x, y, rows, color) if it's given, and otherwise with setter."""
     if font_scale < 1:
         log.error('font_scale %s must be >= 1', font_scale)
         font_scale = 1
-    f = fonts[font]
-    fh = f['height']
-    FONT = f['data']
 
-    c = ord(c)  # make it the int value
-    if c < f['bounds'][0] or c > f['bounds'][1]:
-        c_data = f['undef']
-    else:
-        c_data = FONT[c - f['bounds'][0]]
-
-    fw = len(c_data)
-    for i in range(fw + f['sep']):
-        xPos = x + (i * font_scale)
-        if max(0, 1 - font_scale * fw) <= xPos < width:
-            if i >= fw:
-                line = 0
-            else:
-                line = FONT[c][i]
-            for j in range(fh):
-                yPos = y + (j * font_scale)
-                if ((yPos < height) and
-                        (yPos + fh * font_scale - 1) >= 0):
-                    if line & 0x1:
-                        if font_scale == 1:
-                            setter(xPos, yPos, color)
-                        else:
-                            fill_rect(setter, xPos, yPos, font_scale, font_scale, color, aa)
-                    elif bg != color and bg is not None:
-                        if font_scale == 1:
-                            setter(xPos, yPos, bg)
-                        else:
-                            fill_rect(setter, xPos, yPos, font_scale, font_scale, bg, aa)
-                line >>= 1
-    return fw + f['sep']
-
-
-def draw_text(fonts, setter, text, width, height, x=0, y=0, color=None, bg=colors.Off, aa=False, font=font.default_font, font_scale=1):
+    glyph = get_glyph(fonts, font, c, font_scale)
+    _fill_text(setter, width, height, [(x, y, glyph)], color, bg, fill_mask)
+    return glyph.advance
+
+
+def draw_text(fonts, setter, text, width, height, x=0, y=0, color=None,
+              bg=colors.Off, aa=False, font=font.default_font, font_scale=1,
+              fill_mask=None):
+    if font_scale < 1:
+        log.error('font_scale %s must be >= 1', font_scale)
+        font_scale = 1
+
+    blocks = text_blocks(fonts, text, x, y, font, font_scale, width)
+    _fill_text(setter, width, height, blocks, color, bg, fill_mask)
+
+
+def text_blocks(fonts, text, x=0, y=0, font=font.default_font, font_scale=1,
+                width=None):
+    """Rasterize text into one block (x, y, Glyph) for each line, where the
+    Glyph holds the bit planes of the whole line and its width in pixels.
+    If width is given, stop after the first character that reaches it."""
     fh = fonts[font]['height']
+    lines = [(x, y, [])]
     for c in text:
         if c == '\n':
             y += font_scale * fh
             x = 0
+            lines.append((x, y, []))
         elif c == '\r':
             pass  # skip it
         else:
-            fw = draw_char(fonts, setter, width, height, x, y, c, color, bg, aa, font, font_scale)
-            x += font_scale * fw
-            if x >= width:
+            glyph = get_glyph(fonts, font, c, font_scale)
+            lines[-1][2].append(glyph)
+            x += font_scale * glyph.advance
+            if width is not None and x >= width:
                 break
+
+    # Join the glyphs of each line into one pair of bit planes.
+    blocks = []
+    for x, y, glyphs in lines:
+        if glyphs:
+            foreground = [b''.join(r) for r in
+                          zip(*(g.foreground for g in glyphs))]
+            background = [b''.join(r) for r in
+                          zip(*(g.background for g in glyphs))]
+            blocks.append(
+                (x, y, Glyph(len(foreground[0]), foreground, background)))
+
+    return blocks
+
+
+def _fill_text(setter, width, height, blocks, color, bg, fill_mask):
+    if not fill_mask:
+        fill_mask = functools.partial(set_mask, setter, width, height)
+
+    draw_bg = bg != color and bg is not None
+    for x, y, glyph in blocks:
+        fill_mask(x, y, glyph.foreground, color)
+        if draw_bg:
+            fill_mask(x, y, glyph.background, bg)
+
+
+def set_mask(setter, width, height, x, y, rows, color=None):
+    """Draw a bit plane by calling setter once for each pixel that is set,
+    clipped to width and height"""
+    begin = max(0, -x)
+    end = max(begin, width - x)
+    for j, row in enumerate(rows):
+        if 0 <= y + j < height:
+            for i, bit in enumerate(row[begin:end], begin):
+                if bit:
+                    setter(x + i, y + j, color)
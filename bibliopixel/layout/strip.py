@@ -1,5 +1,6 @@
 from .. import colors
 from . layout import Layout
+from . geometry.coord_map import compile_coord_map
 from . geometry.strip import make_strip_coord_map_positions
 
 
@@ -26,8 +27,11 @@ class Strip(Layout):
         if self.coord_map:
             if len(self.coord_map) != self.numLEDs:
                 raise ValueError('coord_map length must equal total number of pixels!')
+            self.compiled_map = compile_coord_map(self.coord_map)
+            self.coord_map = self.compiled_map.rows()
             self.set_base = self._set_strip_mapped
         else:
+            self.compiled_map = None
             self.set_base = self._set_base
 
         self.set_pixel_positions(make_strip_coord_map_positions(self.numLEDs))
@@ -47,6 +51,17 @@ class Strip(Layout):
         for p in range(start, start + self.pixelWidth):
             self.set_base(p, color)
 
+    def set_many(self, pixels, colors):
+        """Set many pixels at once, one color each.  Pixels outside the strip
+        are skipped."""
+        if self.pixelWidth != 1:
+            for pixel, color in zip(pixels, colors):
+                self.set(pixel, color)
+        elif self.compiled_map:
+            self._set_pixels(self.compiled_map.lookup(pixels), colors)
+        else:
+            self._set_pixels(pixels, colors)
+
     def get(self, pixel):
         """Get RGB color tuple of color at index pixel"""
         return self._get_base(pixel)
@@ -0,0 +1,108 @@
+from .. import colors
+from . import font as _font
+from . import matrix_drawing
+from . font import Glyph
+
+
+class TextStrip(object):
+    """
+    Text that is measured and rasterized once into an offscreen bitmap, so
+    that a scrolling ticker only has to copy the visible window of it onto
+    a Matrix each frame.
+
+    The bitmap is rebuilt only when the text, font or font_scale changes;
+    color and bg are applied as it is drawn.
+
+    fonts is the table that font is looked up in, both to measure and to
+    draw the text.  It defaults to the shared table that Matrix.loadFont()
+    adds to; pass a Matrix's fonts to use that Matrix's table.
+    """
+
+    def __init__(self, text='', color=colors.White, bg=colors.Off,
+                 font=_font.default_font, font_scale=1, fonts=None):
+        self.fonts = _font.fonts if fonts is None else fonts
+        self._text = text
+        self._font = font
+        self._font_scale = font_scale
+        self.color = color
+        self.bg = bg
+        self._bitmap = None
+        self._rendered_font = None
+
+    @property
+    def text(self):
+        return self._text
+
+    @text.setter
+    def text(self, text):
+        if text != self._text:
+            self._text = text
+            self._bitmap = None
+
+    @property
+    def font(self):
+        return self._font
+
+    @font.setter
+    def font(self, font):
+        if font != self._font:
+            self._font = font
+            self._bitmap = None
+
+    @property
+    def font_scale(self):
+        return self._font_scale
+
+    @font_scale.setter
+    def font_scale(self, font_scale):
+        if font_scale != self._font_scale:
+            self._font_scale = font_scale
+            self._bitmap = None
+
+    @property
+    def width(self):
+        return self.render().advance
+
+    @property
+    def height(self):
+        return len(self.render().foreground)
+
+    def render(self):
+        """Return the bitmap as a Glyph whose advance is its width in pixels,
+        rasterizing it if anything has changed."""
+        font = self.fonts[self._font]
+        if self._bitmap is None or self._rendered_font is not font:
+            self._bitmap = self._rasterize(self.fonts)
+            self._rendered_font = font
+        return self._bitmap
+
+    def draw(self, matrix, x=0, y=0):
+        """Draw the text onto matrix with its top-left corner at x, y.  Only
+        the part of the bitmap that falls inside the matrix is copied, so
+        scroll by drawing at decreasing values of x."""
+        bitmap = self.render()
+        matrix.fill_mask(x, y, bitmap.foreground, self.color)
+        if self.bg != self.color and self.bg is not None:
+            matrix.fill_mask(x, y, bitmap.background, self.bg)
+
+    def _rasterize(self, fonts):
+        blocks = matrix_drawing.text_blocks(
+            fonts, self._text, 0, 0, self._font, self._font_scale)
+        width = max((b[2].advance for b in blocks), default=0)
+
+        foreground, background = [], []
+        line_height = self._font_scale * fonts[self._font]['height']
+        for x, y, line in blocks:
+            # Empty lines have no block, so fill any gap above this one.
+            blank = bytes(width)
+            gap = y - len(foreground)
+            foreground.extend([blank] * gap)
+            background.extend([blank] * gap)
+
+            pad = bytes(width - line.advance)
+            foreground.extend(row + pad for row in line.foreground)
+            background.extend(row + pad for row in line.background)
+
+        if not foreground:
+            foreground = background = [b''] * line_height
+        return Glyph(width, foreground, background)
@@ -0,0 +1,121 @@
+"""
+Measure how fast a project can run on this machine.
+"""
+
+import copy, json, loady, time
+from . import common_flags
+from .. util import metrics
+
+DUMMY_HELP = """\
+Replace every driver with a Dummy driver with the same number of pixels,
+to measure rendering without any I/O."""
+
+STAGES = 'step', 'compute', 'send'
+
+
+def make_dummy(driver):
+    if isinstance(driver, str):
+        driver = {'typename': driver}
+    num = driver.get('num') or driver.get('width', 0) * driver.get('height', 0)
+    return {'typename': 'dummy', 'num': num} if num else {'typename': 'dummy'}
+
+
+def make_bench_project(desc, frames, dummy):
+    """Return a copy of a project that runs `frames` frames as fast as it
+    can, optionally with dummy drivers."""
+    desc = copy.deepcopy(desc)
+    run = desc.setdefault('run', {})
+    for k in 'fps', 'seconds', 'until_complete', 'max_cycles':
+        run.pop(k, None)
+    run.update(max_steps=frames, sleep_time=0, threaded=False)
+
+    if dummy:
+        if 'driver' in desc:
+            desc['driver'] = make_dummy(desc['driver'])
+        if 'drivers' in desc:
+            desc['drivers'] = [make_dummy(d) for d in desc['drivers']]
+    return desc
+
+
+def stage_times(summary):
+    """Return a list of (mean seconds per frame, stage name), slowest first,
+    for the animation step and each driver's compute and send."""
+    stages = []
+    for name, s in summary.items():
+        if name.split('.')[-1] in STAGES and s['count']:
+            stages.append((s['mean'], name))
+    return sorted(stages, reverse=True)
+
+
+def report(summary, frames, elapsed):
+    print('%d frames in %.3f seconds: %.1f frames per second' % (
+        frames, elapsed, frames / elapsed))
+    print()
+    print('%-36s %9s %9s %9s %9s' % ('stage', 'mean', 'p95', 'p99', 'max'))
+    for name, s in sorted(summary.items()):
+        if name.split('.')[-1] in ('bytes', 'packets'):
+            continue
+        times = tuple(1000 * (s[k] or 0) for k in ('mean', 'p95', 'p99', 'max'))
+        print('%-36s %7.3fms %7.3fms %7.3fms %7.3fms' % ((name,) + times))
+
+    stages = stage_times(summary)
+    if stages:
+        mean, name = stages[0]
+        print()
+        print('Bottleneck: %s, %.3fms per frame (at most %.1f fps)' % (
+            name, 1000 * mean, 1 / max(mean, 1e-9)))
+
+
+def bench(args, desc):
+    desc = make_bench_project(desc, args.frames, args.dummy)
+    if args.dummy:
+        args.driver = 'dummy'
+
+    animation = common_flags.make_animation(args, desc)
+    animation.free_run = True  # Ignore any delay the animation asks for.
+
+    metrics.METRICS.clear()
+    metrics.enable()
+    try:
+        start = time.perf_counter()
+        animation.start()
+        elapsed = time.perf_counter() - start
+    finally:
+        metrics.disable()
+
+    return metrics.METRICS.summary(), elapsed
+
+
+def run(args):
+    common_flags.extend_path(args)
+    if args.json:
+        desc = json.loads(args.name)
+    else:
+        desc = args.name and loady.data.load(args.name, True)
+
+    summary, elapsed = bench(args, desc or {})
+    report(summary, args.frames, elapsed)
+
+
+def set_parser(parser):
+    parser.set_defaults(run=run)
+    parser.description = ('Run a BiblioPixel project as fast as possible and '
+                          'report the time taken by each stage.')
+
+    common_flags.add_project_flags(parser)
+
+    parser.add_argument(
+        'name', nargs='?',
+        help='Path project file - can be a URL or file system location',
+        default='')
+
+    parser.add_argument(
+        '-j', '--json', action='store_true',
+        help='Enter JSON directly as a command line argument.')
+
+    parser.add_argument(
+        '-f', '--frames', type=int, default=200,
+        help='How many frames to run')
+
+    parser.add_argument(
+        '--dummy', action='store_true', help=DUMMY_HELP)
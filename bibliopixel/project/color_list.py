@@ -0,0 +1,282 @@
+"""
+Color lists that behave like a list of RGB tuples but store their pixels more
+compactly.  Select them with data_maker.Maker.
+"""
+
+import itertools
+
+
+class ByteColorList(object):
+    """
+    A color list that stores each pixel as three bytes in one bytearray,
+    self.data, rather than as a tuple object.
+
+    Reading a pixel returns a new tuple.  Components are clipped to 0..255
+    and truncated to integers as they are stored.  Drivers read self.data
+    directly, without making any Python objects.
+    """
+
+    def __init__(self, size=0):
+        self.data = bytearray(3 * size)
+
+    def to_bytes(self):
+        """Return the colors as bytes of RGB triples."""
+        return bytes(self.data)
+
+    def copy(self):
+        result = ByteColorList()
+        result.data[:] = self.data
+        return result
+
+    def __len__(self):
+        return len(self.data) // 3
+
+    def __iter__(self):
+        # https://stackoverflow.com/questions/1624883
+        return zip(*(iter(self.data),) * 3)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return 'ByteColorList(%s)' % list(self)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            i = 3 * self._index(key)
+            return tuple(self.data[i:i + 3])
+
+        result = ByteColorList()
+        start, stop, step = key.indices(len(self))
+        if step == 1:
+            result.data[:] = self.data[3 * start:3 * stop]
+        else:
+            for i in range(start, stop, step):
+                result.data += self.data[3 * i:3 * i + 3]
+        return result
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, slice):
+            i = 3 * self._index(key)
+            self.data[i:i + 3] = _to_bytes(value)
+            return
+
+        if isinstance(value, ByteColorList):
+            data = value.data
+        else:
+            data = _to_bytes(itertools.chain.from_iterable(value))
+
+        start, stop, step = key.indices(len(self))
+        if step == 1:
+            self.data[3 * start:3 * max(start, stop)] = data
+            return
+
+        pixels = range(start, stop, step)
+        if 3 * len(pixels) != len(data):
+            raise ValueError('attempt to assign %d colors to extended slice '
+                             'of size %d' % (len(data) // 3, len(pixels)))
+        for j, i in enumerate(pixels):
+            self.data[3 * i:3 * i + 3] = data[3 * j:3 * j + 3]
+
+    def _index(self, i):
+        size = len(self)
+        if i < 0:
+            i += size
+        if not 0 <= i < size:
+            raise IndexError('ByteColorList index out of range')
+        return i
+
+
+def _to_bytes(components):
+    components = list(components)
+    try:
+        return bytes(components)
+    except (TypeError, ValueError):
+        # Floating point or out of range components.
+        return bytes(max(0, min(255, int(c))) for c in components)
+
+
+class IndexedColorList(object):
+    """
+    A color list that stores one byte for each pixel: an index into a palette
+    of at most 256 colors, shared by every pixel.
+
+    Setting a pixel to a color that isn't in the palette adds it.  Once the
+    palette has 256 colors, entries that no pixel uses any more are reused
+    for new colors; if every entry is in use, new colors get the nearest
+    color already in the palette.
+
+    Drivers expand the indices into color through per-palette tables, so
+    replacing the palette with set_palette() recolors every pixel at the
+    cost of the palette alone - which is how palette cycling works.
+    """
+
+    # After a search for unused entries finds none, how many new colors get
+    # the nearest color before searching again.
+    COMPACT_INTERVAL = 256
+
+    # The most colors to remember the index of, including the nearest
+    # colors given to new colors when the palette is full.
+    LOOKUP_LIMIT = 4096
+
+    def __init__(self, size=0, palette=((0, 0, 0),)):
+        self.indices = bytearray(size)
+        self.palette = []
+        self._generation = 0
+        self._pending = self._replacing = None
+        self.set_palette(palette)
+
+    def set_palette(self, palette):
+        """Replace the palette.  Each pixel keeps its index."""
+        palette = [tuple(c) for c in palette]
+        if not 0 < len(palette) <= 256:
+            raise ValueError('A palette has between 1 and 256 colors, not %d'
+                             % len(palette))
+
+        self.palette[:] = palette
+        self._free = []
+        self._misses = self.COMPACT_INTERVAL
+        self._reset_lookup(range(len(palette)))
+
+    def index(self, color):
+        """Return the palette index for a color, adding it if needed."""
+        try:
+            return self._lookup[color]
+        except KeyError:
+            pass
+        except TypeError:
+            return self.index(tuple(color))
+
+        if len(self.palette) < 256:
+            i = len(self.palette)
+            self.palette.append(color)
+        elif self._free or self._compact():
+            i = self._free.pop()
+            self.palette[i] = color
+        else:
+            def distance(i):
+                return sum((a - b) ** 2 for a, b in zip(self.palette[i], color))
+
+            i = min(range(256), key=distance)
+            if len(self._lookup) >= self.LOOKUP_LIMIT:
+                self._reset_lookup(range(256))
+
+        self._lookup[color] = i
+        return i
+
+    def to_bytes(self):
+        """Return the colors as bytes of RGB triples."""
+        pad = bytes(256 - len(self.palette))
+        result = bytearray(3 * len(self.indices))
+        for i, channel in enumerate(zip(*self.palette)):
+            table = bytes(max(0, min(255, int(c))) for c in channel) + pad
+            result[i::3] = self.indices.translate(table)
+        return bytes(result)
+
+    def copy(self):
+        result = IndexedColorList(0, self.palette)
+        result.indices[:] = self.indices
+        return result
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __iter__(self):
+        return map(self._color, self.indices)
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self):
+        return 'IndexedColorList(%s)' % list(self)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            result = IndexedColorList(0, self.palette)
+            result.indices[:] = self.indices[key]
+            return result
+        return self._color(self.indices[key])
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, slice):
+            self.indices[key] = self.index(value)
+
+        elif isinstance(value, IndexedColorList):
+            if key == slice(None) and len(value) == len(self):
+                self.set_palette(value.palette)
+                self.indices[:] = value.indices
+            else:
+                # Only add the colors that are used to the palette.
+                used = sorted(set(value.indices))
+                table = bytearray(256)
+                colors = map(value._color, used)
+                for i, j in zip(used, self._indices(colors, key)):
+                    table[i] = j
+                self.indices[key] = value.indices.translate(table)
+
+        else:
+            self.indices[key] = self._indices(value, key)
+
+    def _indices(self, colors, key):
+        """Return the palette indices of many colors, as bytes, to replace the
+        pixels in the slice key."""
+        if not isinstance(colors, (list, tuple)):
+            colors = list(colors)
+
+        generation = self._generation
+        self._replacing = key
+        try:
+            result = bytes(map(self.index, colors))
+        finally:
+            self._replacing = None
+        if generation == self._generation:
+            return result
+
+        # Unused entries were freed part way through, which might have
+        # included the entries for the first colors.  Do it again, and keep
+        # the entries for these colors if it happens again.
+        self._pending, self._replacing = bytearray(), key
+        try:
+            for c in colors:
+                self._pending.append(self.index(c))
+            return bytes(self._pending)
+        finally:
+            self._pending = self._replacing = None
+
+    def _compact(self):
+        """Free the palette entries that no pixel uses, and return True if
+        there were any."""
+        if self._misses < self.COMPACT_INTERVAL:
+            self._misses += 1
+            return False
+
+        kept = self.indices
+        if self._replacing is not None:
+            kept = bytearray(kept)
+            del kept[self._replacing]
+
+        used = set(kept)
+        used.update(self._pending or ())
+        self._free = [i for i in range(255, -1, -1) if i not in used]
+        if not self._free:
+            self._misses = 0
+            return False
+
+        self._generation += 1
+        self._reset_lookup(sorted(used))
+        return True
+
+    def _reset_lookup(self, indices):
+        self._lookup = {}
+        for i in indices:
+            self._lookup.setdefault(self.palette[i], i)
+
+    def _color(self, i):
+        palette = self.palette
+        return palette[i] if i < len(palette) else (0, 0, 0)
@@ -1,6 +1,7 @@
 import ctypes
 from multiprocessing.sharedctypes import RawArray
 from .. util import log
+from . color_list import ByteColorList, IndexedColorList
 
 try:
     import numpy
@@ -10,10 +11,24 @@ except:
 USE_NUMPY = False
 
 
-def Maker(floating=None, shared_memory=False, use_numpy=USE_NUMPY):
+def Maker(floating=None, shared_memory=False, use_numpy=USE_NUMPY,
+          indexed=False, compact=False):
+    """Return a pair of functions that make packet buffers and color lists.
+
+    If indexed is True, color lists store a one byte palette index for each
+    pixel - see color_list.IndexedColorList.
+
+    If compact is True, color lists store three bytes for each pixel in one
+    bytearray - see color_list.ByteColorList."""
     def list_maker(size):
         return [(0, 0, 0)] * size
 
+    if indexed or compact:
+        if shared_memory or use_numpy or (indexed and compact):
+            raise ValueError('Only one of indexed, compact, shared_memory '
+                             'and use_numpy can be chosen')
+        return bytearray, IndexedColorList if indexed else ByteColorList
+
     if use_numpy and not numpy:
         log.error('numpy module is not available.')
         use_numpy = False
@@ -41,5 +56,10 @@ def Maker(floating=None, shared_memory=False, use_numpy=USE_NUMPY):
     return bytearray, numpy_list_maker
 
 
+def is_numpy(colors):
+    """Return True if `colors` is a numpy color list."""
+    return bool(numpy) and isinstance(colors, numpy.ndarray)
+
+
 MAKER = Maker()
 ColorList = MAKER[1]
@@ -0,0 +1,125 @@
+"""
+Run an animation's step() in a worker process.
+
+The worker is forked from this process, so it starts with its own copy of
+the animation but shares the layout's color list, which must be made with
+Maker(shared_memory=True).  step() writes straight into that shared memory,
+while this process sends the colors to the drivers.  No pixel data is ever
+pickled: the two processes only hand frames back and forth with a pair of
+semaphores and a few shared counters.
+
+Because CPU-bound Python in step() no longer holds this process's GIL, it
+stops competing with the driver threads.
+"""
+
+import ctypes, multiprocessing, traceback
+from .. util import log
+
+# How often, in seconds, to check that the worker is still alive while
+# waiting for a frame.
+POLL_TIME = 0.1
+
+# How long, in seconds, to wait for the worker to end before terminating it.
+STOP_TIMEOUT = 5
+
+
+class AnimationProcess(object):
+    def __init__(self, animation, amt=1):
+        colors = animation.layout._colors
+        if not isinstance(colors, ctypes.Array):
+            raise ValueError('Running an animation in a process needs a '
+                             'layout made with Maker(shared_memory=True)')
+        try:
+            context = multiprocessing.get_context('fork')
+        except ValueError:
+            raise ValueError('Running an animation in a process needs the '
+                             '"fork" multiprocessing start method')
+
+        self.animation = animation
+        self.amt = amt
+        self.requests = context.Semaphore(0)
+        self.done = context.Semaphore(0)
+
+        # The animation state and step count go to the worker with each
+        # request and come back with each frame.
+        self.state = context.RawValue('i', int(animation.state))
+        self.cur_step = context.RawValue('L', 0)
+        self.sequence = context.RawValue('L', 0)
+        self.failed = context.RawValue('b', 0)
+        self.running = context.RawValue('b', 1)
+
+        self.pending = False
+        self.frames = 0
+        self.process = context.Process(target=self._run, daemon=True)
+        self.process.start()
+
+    def request(self):
+        """Ask the worker to start rendering the next frame, if it isn't
+        already."""
+        if not self.pending:
+            self.pending = True
+            self.state.value = int(self.animation.state)
+            self.cur_step.value = self.animation.cur_step
+            self.requests.release()
+
+    def step(self):
+        """Wait until the worker has rendered the next frame into the color
+        list, and return the animation's state after it."""
+        self.request()
+        self._wait_for_frame()
+
+        if self.failed.value:
+            raise RuntimeError('Animation step failed in the worker process')
+
+        self.frames += 1
+        if self.sequence.value != self.frames:
+            raise RuntimeError('Expected frame %d from the worker process, '
+                               'got frame %d' % (self.frames,
+                                                 self.sequence.value))
+        return self.state.value
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """Wait for any frame that is being rendered, then end the worker.
+        If the worker hasn't ended after `timeout` seconds, terminate it."""
+        try:
+            if self.pending:
+                self._wait_for_frame()
+        except RuntimeError:
+            pass
+
+        self.running.value = 0
+        self.requests.release()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            log.error('Animation worker process did not stop: terminating')
+            self.process.terminate()
+            self.process.join()
+
+    def _wait_for_frame(self):
+        while not self.done.acquire(timeout=POLL_TIME):
+            if not self.process.is_alive():
+                self.pending = False
+                raise RuntimeError(
+                    'Animation worker process died with exit code %s' %
+                    self.process.exitcode)
+        self.pending = False
+
+    def _run(self):
+        # This is the worker process.
+        animation = self.animation
+        while True:
+            self.requests.acquire()
+            if not self.running.value:
+                break
+
+            animation.state = type(animation.state)(self.state.value)
+            animation.cur_step = self.cur_step.value
+            try:
+                animation.step(self.amt)
+            except:
+                log.error('Animation step failed\n%s', traceback.format_exc())
+                self.failed.value = 1
+
+            self.state.value = int(animation.state)
+            self.sequence.value += 1
+            self.done.release()
@@ -1,11 +1,13 @@
 import threading, time
 from .. util import log
+from .. util.metrics import METRICS
+from . scheduler import Scheduler
 
 
 class AnimationThreading(object):
     """
-    AnimationThreading handles threading - and eventually multiprocessing - for
-    BaseAnimation.
+    AnimationThreading handles threading for BaseAnimation.  To run step()
+    in another process, see animation_process.AnimationProcess.
     """
 
     def __init__(self, runner, run):
@@ -14,6 +16,7 @@ class AnimationThreading(object):
         self.stop_event = threading.Event()
         self.thread = None
         self.frame_overrun = False
+        self.scheduler = Scheduler(runner.spin_time, runner.overrun)
 
     def stop_thread(self, wait=False):
         # run regardless of threaded, used to stop sequences
@@ -32,23 +35,28 @@ class AnimationThreading(object):
 
     def wait(self, wait_time, timestamps):
         if not wait_time:
+            self.scheduler.reset()
             return
 
-        elapsed_time = timestamps[-1] - timestamps[0]
-        if elapsed_time > wait_time:
+        stop_event = self.stop_event if self.runner.threaded else None
+        skipped = self.scheduler.wait(wait_time, stop_event)
+        if METRICS.enabled:
+            slack = self.scheduler.slack
+            if slack >= 0:
+                METRICS.record('animation.slack', slack)
+            else:
+                METRICS.record('animation.overrun', -slack)
+
+        if skipped:
+            elapsed_time = timestamps[-1] - timestamps[0]
             logger = log.debug if self.frame_overrun else log.warning
             logger('Frame-time of %dms set, but took %dms!',
                    1000 * wait_time, 1000 * elapsed_time)
             self.frame_overrun = True
 
-        elif self.runner.threaded:
-            self.stop_event.wait(wait_time - elapsed_time)
-
-        else:
-            time.sleep(wait_time - elapsed_time)
-
     def start(self):
         self.stop_event.clear()
+        self.scheduler.reset()
 
         def start_thread(target):
             self.thread = threading.Thread(target=target, daemon=True)
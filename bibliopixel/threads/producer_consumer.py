@@ -35,5 +35,12 @@ class Queues(object):
     @contextlib.contextmanager
     def consume(self):
         i = self.full.get()
-        yield i
-        self.empty.put(i)
+        try:
+            yield i
+        finally:
+            self.empty.put(i)
+            self.full.task_done()
+
+    def join(self):
+        """Wait until everything produced has been consumed."""
+        self.full.join()
@@ -0,0 +1,98 @@
+import time
+
+
+class Scheduler(object):
+    """
+    Wait for frames at absolute deadlines on a monotonic clock, so that
+    timing errors don't accumulate and wall-clock jumps don't cause stalls.
+
+    Arguments:
+        spin_time: sleep until this many seconds before each deadline, then
+            busy-wait the rest of the way for sub-millisecond accuracy.
+        overrun: what to do when a frame misses its deadline.
+            'skip' drops the missed frame slots and waits for the next one;
+            'catch_up' runs the following frames without waiting until the
+            schedule has caught up.
+    """
+    OVERRUNS = 'skip', 'catch_up'
+
+    def __init__(self, spin_time=0, overrun='skip', clock=time.perf_counter,
+                 sleep=time.sleep):
+        if overrun not in self.OVERRUNS:
+            raise ValueError('Unknown overrun policy %s' % overrun)
+
+        self.spin_time = spin_time
+        self.overrun = overrun
+        self.clock = clock
+        self.sleep = sleep
+        self.reset()
+
+    def reset(self):
+        """Start a new schedule from the next call to wait()."""
+        self.deadline = None
+        self.period = None
+        self.slack = 0
+        self.frames = 0
+        self.skipped = 0
+        self.jitter_total = 0
+        self.jitter_max = 0
+        self.jitter_last = 0
+
+    @property
+    def jitter(self):
+        """How late frames start after their deadlines, in seconds."""
+        return {
+            'last': self.jitter_last,
+            'mean': self.jitter_total / (self.frames or 1),
+            'max': self.jitter_max,
+        }
+
+    def wait(self, period, stop_event=None):
+        """Wait until the next deadline, `period` seconds after the previous
+        one.  Returns the number of frame slots missed because of an
+        overrun: with 'skip', the slots that were dropped; with 'catch_up',
+        how many slots behind the schedule this frame is.
+
+        If `stop_event` is set while waiting, return early.
+        """
+        now = self.clock()
+        if self.deadline is None or period != self.period:
+            # Start a new schedule from the end of this frame.
+            self.deadline = now
+            self.period = period
+
+        self.deadline += period
+        self.slack = self.deadline - now
+        skipped = 0
+        if now > self.deadline:
+            skipped = int((now - self.deadline) // period) + 1
+            if self.overrun == 'skip':
+                self.deadline += skipped * period
+                self.skipped += skipped
+            else:
+                self._record(now)
+                return skipped
+
+        self._sleep_until(self.deadline, stop_event)
+        self._record(self.clock())
+        return skipped
+
+    def _sleep_until(self, deadline, stop_event):
+        sleep_time = deadline - self.spin_time - self.clock()
+        if sleep_time > 0:
+            if stop_event:
+                if stop_event.wait(sleep_time):
+                    return
+            else:
+                self.sleep(sleep_time)
+
+        while self.clock() < deadline:
+            if stop_event and stop_event.is_set():
+                return
+
+    def _record(self, now):
+        jitter = max(0, now - self.deadline)
+        self.frames += 1
+        self.jitter_last = jitter
+        self.jitter_total += jitter
+        self.jitter_max = max(self.jitter_max, jitter)
@@ -1,74 +1,92 @@
-import threading, time
+import threading
 from .. util import log
-from . import compose_events, threads
+from . import threads
 
 
 class UpdateDriverThread(threads.Loop):
+    """Update one driver for each frame requested by an UpdateThread."""
 
-    def __init__(self, driver):
+    def __init__(self, driver, update_thread):
         super().__init__()
-        self.setDaemon(True)
-        self._wait = threading.Event()
-        self._reading = threading.Event()
-        self._reading.set()
-        self._updating = threading.Event()
         self._driver = driver
-
-    def update_colors(self):
-        self._reading.wait()
-        self._reading.clear()
-        self._wait.set()
-
-    def sync(self):
-        self._updating.wait()
-        self._driver.sync()
-
-    def sending(self):
-        return self._wait.isSet()
+        self._update_thread = update_thread
+        self.frame = 0  # The last frame this driver finished.
 
     def loop(self):
-        self._wait.wait()
-        self._updating.clear()
-        self._driver.update_colors()
-        self._wait.clear()
-        self._reading.set()
-        self._updating.set()
-
+        ut = self._update_thread
+        with ut.condition:
+            ut.condition.wait_for(lambda: ut.frame > self.frame or
+                                  not self.running)
+            if not self.running:
+                return
+
+        try:
+            self._driver.update_colors()
+        except Exception as e:
+            log.exception(e)
+
+        try:
+            # Wait for all the drivers; then one of them calls sync() on all.
+            ut.barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+        with ut.condition:
+            self.frame += 1
+            ut.condition.notify_all()
+
+
+class UpdateThread(object):
+    """
+    Update all the drivers in parallel, one thread per driver.
 
-class UpdateThread(threads.Loop):
+    All the waiting is done on a Condition and a Barrier, so no thread uses
+    any CPU until there is something for it to do.
+    """
 
     def __init__(self, drivers):
-        super().__init__()
-        self.setDaemon(True)
-        self._wait = threading.Event()
-        self._reading = threading.Event()
-        self._reading.set()
         self._drivers = drivers
-        for d in self._drivers:
-            t = UpdateDriverThread(d)
-            t.start()
+        self.condition = threading.Condition()
+        self.barrier = threading.Barrier(len(drivers), action=self._sync)
+        self.frame = 0  # The last frame requested.
+        self._threads = [UpdateDriverThread(d, self) for d in drivers]
+        for d, t in zip(drivers, self._threads):
             d._thread = t
 
-        events = (d._thread._updating for d in self._drivers)
-        self._updated = compose_events.compose_events(events)
+    def start(self):
+        for t in self._threads:
+            t.start()
+
+    def stop(self):
+        with self.condition:
+            for t in self._threads:
+                t.stop()
+            self.condition.notify_all()
+        self.barrier.abort()
 
     def update_colors(self):
-        self._reading.wait()
-        for d in self._drivers:
-            d._thread.update_colors()
-        self._reading.clear()
-        self._wait.set()
+        """Wait until the previous frame is finished, then start a new one."""
+        with self.condition:
+            self.condition.wait_for(self._is_finished)
+            self.frame += 1
+            self.condition.notify_all()
 
-    def loop(self):
-        self._wait.wait()
-        self._updated.wait()
+    def wait_for_update(self):
+        with self.condition:
+            self.condition.wait_for(self._is_finished)
 
-        for d in self._drivers:
-            d._thread.sync()
+    def _is_finished(self):
+        return all(t.frame >= self.frame or not t.running
+                   for t in self._threads)
 
-        self._updated.clear()
-        self._wait.clear()
-        self._reading.set()
+    def _sync(self):
+        # An exception here would break the barrier for good.
+        try:
+            for d in self._drivers:
+                if not d.pipelined:
+                    d.sync()
+        except Exception as e:
+            log.exception(e)
 
 
 class NoThreading(object):
@@ -82,7 +100,8 @@ class NoThreading(object):
         for d in self.layout.drivers:
             d.update_colors()
         for d in self.layout.drivers:
-            d.sync()
+            if not d.pipelined:
+                d.sync()
 
     def wait_for_update(self):
         pass
@@ -92,6 +111,9 @@ class NoThreading(object):
         self.wait_for_update()
         self.update_colors()
 
+    def stop(self):
+        pass
+
 
 class UseThreading(NoThreading):
     def __init__(self, layout):
@@ -103,8 +125,10 @@ class UseThreading(NoThreading):
         self.update_thread.update_colors()
 
     def wait_for_update(self):
-        while all([d._thread.sending() for d in self.layout.drivers]):
-            time.sleep(0.000001)
+        self.update_thread.wait_for_update()
+
+    def stop(self):
+        self.update_thread.stop()
 
 
 def UpdateThreading(enable, layout):
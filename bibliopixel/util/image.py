@@ -1,4 +1,4 @@
-import glob, numbers, os, sys
+import functools, glob, hashlib, mmap, numbers, os, queue, re, sys, threading
 from .. import colors, log
 from .. layout import Matrix
 
@@ -8,50 +8,78 @@ except:
     Image, ImageSequence = None, None
 
 
-def show_image(setter, width, height,
-               image_path='', image_obj=None, offset=(0, 0), bgcolor=colors.Off,
-               brightness=255):
-    """Display an image on a matrix."""
-    bgcolor = colors.color_scale(bgcolor, brightness)
+# How many rendered images from files to keep.
+IMAGE_CACHE_SIZE = 64
 
-    img = image_obj
-    if image_path and not img:
-        if not Image:
-            error = "Please install Python Imaging Library: pip install pillow"
-            log.error(error)
-            raise ImportError(error)
-        img = Image.open(image_path)
-    elif not img:
+# How many frames Frames decodes ahead of the reader.
+FRAME_PREFETCH = 4
+
+
+def render_image(width, height, image_path='', image_obj=None, offset=(0, 0),
+                 bgcolor=colors.Off, brightness=255):
+    """
+    Render the part of an image that falls on a matrix of the given size.
+
+    Transparent pixels are composited against bgcolor, and the result is
+    scaled by brightness.
+
+    Returns x, y, w, data: the top-left corner and width in pixels of the
+    visible rectangle, and its colors as bytes of RGB triples.
+
+    Images read from image_path are cached, so showing the same unchanged
+    file again doesn't decode it again.
+    """
+    offset, bgcolor = tuple(offset), tuple(bgcolor)
+    if image_obj:
+        return _render(image_obj, width, height, offset, bgcolor, brightness)
+
+    if not image_path:
         raise ValueError('Must provide either image_path or image_obj')
+    if not Image:
+        error = "Please install Python Imaging Library: pip install pillow"
+        log.error(error)
+        raise ImportError(error)
+
+    mtime = os.stat(image_path).st_mtime
+    return _render_file(image_path, mtime, width, height, offset, bgcolor,
+                        brightness)
+
+
+@functools.lru_cache(IMAGE_CACHE_SIZE)
+def _render_file(image_path, mtime, *args):
+    with Image.open(image_path) as img:
+        return _render(img, *args)
 
-    w = min(width - offset[0], img.size[0])
-    h = min(height - offset[1], img.size[1])
-    ox = offset[0]
-    oy = offset[1]
 
-    for x in range(ox, w + ox):
-        for y in range(oy, h + oy):
-            r, g, b, a = (0, 0, 0, 255)
-            rgba = img.getpixel((x - ox, y - oy))
+def _render(img, width, height, offset, bgcolor, brightness):
+    ox, oy = offset
+    x0, y0 = max(0, -ox), max(0, -oy)
+    x1, y1 = min(img.size[0], width - ox), min(img.size[1], height - oy)
+    if x1 <= x0 or y1 <= y0:
+        return 0, 0, 0, b''
 
-            if isinstance(rgba, int):
-                raise ValueError('Image must be in RGB or RGBA format!')
-            if len(rgba) == 3:
-                r, g, b = rgba
-            elif len(rgba) == 4:
-                r, g, b, a = rgba
-            else:
-                raise ValueError('Image must be in RGB or RGBA format!')
+    img = img.crop((x0, y0, x1, y1))
+    if 'A' in img.getbands() or 'transparency' in img.info:
+        bg = Image.new('RGBA', img.size, bgcolor + (255,))
+        img = Image.alpha_composite(bg, convert_mode(img, 'RGBA'))
 
-            if a == 0:
-                r, g, b = bgcolor
-            else:
-                r, g, b = colors.color_scale((r, g, b), a)
+    img = convert_mode(img)
+    if brightness != 255:
+        img = img.point([i * brightness >> 8 for i in range(256)] * 3)
 
-            if brightness != 255:
-                r, g, b = colors.color_scale((r, g, b), brightness)
+    return ox + x0, oy + y0, x1 - x0, img.tobytes()
 
-            setter(x, y, (r, g, b))
+
+def show_image(setter, width, height,
+               image_path='', image_obj=None, offset=(0, 0), bgcolor=colors.Off,
+               brightness=255):
+    """Display an image on a matrix."""
+    x, y, w, data = render_image(width, height, image_path, image_obj,
+                                 offset, bgcolor, brightness)
+
+    # https://stackoverflow.com/questions/1624883
+    for i, rgb in enumerate(zip(*(iter(data),) * 3)):
+        setter(x + i % w, y + i // w, rgb)
 
 
 def showImage(layout, imagePath="", imageObj=None, offset=(0, 0), bgcolor=colors.Off, brightness=255):
@@ -59,10 +87,12 @@ def showImage(layout, imagePath="", imageObj=None, offset=(0, 0), bgcolor=colors
     if not isinstance(layout, Matrix):
         raise RuntimeError("Must use Matrix with showImage!")
 
-    layout.all_off()
+    x, y, w, data = render_image(layout.width, layout.height, imagePath,
+                                 imageObj, offset, bgcolor, brightness)
 
-    return show_image(layout.set, layout.width, layout.height, imagePath, imageObj,
-                      offset, bgcolor, brightness)
+    layout.all_off()
+    if data:
+        layout.set_block(x, y, data, w)
 
 
 def loadImage(layout, imagePath="", imageObj=None, offset=(0, 0), bgcolor=colors.Off, brightness=255):
@@ -71,14 +101,13 @@ def loadImage(layout, imagePath="", imageObj=None, offset=(0, 0), bgcolor=colors
     if not isinstance(layout, Matrix):
         raise RuntimeError("Must use Matrix with loadImage!")
 
-    texture = [[colors.Off for x in range(layout.width)] for y in range(layout.height)]
+    x, y, w, data = render_image(layout.width, layout.height, imagePath,
+                                 imageObj, offset, bgcolor, brightness)
 
-    def setter(x, y, pixel):
-        if y >= 0 and x >= 0:
-            texture[y][x] = pixel
-
-    show_image(setter, layout.width, layout.height, imagePath, imageObj,
-               offset, bgcolor, brightness)
+    texture = [[colors.Off] * layout.width for i in range(layout.height)]
+    triples = list(zip(*(iter(data),) * 3))
+    for j in range(0, len(triples), w):
+        texture[y + j // w][x:x + w] = triples[j:j + w]
 
     return texture
 
@@ -99,6 +128,151 @@ def animated_gif_to_colorlists(image, container=list):
     return [image_to_colorlist(i, container) for i in it]
 
 
+def numbered_files(directory, pattern='*'):
+    """Return the files in a directory in numeric order, so that frame2.png
+    comes before frame10.png."""
+    files = glob.glob(os.path.join(directory, pattern))
+    return sorted((f for f in files if os.path.isfile(f)), key=_numeric_key)
+
+
+def _numeric_key(filename):
+    parts = re.split(r'(\d+)', filename)
+    return [int(p) if p.isdigit() else p for p in parts]
+
+
+class Frames(object):
+    """
+    The frames of an animated image file, or of a directory of numbered
+    image files, read one at a time as bytes of RGB triples.
+
+    Frames are decoded on a background thread at most `prefetch` frames
+    ahead of the reader, so memory use doesn't grow with the number of
+    frames.  Each frame can be shown with Matrix.set_block or
+    Layout.set_color_bytes.
+
+    If size is given, each frame is resized to (x, y) with resize(), which
+    also gets any other keyword arguments.  If cache_dir is given too, then
+    the first complete pass through the frames stores them in one file in
+    cache_dir, keyed by the source files and the size, and later passes
+    memory-map that file instead of decoding anything.
+    """
+
+    def __init__(self, path, size=None, cache_dir=None,
+                 prefetch=FRAME_PREFETCH, **resize_args):
+        if not Image:
+            error = "Please install Python Imaging Library: pip install pillow"
+            log.error(error)
+            raise ImportError(error)
+        if cache_dir and not size:
+            raise ValueError('Frames can only be cached if size is given')
+
+        self.path = path
+        self.size = size and tuple(size)
+        self.cache_dir = cache_dir
+        self.prefetch = prefetch
+        self.resize_args = resize_args
+        self.files = numbered_files(path) if os.path.isdir(path) else None
+
+    def __len__(self):
+        if self.files is not None:
+            return len(self.files)
+        with Image.open(self.path) as img:
+            return getattr(img, 'n_frames', 1)
+
+    def __iter__(self):
+        cache = self.cache_dir and self.cache_file()
+        if cache and os.path.exists(cache):
+            return self._read_cache(cache)
+        return self._decode(cache)
+
+    def cache_file(self):
+        """Return the name of the file in cache_dir for these frames."""
+        files = [self.path] if self.files is None else self.files
+        key = [self.size, sorted(self.resize_args.items())]
+        key.extend((os.path.abspath(f), os.stat(f).st_mtime) for f in files)
+        digest = hashlib.sha1(repr(key).encode()).hexdigest()
+        return os.path.join(self.cache_dir, digest + '.rgb')
+
+    def _read_cache(self, cache):
+        frame_size = 3 * self.size[0] * self.size[1]
+        with open(cache, 'rb') as fp:
+            if not os.fstat(fp.fileno()).st_size:
+                return
+            data = memoryview(mmap.mmap(fp.fileno(), 0,
+                                        access=mmap.ACCESS_READ))
+
+        for i in range(0, len(data), frame_size):
+            yield data[i:i + frame_size]
+
+    def _decode(self, cache):
+        frames = queue.Queue(self.prefetch)
+        stop = threading.Event()
+        thread = threading.Thread(
+            target=self._produce, args=(frames, stop), daemon=True)
+        thread.start()
+
+        out = None
+        if cache:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp = '%s.%d.tmp' % (cache, id(thread))
+            out = open(temp, 'wb')
+
+        try:
+            while True:
+                frame = frames.get()
+                if frame is None:
+                    break
+                if isinstance(frame, Exception):
+                    raise frame
+                if out:
+                    out.write(frame)
+                yield frame
+
+            if out:
+                out.close()
+                os.replace(temp, cache)
+                out = None
+
+        finally:
+            stop.set()
+            if out:
+                out.close()
+                os.remove(temp)
+
+    def _produce(self, frames, stop):
+        def put(item):
+            while not stop.is_set():
+                try:
+                    frames.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+
+        try:
+            for image in self._images():
+                if not put(self._frame_bytes(image)):
+                    return
+        except Exception as e:
+            put(e)
+        else:
+            put(None)
+
+    def _images(self):
+        if self.files is None:
+            with Image.open(self.path) as img:
+                yield from ImageSequence.Iterator(img)
+        else:
+            for f in self.files:
+                with Image.open(f) as img:
+                    yield img
+
+    def _frame_bytes(self, image):
+        image = convert_mode(image)
+        if self.size:
+            image = resize(image, *self.size, **self.resize_args)
+        return image.tobytes()
+
+
 def crop(image, top_offset=0, left_offset=0, bottom_offset=0, right_offset=0):
     """Return an image cropped on top, bottom, left or right."""
     if bottom_offset or top_offset or left_offset or right_offset:
@@ -118,7 +292,7 @@ def resize(image, x, y, stretch=False, top=None, left=None, mode='RGB',
     if y <= 0:
         raise ValueError('y must be greater than zero')
 
-    resample = Image.ANTIALIAS if resample is None else resample
+    resample = Image.LANCZOS if resample is None else resample
     if not isinstance(resample, numbers.Number):
         try:
             resample = getattr(Image, resample.upper())
@@ -0,0 +1,142 @@
+"""
+Fixed-memory histograms of timings and sizes, for finding out where the
+frame time goes.
+
+Metrics are disabled by default, and then recording costs one attribute
+lookup.  Typical usage:
+
+    from bibliopixel.util import metrics
+
+    metrics.enable()
+    # ... run an animation ...
+    print(metrics.METRICS.summary()['driver.Serial.0.send'])
+"""
+
+import contextlib, math, threading, time
+
+PERCENTILES = 50, 95, 99
+
+
+class Histogram(object):
+    """
+    A histogram with logarithmic buckets, each about 9% wide.
+
+    Values from `minimum` to `minimum * 2 ** octaves` are bucketed; smaller
+    values go in the first bucket and larger ones in the last.  The count,
+    total, minimum and maximum are exact.
+    """
+
+    def __init__(self, minimum=1e-6, octaves=50, buckets_per_octave=8):
+        self.minimum = minimum
+        self.buckets_per_octave = buckets_per_octave
+        self.buckets = [0] * (octaves * buckets_per_octave + 1)
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self.buckets[:] = [0] * len(self.buckets)
+            self.count = 0
+            self.total = 0
+            self.min = None
+            self.max = None
+
+    def record(self, value):
+        if value > self.minimum:
+            i = int(math.log2(value / self.minimum) * self.buckets_per_octave)
+            i = min(i + 1, len(self.buckets) - 1)
+        else:
+            i = 0
+
+        with self.lock:
+            self.buckets[i] += 1
+            self.count += 1
+            self.total += value
+            if self.count == 1:
+                self.min = self.max = value
+            else:
+                self.min = min(self.min, value)
+                self.max = max(self.max, value)
+
+    def percentile(self, p):
+        """Return an upper bound for the p-th percentile, or None if there
+        are no values."""
+        with self.lock:
+            if not self.count:
+                return None
+
+            rank = math.ceil(self.count * p / 100)
+            seen = 0
+            for i, c in enumerate(self.buckets):
+                seen += c
+                if seen >= rank:
+                    break
+
+            if i == len(self.buckets) - 1:
+                return self.max
+            upper = self.minimum * 2 ** (i / self.buckets_per_octave)
+            return min(self.max, upper)
+
+    def summary(self):
+        result = {'count': self.count, 'total': self.total,
+                  'mean': self.count and self.total / self.count,
+                  'min': self.min, 'max': self.max}
+        for p in PERCENTILES:
+            result['p%d' % p] = self.percentile(p)
+        return result
+
+
+class Metrics(object):
+    """A collection of named Histograms."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, name):
+        try:
+            return self.histograms[name]
+        except KeyError:
+            with self.lock:
+                return self.histograms.setdefault(name, Histogram())
+
+    def record(self, name, value):
+        if self.enabled:
+            self.histogram(name).record(value)
+
+    @contextlib.contextmanager
+    def timer(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name).record(time.perf_counter() - start)
+
+    def clear(self):
+        with self.lock:
+            self.histograms.clear()
+
+    def summary(self, prefix=''):
+        """Return a dictionary from names starting with `prefix` to the
+        summary of their histograms."""
+        with self.lock:
+            # Other threads might add histograms while we summarize.
+            histograms = list(self.histograms.items())
+        return {k: v.summary() for k, v in sorted(histograms)
+                if k.startswith(prefix)}
+
+
+METRICS = Metrics()
+
+
+def enable(enabled=True):
+    METRICS.enabled = enabled
+
+
+def disable():
+    enable(False)
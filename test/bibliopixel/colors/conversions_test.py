@@ -0,0 +1,52 @@
+import unittest
+
+from bibliopixel import colors
+from bibliopixel.colors import conversions
+from bibliopixel.project import data_maker
+
+VALUES = 0, 1, 2, 17, 128, 254, 255
+HSVS = [(h, s, v) for h in range(0, 256, 5) for s in VALUES for v in VALUES]
+
+
+def pack(colors):
+    return bytearray(i for c in colors for i in c)
+
+
+class ConversionsTest(unittest.TestCase):
+    def test_hue_many(self):
+        hues = list(range(256))
+        for s in VALUES:
+            for v in VALUES:
+                self.assertEqual(
+                    conversions.hue2rgb_rainbow_many(hues, s, v),
+                    pack(conversions.hsv2rgb_rainbow((h, s, v)) for h in hues))
+                self.assertEqual(
+                    conversions.hue2rgb_spectrum_many(bytes(hues), s, v),
+                    pack(conversions.hsv2rgb_spectrum((h, s, v))
+                         for h in hues))
+
+    def test_hsv_many(self):
+        self.assertEqual(conversions.hsv2rgb_rainbow_many(HSVS),
+                         pack(map(conversions.hsv2rgb_rainbow, HSVS)))
+        self.assertEqual(conversions.hsv2rgb_spectrum_many(HSVS),
+                         pack(map(conversions.hsv2rgb_spectrum, HSVS)))
+
+    @unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+    def test_hsv_many_numpy(self):
+        hsvs = data_maker.numpy.array(HSVS)
+        self.assertEqual(conversions.hsv2rgb_rainbow_many(hsvs),
+                         pack(map(conversions.hsv2rgb_rainbow, HSVS)))
+        self.assertEqual(conversions.hsv2rgb_spectrum_many(hsvs),
+                         pack(map(conversions.hsv2rgb_spectrum, HSVS)))
+
+    def test_helpers_many(self):
+        for length in 1, 7, 300:
+            for step in 0, 3, 254, 400, -5:
+                positions = range(length)
+                self.assertEqual(
+                    colors.hue_helper_many(length, step),
+                    pack(colors.hue_helper(p, length, step) for p in positions))
+                self.assertEqual(
+                    colors.wheel_helper_many(length, step),
+                    pack(colors.wheel_helper(p, length, step)
+                         for p in positions))
@@ -3,8 +3,16 @@ import unittest
 from bibliopixel.colors import gamma
 
 
-# TODO: either figure out actual tests or delete this file.
-
 class GammaTest(unittest.TestCase):
-    def test_compatibility(self):
-        pass
+    def test_batch_table(self):
+        for g in gamma.DEFAULT, gamma.APA102, gamma.LPD8806, gamma.WS2812:
+            self.assertEqual(list(g.batch_table()), list(g.table))
+
+            table = g.batch_table(0.5)
+            for i in range(256):
+                self.assertEqual(table[i], g.get(0.5 * i))
+
+    def test_translate(self):
+        table = gamma.LPD8806.batch_table()
+        self.assertEqual(bytes([0, 64, 255]).translate(table),
+                         bytes([128, 132, 255]))
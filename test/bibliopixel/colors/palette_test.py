@@ -0,0 +1,69 @@
+import unittest
+
+from bibliopixel.colors import palette
+from bibliopixel.colors.palette import Palette
+from bibliopixel.project import data_maker
+
+
+def pack(colors):
+    return bytearray(i for c in colors for i in c)
+
+
+class PaletteTest(unittest.TestCase):
+    def test_gradient(self):
+        p = Palette(['red', (0, 0, 255)])
+        self.assertEqual(len(p), 256)
+        self.assertEqual(p[0], (255, 0, 0))
+        self.assertEqual(p[128], (127, 0, 128))
+        self.assertEqual(p[255], (0, 0, 255))
+        self.assertEqual(p[-10], (255, 0, 0))
+        self.assertEqual(p[1000], (0, 0, 255))
+        self.assertEqual(p.get(1), (0, 0, 255))
+
+    def test_wrap(self):
+        p = Palette(['red', 'lime', 'blue'], size=6, wrap=True)
+        self.assertEqual(p.table, [
+            (255, 0, 0), (128, 128, 0), (0, 255, 0),
+            (0, 127, 128), (0, 0, 255), (128, 0, 127)])
+        self.assertEqual(p[6], p[0])
+        self.assertEqual(p[-1], p[5])
+
+    def test_stops(self):
+        p = Palette([(0.5, 'white'), 0, (1, (255, 0, 0))], size=5)
+        self.assertEqual(p.table, [
+            (255, 255, 255), (255, 255, 255), (255, 255, 255),
+            (0, 0, 0), (255, 0, 0)])
+
+    def test_sample(self):
+        for size in 16, 256, 1024:
+            for wrap in False, True:
+                p = Palette(['red', 'blue', 'white'], size=size, wrap=wrap)
+                indices = list(range(0, 256, 3))
+                for offset in 0, 7, -300:
+                    expected = pack(p[i + offset] for i in indices)
+                    self.assertEqual(p.sample(indices, offset), expected)
+                    self.assertEqual(p.sample(bytes(indices), offset),
+                                     expected)
+
+        indices = [0, 300, 1023]
+        self.assertEqual(p.sample(indices, 2), pack(p[i + 2] for i in indices))
+        self.assertEqual(p.sample_positions([0, 0.5, 1]),
+                         pack(p.get(i) for i in (0, 0.5, 1)))
+
+    @unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+    def test_sample_numpy(self):
+        p = Palette(['red', 'blue'], size=300)
+        indices = [0, 10, 299, 400]
+        self.assertEqual(p.sample(data_maker.numpy.array(indices), 5),
+                         p.sample(indices, 5))
+
+    def test_indices(self):
+        self.assertEqual(palette.strip_indices(4), bytes([0, 64, 128, 192]))
+        self.assertEqual(palette.strip_indices(4, size=1024, repeats=2),
+                         [0, 512, 0, 512])
+        self.assertEqual(palette.matrix_indices(4, 2),
+                         bytes([0, 85, 170, 255]) * 2)
+        self.assertEqual(palette.matrix_indices(2, 3, angle=90),
+                         bytes([255, 255, 127, 127, 0, 0]))
+        self.assertEqual(palette.radial_indices(3, 3),
+                         bytes([255, 180, 255, 180, 0, 180, 255, 180, 255]))
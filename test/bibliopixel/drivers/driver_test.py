@@ -1,6 +1,8 @@
 import unittest
 
 from bibliopixel.colors import gamma
+from bibliopixel.project import data_maker
+from bibliopixel.project.color_list import ByteColorList, IndexedColorList
 from bibliopixel.drivers.driver_base import DriverBase, ChannelOrder
 from bibliopixel.drivers.SPI import SPI, SPI_INTERFACES
 
@@ -13,8 +15,11 @@ class DriverTest(unittest.TestCase):
 
     SPD = dict(interface=SPI_INTERFACES.DUMMY)
 
+    def make_colors(self, colors):
+        return colors
+
     def do_test(self, driver, expected):
-        driver.set_colors(self.COLORS, 0)
+        driver.set_colors(self.make_colors(self.COLORS), 0)
         driver._render()
         self.assertEqual(list(driver._buf), expected)
 
@@ -23,7 +28,7 @@ class DriverTest(unittest.TestCase):
         for i in range(len(driver._buf)):
             driver._buf[i] = 23  # randomize
         self.assertTrue(all(driver._buf))
-        driver.set_colors([(0, 0, 0)] * 4, 0)
+        driver.set_colors(self.make_colors([(0, 0, 0)] * 4), 0)
         driver._render()
         self.assertFalse(any(driver._buf))  # It wrote zeroes!
 
@@ -47,6 +52,18 @@ class DriverTest(unittest.TestCase):
         expected = [128, 128, 128, 128, 128, 132, 128, 128, 151, 128, 128, 190]
         self.do_test(driver, expected)
 
+    def test_brightness(self):
+        driver = DriverBase(num=4)
+        driver._brightness = 128
+        expected = [0, 0, 0, 0, 4, 32, 1, 8, 64, 1, 12, 96]
+        self.do_test(driver, expected)
+
+    def test_offset(self):
+        driver = DriverBase(num=2, c_order=ChannelOrder.BGR)
+        driver.set_colors(self.make_colors(self.COLORS), 2)
+        driver._render()
+        self.assertEqual(list(driver._buf), [128, 16, 2, 192, 24, 3])
+
     def test_apa102(self):
         driver = SPI(ledtype='APA102', num=4, **self.SPD)
         expected = [0, 0, 0, 0, 0, 8, 0, 0, 46, 0, 1, 125]
@@ -62,3 +79,23 @@ class DriverTest(unittest.TestCase):
         driver = SPI(ledtype='WS2801', num=4, **self.SPD)
         expected = [0, 0, 0, 0, 0, 8, 0, 0, 45, 0, 0, 125]
         self.do_test(driver, expected)
+
+
+@unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+class NumpyDriverTest(DriverTest):
+    def make_colors(self, colors):
+        return data_maker.numpy.array(colors, dtype='float')
+
+
+class IndexedDriverTest(DriverTest):
+    def make_colors(self, colors):
+        result = IndexedColorList(len(colors))
+        result[:] = colors
+        return result
+
+
+class ByteDriverTest(DriverTest):
+    def make_colors(self, colors):
+        result = ByteColorList(len(colors))
+        result[:] = colors
+        return result
@@ -0,0 +1,68 @@
+import unittest
+
+from bibliopixel.drivers import network_protocol
+from bibliopixel.drivers.network_protocol import CMDTYPE, COMPRESSION
+
+
+class NetworkProtocolTest(unittest.TestCase):
+    def test_rle(self):
+        data = bytes([1, 2, 3] * 300 + [4, 5, 6] + [1, 2, 3] * 2)
+        encoded = network_protocol.rle_encode(data)
+        self.assertEqual(encoded, bytes(
+            [255, 1, 2, 3, 45, 1, 2, 3, 1, 4, 5, 6, 2, 1, 2, 3]))
+        self.assertEqual(network_protocol.rle_decode(encoded), data)
+        self.assertEqual(network_protocol.rle_encode(b''), b'')
+
+        with self.assertRaises(ValueError):
+            network_protocol.rle_decode(b'\x01\x02')
+
+    def test_compress(self):
+        data = bytes(range(256)) * 3
+        for c in network_protocol.COMPRESSIONS:
+            compressed = network_protocol.compress(data, c)
+            self.assertEqual(network_protocol.decompress(compressed, c), data)
+
+        with self.assertRaises(ValueError):
+            network_protocol.decompress(data, 99)
+
+    def test_make_compression(self):
+        self.assertEqual(network_protocol.make_compression(None),
+                         COMPRESSION.NONE)
+        self.assertEqual(network_protocol.make_compression('ZLIB'),
+                         COMPRESSION.ZLIB)
+        self.assertEqual(network_protocol.make_compression(COMPRESSION.RLE),
+                         COMPRESSION.RLE)
+        with self.assertRaises(ValueError):
+            network_protocol.make_compression('lzma')
+
+    def test_header_v2(self):
+        header = network_protocol.generate_header_v2(
+            0x123456, 7, 1.5, COMPRESSION.ZLIB)
+        self.assertEqual(header[0], CMDTYPE.PIXEL_DATA_V2)
+        self.assertEqual(len(header), 1 + network_protocol.HEADER_V2.size)
+        self.assertEqual(network_protocol.parse_header_v2(header[1:]),
+                         (COMPRESSION.ZLIB, 7, 1.5, 0x123456))
+
+    def test_large_frame(self):
+        data = bytes(range(256)) * 1000
+        with self.assertRaises(ValueError):
+            network_protocol.make_pixel_packet(data, protocol=1)
+
+        packet = network_protocol.make_pixel_packet(
+            data, protocol=2, sequence=3, compression=COMPRESSION.ZLIB)
+        header_size = 1 + network_protocol.HEADER_V2.size
+        c, sequence, timestamp, size = network_protocol.parse_header_v2(
+            packet[1:header_size])
+        self.assertEqual(sequence, 3)
+        self.assertEqual(size, len(packet) - header_size)
+        self.assertEqual(
+            network_protocol.decompress(bytes(packet[header_size:]), c), data)
+
+    def test_setup(self):
+        packet = network_protocol.make_setup_packet(
+            [COMPRESSION.RLE, COMPRESSION.ZLIB])
+        self.assertEqual(packet, bytearray([CMDTYPE.SETUP_DATA, 3, 0, 2, 2, 1]))
+        self.assertEqual(network_protocol.choose_compression(packet[3:]),
+                         COMPRESSION.RLE)
+        self.assertEqual(network_protocol.choose_compression(b'\x02\x09'),
+                         COMPRESSION.NONE)
@@ -0,0 +1,127 @@
+import threading, time, unittest
+from unittest import mock
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.drivers import network_protocol
+from bibliopixel.drivers.network_protocol import COMPRESSION
+from bibliopixel.drivers.network import Network
+from bibliopixel.drivers.network_receiver import NetworkReceiver
+from bibliopixel.layout import Strip
+
+
+class NetworkTest(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.frames = threading.Semaphore(0)
+
+        test = self
+
+        class Recorder(DriverBase):
+            def _send_packet(self):
+                test.received.append([tuple(c) for c in self._colors])
+                test.frames.release()
+
+        self.layout = Strip(Recorder(num=4))
+        self.start_receiver()
+
+    def start_receiver(self):
+        self.receiver = NetworkReceiver(self.layout, port=0,
+                                        interface='localhost')
+        self.receiver.start()
+        self.port = self.receiver.address[1]
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def wait_for_frames(self, count):
+        for i in range(count):
+            self.assertTrue(self.frames.acquire(timeout=5))
+
+    def make_driver(self, **kwds):
+        driver = Network(num=4, port=self.port, **kwds)
+        layout = Strip(driver)
+        return driver, layout
+
+    def test_frames(self, **kwds):
+        driver, layout = self.make_driver(**kwds)
+        for i in range(8):
+            layout.fill((i, 2 * i, 3 * i))
+            layout.push_to_driver()
+
+        self.assertTrue(self.receiver.wait_for_frames(8, timeout=5))
+        self.assertFalse(self.receiver.wait_for_frames(9, timeout=0.01))
+        self.wait_for_frames(8)
+        connection = driver._connection
+        self.assertEqual(self.received[-1], [(7, 14, 21)] * 4)
+
+        layout.fill((1, 2, 3))
+        layout.push_to_driver()
+        self.wait_for_frames(1)
+        self.assertTrue(self.receiver.wait_for_frames(9, timeout=5))
+        self.assertIs(connection, driver._connection)
+        self.assertEqual(self.received[-1], [(1, 2, 3)] * 4)
+        self.driver_protocol = connection.protocol
+        self.driver_compression = connection.compression
+        driver.cleanup()
+
+    def test_window(self):
+        self.test_frames(window=4)
+
+    def test_protocol_1(self):
+        self.test_frames(protocol=1)
+
+    def test_zlib(self):
+        self.test_frames(compression='zlib')
+        self.assertEqual(self.driver_compression, COMPRESSION.ZLIB)
+
+    def test_rle(self):
+        self.test_frames(compression=['rle', 'zlib'], window=2)
+        self.assertEqual(self.driver_compression, COMPRESSION.RLE)
+
+    def test_fallback(self):
+        # Old receivers reject SETUP_DATA as an unknown command.
+        def make_setup_packet(compressions):
+            return network_protocol.generate_header(99, 0)
+
+        with mock.patch.object(network_protocol, 'make_setup_packet',
+                               make_setup_packet):
+            self.test_frames(compression='zlib')
+        self.assertEqual(self.driver_protocol, 1)
+
+    def test_large_frame(self):
+        self.receiver.stop()
+        self.layout = Strip(self.layout.drivers[0].__class__(num=30000))
+        self.start_receiver()
+
+        driver = Network(num=30000, port=self.port, compression='rle')
+        layout = Strip(driver)
+        layout.fill((1, 2, 3), 0, 9999)
+        layout.fill((4, 5, 6), 20000)
+        layout.push_to_driver()
+        self.wait_for_frames(1)
+        self.assertEqual(self.received[-1], [(1, 2, 3)] * 10000 +
+                         [(0, 0, 0)] * 10000 + [(4, 5, 6)] * 10000)
+        driver.cleanup()
+
+        with self.assertRaises(ValueError):
+            Network(num=30000, port=self.port, protocol=1)
+
+    def test_reconnect(self):
+        driver, layout = self.make_driver()
+        layout.fill((1, 2, 3))
+        layout.push_to_driver()
+        self.wait_for_frames(1)
+
+        # Break the connection behind the driver's back.
+        driver._connection.close()
+        layout.fill((4, 5, 6))
+        layout.push_to_driver()
+        self.wait_for_frames(1)
+        self.assertEqual(self.received[-1], [(4, 5, 6)] * 4)
+        driver.cleanup()
+
+    def test_no_receiver(self):
+        driver, layout = self.make_driver()
+        driver._port = 1  # Nothing listens on the tcpmux port.
+        with self.assertRaises(IOError):
+            layout.push_to_driver()
@@ -0,0 +1,119 @@
+import threading, unittest
+
+from bibliopixel.drivers import network_protocol
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.drivers.network_udp import NetworkUDP
+from bibliopixel.drivers.network_udp_receiver import NetworkUDPReceiver
+from bibliopixel.layout import Strip
+
+
+class ReassemblerTest(unittest.TestCase):
+    def test_small_packet(self):
+        packet = bytearray(b'\x02\x03\x00abc')
+        self.assertEqual(list(network_protocol.fragment(packet, 0)), [packet])
+        self.assertIs(network_protocol.Reassembler().add(packet), packet)
+
+    def test_reassemble(self):
+        packet = bytes(range(256)) * 20
+        fragments = list(network_protocol.fragment(packet, 7, mtu=1000))
+        self.assertEqual(len(fragments), 6)
+        self.assertTrue(all(len(f) <= 1000 for f in fragments))
+
+        r = network_protocol.Reassembler()
+        for f in reversed(fragments[1:]):
+            self.assertIsNone(r.add(f))
+        self.assertIsNone(r.add(fragments[3]))  # duplicate
+        self.assertEqual(r.add(fragments[0]), packet)
+        self.assertIsNone(r.add(fragments[0]))  # already complete
+
+    def test_drop_incomplete(self):
+        r = network_protocol.Reassembler()
+        old = list(network_protocol.fragment(bytes(3000), 1, mtu=1000))
+        new = list(network_protocol.fragment(bytes(2000), 2, mtu=1000))
+
+        r.add(old[0])
+        self.assertIsNone(r.add(new[0]))
+        self.assertIsNone(r.add(old[1]))  # stale
+        self.assertIsNone(r.add(new[1]))
+        self.assertEqual(r.add(new[2]), bytes(2000))
+        self.assertEqual((r.dropped, r.stale), (1, 1))
+
+    def test_wraparound(self):
+        r = network_protocol.Reassembler()
+        old = network_protocol.fragment(bytes(2000), 0xFFFFFFFF, mtu=1000)
+        new = network_protocol.fragment(bytes(2000), 0x100000000, mtu=1000)
+        r.add(next(old))
+        r.add(next(new))
+        self.assertEqual((r.frame, r.dropped, r.stale), (0, 1, 0))
+
+
+class NetworkUDPTest(unittest.TestCase):
+    def setUp(self):
+        self.received = []
+        self.frames = threading.Semaphore(0)
+
+        test = self
+
+        class Recorder(DriverBase):
+            def _send_packet(self):
+                test.received.append([tuple(c) for c in self._colors])
+                test.frames.release()
+
+        self.layout = Strip(Recorder(num=30000))
+        self.receiver = NetworkUDPReceiver(self.layout, port=0,
+                                           interface='localhost')
+        self.receiver.start()
+        self.port = self.receiver._server.server_address[1]
+
+    def tearDown(self):
+        self.receiver.stop()
+
+    def send_frames(self, **kwds):
+        driver = NetworkUDP(num=30000, port=self.port, **kwds)
+        layout = Strip(driver)
+        sock = None
+        for i in range(3):
+            layout.fill((i, 2, 3))
+            layout.push_to_driver()
+            self.assertTrue(self.frames.acquire(timeout=5))
+            self.assertEqual(self.received[-1], [(i, 2, 3)] * 30000)
+            self.assertIs(sock or driver._sock, driver._sock)
+            sock = driver._sock
+
+        self.assertEqual(driver.frames_sent, 3)
+        self.assertEqual(driver.packets_sent,
+                         self.receiver.stats()['packets_received'])
+        driver.cleanup()
+        return driver
+
+    def test_protocol_2(self):
+        self.send_frames(protocol=2)
+        stats = self.receiver.stats()
+        self.assertEqual(stats['frames_received'], 3)
+        self.assertEqual(stats['frames_lost'], 0)
+
+    def test_lost_frames(self):
+        self.send_frames(protocol=2, compression='rle')
+        self.assertEqual(self.receiver.packets_received, 3)
+
+        self.receiver.check_sequence(5)
+        self.assertEqual(self.receiver.frames_lost, 2)
+        self.assertFalse(self.receiver.check_sequence(4))
+
+    def test_protocol_1(self):
+        with self.assertRaises(ValueError):
+            NetworkUDP(num=30000)
+
+    def test_no_fragments(self):
+        driver = NetworkUDP(num=10000, protocol=2, port=self.port)
+        Strip(driver)
+        driver._compute_packet()
+        self.assertEqual(len(driver._packet), 1)
+
+        driver = NetworkUDP(num=10000, protocol=2, port=self.port,
+                            mtu=network_protocol.UDP_MTU)
+        Strip(driver)
+        driver._compute_packet()
+        self.assertEqual(len(driver._packet), 21)
+        self.assertTrue(all(len(d) <= network_protocol.UDP_MTU
+                            for d in driver._packet))
@@ -0,0 +1,148 @@
+import threading, unittest
+from unittest import mock
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Strip
+from bibliopixel.project import data_maker
+
+
+class PipelineTest(unittest.TestCase):
+    maker = data_maker.MAKER
+
+    def make_layout(self, pipeline, **kwds):
+        self.sent = []
+        self.sending = threading.Event()
+        self.sending.set()
+        test = self
+
+        class Recorder(DriverBase):
+            def _compute_packet(self):
+                self._render()
+
+            def _send_packet(self):
+                test.sending.wait()
+                test.sent.append((self, bytes(self._buf)))
+
+        self.drivers = [Recorder(num=2), Recorder(num=3)]
+        return Strip(self.drivers, pipeline=pipeline, maker=self.maker, **kwds)
+
+    def test_frames(self):
+        layout = self.make_layout(3)
+        for i in range(10):
+            layout.fill((i, 2 * i, 3 * i))
+            layout.push_to_driver()
+        layout.cleanup()
+
+        for d in self.drivers:
+            frames = [b for driver, b in self.sent if driver is d]
+            expected = [bytes((i, 2 * i, 3 * i)) * d.numLEDs
+                        for i in range(10)] + [bytes(3 * d.numLEDs)]
+            self.assertEqual(frames, expected)
+
+    def test_threaded(self):
+        layout = self.make_layout(2, threadedUpdate=True)
+        for i in range(10):
+            layout.fill((i, i, i))
+            layout.push_to_driver()
+        layout.cleanup()
+        for d in self.drivers:
+            frames = [b for driver, b in self.sent if driver is d]
+            self.assertEqual(frames[-1], bytes(3 * d.numLEDs))
+
+    def test_sync(self):
+        layout = self.make_layout(3)
+        self.sending.clear()
+        synced = []
+
+        def sync(d):
+            sent = sum(driver is d for driver, b in self.sent)
+            synced.append((d, sent))
+
+        for d in self.drivers:
+            d.sync = lambda d=d: sync(d)
+
+        layout.fill((1, 1, 1))
+        layout.push_to_driver()
+        self.assertEqual(synced, [])
+
+        self.sending.set()
+        layout.cleanup()
+        for d in self.drivers:
+            # Each sync() comes after the frame it follows has been sent.
+            self.assertEqual([n for driver, n in synced if driver is d],
+                             [1, 2])
+
+    def test_overlap(self):
+        layout = self.make_layout(3)
+        self.sending.clear()
+        layout.fill((1, 1, 1))
+        layout.push_to_driver()
+
+        # Both frames are queued while the first one is still being sent.
+        layout.fill((2, 2, 2))
+        layout.push_to_driver()
+        layout.fill((3, 3, 3))
+        self.assertEqual(self.sent, [])
+
+        self.sending.set()
+        layout.cleanup()
+        for d in self.drivers:
+            self.assertEqual([b[:3] for driver, b in self.sent if driver is d],
+                             [b'\x01\x01\x01', b'\x02\x02\x02', bytes(3)])
+
+    def test_restart(self):
+        layout = self.make_layout(2)
+        layout.fill((1, 1, 1))
+        layout.push_to_driver()
+        layout.cleanup()
+        self.assertIsNone(self.drivers[0]._pipeline)
+
+        layout.fill((2, 2, 2))
+        layout.push_to_driver()
+        layout.cleanup()
+        self.assertEqual([b[:3] for driver, b in self.sent
+                          if driver is self.drivers[0]],
+                         [b'\x01\x01\x01', bytes(3), b'\x02\x02\x02', bytes(3)])
+
+    def test_failure(self):
+        class Bad(DriverBase):
+            def _send_packet(self):
+                raise IOError('bad')
+
+        driver = Bad(num=3)
+        layout = Strip(driver, pipeline=3, maker=self.maker)
+        with mock.patch('bibliopixel.drivers.driver_base.log.exception'):
+            with self.assertRaises(IOError):
+                for i in range(10):
+                    layout.push_to_driver()
+                    driver.wait_for_pipeline()
+
+            with self.assertRaises(IOError):
+                layout.cleanup()
+
+        self.assertIsNone(driver._pipeline)
+        self.assertFalse(driver._pipeline_thread.is_alive())
+
+    def test_no_pipeline(self):
+        layout = self.make_layout(1)
+        self.assertIsNone(self.drivers[0]._pipeline)
+        layout.fill((1, 1, 1))
+        layout.push_to_driver()
+        self.assertEqual(len(self.sent), 2)
+
+
+class SharedPipelineTest(PipelineTest):
+    maker = data_maker.Maker(shared_memory=True, floating=False)
+
+
+@unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+class NumpyPipelineTest(PipelineTest):
+    maker = data_maker.Maker(use_numpy=True)
+
+
+class IndexedPipelineTest(PipelineTest):
+    maker = data_maker.Maker(indexed=True)
+
+
+class CompactPipelineTest(PipelineTest):
+    maker = data_maker.Maker(compact=True)
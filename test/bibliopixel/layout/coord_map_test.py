@@ -0,0 +1,111 @@
+import itertools, unittest
+from array import array
+
+from bibliopixel.layout.geometry import coord_map, matrix
+from bibliopixel.project import data_maker
+from bibliopixel.layout.geometry.cube import make_cube_coord_map
+
+
+def rotate_and_flip(rows, rotation, flip):
+    for i in range(rotation):
+        rows = list(zip(*rows[::-1]))
+    if flip:
+        rows = rows[::-1]
+    return [list(r) for r in rows]
+
+
+class CoordMapTest(unittest.TestCase):
+    def test_compile(self):
+        rows = [[0, 1, 2], [5, 4, 3]]
+        m = coord_map.compile_coord_map(rows)
+        self.assertEqual(m.shape, (3, 2))
+        self.assertEqual(list(m.index), [0, 1, 2, 5, 4, 3])
+        self.assertEqual(m.rows(), rows)
+        self.assertEqual(m.get(0, 1), 5)
+        with self.assertRaises(IndexError):
+            m.get(3, 0)
+        with self.assertRaises(IndexError):
+            m.get(-1, 0)
+
+    def test_compile_strip(self):
+        m = coord_map.compile_coord_map((2, 0, 1))
+        self.assertEqual(m.shape, (3,))
+        self.assertEqual(m.rows(), [2, 0, 1])
+
+    def test_ragged(self):
+        m = coord_map.compile_coord_map([[0, 1, 2], [3]])
+        self.assertEqual(m.rows(), [[0, 1, 2], [3]])
+        self.assertEqual(m.index[3:], array('I', [3] + [coord_map.MISSING] * 2))
+        with self.assertRaises(IndexError):
+            m.get(1, 1)
+        self.assertEqual(m.positions(), [
+            [0, 0, 0], [1, 0, 0], [2, 0, 0], [0, 1, 0], None, None])
+
+        rows = [[[0, 1], [2]], [[3]]]
+        self.assertEqual(coord_map.compile_coord_map(rows).rows(), rows)
+
+    def test_cube(self):
+        rows = make_cube_coord_map(2, 3, 4)
+        m = coord_map.compile_coord_map(rows)
+        self.assertEqual(m.shape, (2, 3, 4))
+        self.assertEqual(m.rows(), rows)
+        for i, (x, y, z) in enumerate(m.positions()):
+            self.assertEqual(rows[z][y][x], i)
+
+    def test_rotate(self):
+        rows = [[0, 1, 2], [3, 4, 5]]
+        m = coord_map.compile_coord_map(rows)
+        for rotation, flip in itertools.product(range(4), (False, True)):
+            self.assertEqual(m.rotate(rotation, flip).rows(),
+                             rotate_and_flip(rows, rotation, flip))
+
+    def test_lookup(self):
+        m = coord_map.compile_coord_map(make_cube_coord_map(2, 3, 4))
+        points = [(0, 0, 0), (1, 2, 3), (2, 0, 0), (-1, 0, 0), (0, 1, 1)]
+        expected = [0, 23, coord_map.MISSING, coord_map.MISSING, 9]
+        self.assertEqual(m.lookup(points), expected)
+        if data_maker.numpy:
+            points = data_maker.numpy.array(points)
+            self.assertEqual(list(m.lookup(points)), expected)
+
+        m = coord_map.compile_coord_map([[0, 1, 2], [5, 4, 3]])
+        points = [(0, 0), (2, 1), (1, 1), (3, 0), (0, 2)]
+        expected = [0, 3, 4, coord_map.MISSING, coord_map.MISSING]
+        self.assertEqual(m.lookup(points), expected)
+
+    def test_window(self):
+        m = coord_map.compile_coord_map([[0, 1, 2], [5, 4, 3]])
+        self.assertEqual(m.window(1, -1, 4, 2), (0, 1, 2, 2, array('I', [1, 2])))
+        self.assertEqual(m.window(5, 0, 2, 2)[-1], array('I'))
+
+    def test_span_pixels(self):
+        m = coord_map.compile_coord_map([[0, 1, 2], [5, 4, 3]])
+        spans = [(-1, 0, 2), (1, 1, 5), (0, 2, 3), (3, 0, 1)]
+        self.assertEqual(m.span_pixels(spans), array('I', [0, 4, 3]))
+
+
+class CompiledMatrixTest(unittest.TestCase):
+    def test_same_as_operations(self):
+        for flags in itertools.product((False, True), repeat=5):
+            m = matrix.Matrix(list(range(12)), 3, *flags)
+            for x, y in itertools.product(range(-5, 6), repeat=2):
+                expected = None
+                ex, ey = x, y
+                for o in m.operations:
+                    ex, ey = o(ex, ey, m)
+                if 0 <= ex < m.columns and 0 <= ey < m.rows:
+                    expected = ex + ey * m.columns
+
+                if expected is None:
+                    with self.assertRaises(IndexError):
+                        m.get(x, y)
+                else:
+                    self.assertEqual(m.get(x, y), expected)
+
+    def test_make_matrix_coord_map(self):
+        rows = [[0, 1, 2, 3], [7, 6, 5, 4], [8, 9, 10, 11]]
+        for rotation, flip in itertools.product(range(4), (False, True)):
+            self.assertEqual(
+                matrix.make_matrix_coord_map(4, 3, rotation=rotation,
+                                             y_flip=flip),
+                rotate_and_flip(rows, rotation, flip))
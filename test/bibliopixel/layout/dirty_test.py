@@ -0,0 +1,76 @@
+import unittest
+
+from bibliopixel.layout import Strip
+from bibliopixel.layout.dirty import Dirty
+from bibliopixel.drivers.driver_base import DriverBase
+
+
+class DirtyTest(unittest.TestCase):
+    def test_dirty(self):
+        d = Dirty(10)
+        self.assertTrue(d)
+        self.assertEqual(d.slice(0, 10), (0, 10))
+        d.clear()
+        self.assertFalse(d)
+
+        d.set(3)
+        d.set(5)
+        self.assertTrue(d)
+        self.assertEqual(d.slice(0, 5), (3, 5))
+        self.assertEqual(d.slice(5, 5), (0, 1))
+
+        begin, end = d.slice(6, 4)
+        self.assertFalse(begin < end)
+
+        d.set_range(7, 7)
+        self.assertEqual((d.begin, d.end), (3, 6))
+        d.set_range(7, 9)
+        self.assertEqual((d.begin, d.end), (3, 9))
+
+
+class CountingDriver(DriverBase):
+    def __init__(self, *args, **kwds):
+        super().__init__(*args, **kwds)
+        self.updates = []
+
+    def _compute_packet(self):
+        self.updates.append(self._update_range)
+
+
+class SkipUnchangedTest(unittest.TestCase):
+    def make_strip(self, skip_unchanged):
+        self.drivers = [CountingDriver(num=4), CountingDriver(num=4)]
+        return Strip(self.drivers, skip_unchanged=skip_unchanged)
+
+    def updates(self):
+        return [d.updates for d in self.drivers]
+
+    def test_skip_unchanged(self):
+        strip = self.make_strip(True)
+        strip.push_to_driver()
+        self.assertEqual(self.updates(), [[(0, 4)], [(0, 4)]])
+
+        strip.push_to_driver()
+        self.assertEqual(self.updates(), [[(0, 4)], [(0, 4)]])
+
+        strip.set(5, (1, 2, 3))
+        strip.set(6, (1, 2, 3))
+        strip.push_to_driver()
+        self.assertEqual(self.updates(), [[(0, 4)], [(0, 4), (1, 3)]])
+
+        strip.fill((1, 2, 3), 2, 4)
+        strip.push_to_driver()
+        self.assertEqual(self.updates(),
+                         [[(0, 4), (2, 4)], [(0, 4), (1, 3), (0, 1)]])
+
+        strip.set_brightness(128)
+        strip.push_to_driver()
+        self.assertEqual(self.updates(),
+                         [[(0, 4), (2, 4), (0, 4)],
+                          [(0, 4), (1, 3), (0, 1), (0, 4)]])
+
+    def test_no_skip(self):
+        strip = self.make_strip(False)
+        strip.push_to_driver()
+        strip.push_to_driver()
+        self.assertEqual(self.updates(), [[(0, 4)] * 2, [(0, 4)] * 2])
@@ -0,0 +1,49 @@
+import unittest
+
+from bibliopixel.layout import Matrix, font
+from bibliopixel.drivers.driver_base import DriverBase
+
+
+class GlyphTest(unittest.TestCase):
+    def test_make_glyph(self):
+        f = {'data': [[0b101, 0b011]], 'height': 3, 'sep': 1}
+        glyph = font.make_glyph(f, 0)
+        self.assertEqual(glyph.advance, 3)
+        self.assertEqual(glyph.foreground, [b'\1\1\0', b'\0\1\0', b'\1\0\0'])
+        self.assertEqual(glyph.background, [b'\0\0\1', b'\1\0\1', b'\0\1\1'])
+
+        glyph = font.make_glyph(f, 0, 2)
+        self.assertEqual(glyph.foreground[:3], [b'\1\1\1\1\0\0'] * 2 +
+                         [b'\0\0\1\1\0\0'])
+
+    def test_undefined(self):
+        glyph = font.make_glyph(font.fonts['6x4'], 300)
+        self.assertEqual(glyph.advance, 4)
+        self.assertEqual(glyph.foreground, [b'\1\1\1\0'] * 5 + [bytes(4)])
+
+    def test_cache(self):
+        cache = font.GlyphCache(size=2)
+        a = cache.get(font.fonts, '8x6', 65)
+        self.assertIs(cache.get(font.fonts, '8x6', 65), a)
+        cache.get(font.fonts, '8x6', 66)
+        cache.get(font.fonts, '8x6', 65)
+        cache.get(font.fonts, '8x6', 67)
+        self.assertEqual([k[1] for k in cache.glyphs], [65, 67])
+
+    def test_replaced_font(self):
+        cache = font.GlyphCache()
+        fonts = {'f': {'data': [[1]], 'height': 1}}
+        self.assertEqual(cache.get(fonts, 'f', 0).foreground, [b'\1\0'])
+        fonts['f'] = {'data': [[0]], 'height': 1}
+        self.assertEqual(cache.get(fonts, 'f', 0).foreground, [b'\0\0'])
+
+
+class LoadFontTest(unittest.TestCase):
+    def test_draw_loaded_font(self):
+        matrix = Matrix(DriverBase(num=12), width=4, height=3,
+                        serpentine=False)
+        self.addCleanup(matrix.fonts.pop, 'tiny', None)
+        matrix.loadFont('tiny', 3, 2, [[0b111, 0b010]])
+        matrix.drawChar(1, 0, '\x00', (255, 0, 0), None, font='tiny')
+        changed = [i for i, c in enumerate(matrix._colors) if c[0]]
+        self.assertEqual(changed, [1, 5, 6, 9])
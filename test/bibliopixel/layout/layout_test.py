@@ -0,0 +1,104 @@
+import unittest
+
+from bibliopixel.project import data_maker
+from bibliopixel.layout import Strip
+from bibliopixel.drivers.driver_base import DriverBase
+
+
+class BaseLayoutTest(unittest.TestCase):
+
+    def make_strip(self, num=6, **kwds):
+        driver = DriverBase(num=num)
+        return Strip(driver, maker=self.maker, **kwds)
+
+    def assert_colors(self, layout, expected):
+        colors = [tuple(int(i) for i in c) for c in layout._colors]
+        self.assertEqual(colors, expected)
+
+    def test_fill(self):
+        strip = self.make_strip()
+        strip.fill((1, 2, 3), 2, 3)
+        self.assert_colors(strip, [(0, 0, 0)] * 2 + [(1, 2, 3)] * 2 +
+                           [(0, 0, 0)] * 2)
+
+        strip.fill((4, 5, 6), 4)
+        self.assert_colors(strip, [(0, 0, 0)] * 2 + [(1, 2, 3)] * 2 +
+                           [(4, 5, 6)] * 2)
+
+        strip.fill((7, 8, 9), 5, 2)
+        self.assert_colors(strip, [(0, 0, 0)] * 2 + [(1, 2, 3)] * 2 +
+                           [(4, 5, 6)] * 2)
+
+    def test_all_off(self):
+        strip = self.make_strip()
+        strip.fill((1, 2, 3))
+        strip.all_off()
+        self.assert_colors(strip, [(0, 0, 0)] * 6)
+
+    def test_set_buffer(self):
+        strip = self.make_strip(num=2)
+        strip.setBuffer([1, 2, 3, 4, 5, 6])
+        self.assert_colors(strip, [(1, 2, 3), (4, 5, 6)])
+
+        strip.setBuffer(bytearray([6, 5, 4, 3, 2, 1]))
+        self.assert_colors(strip, [(6, 5, 4), (3, 2, 1)])
+
+        with self.assertRaises(IOError):
+            strip.setBuffer([1, 2, 3])
+
+    def test_set_color_bytes(self):
+        strip = self.make_strip(num=2)
+        strip.set_color_bytes(memoryview(bytearray([1, 2, 3, 4, 5, 255])))
+        self.assert_colors(strip, [(1, 2, 3), (4, 5, 255)])
+
+        with self.assertRaises(IOError):
+            strip.set_color_bytes(b'\x01\x02\x03')
+
+    def test_set_colors(self):
+        strip = self.make_strip(num=2)
+        strip.set_colors([(1, 2, 3), (4, 5, 6)])
+        self.assert_colors(strip, [(1, 2, 3), (4, 5, 6)])
+
+    def test_set_many(self):
+        strip = self.make_strip(num=4, coord_map=[3, 2, 1, 0])
+        strip.set_many([0, 2, 4, -1], [(1, 2, 3), (4, 5, 6), (7, 8, 9)] * 2)
+        self.assert_colors(strip, [(0, 0, 0), (4, 5, 6), (0, 0, 0), (1, 2, 3)])
+
+
+class LayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker()
+
+
+class SharedLayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker(shared_memory=True, floating=False)
+
+
+class SharedFloatLayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker(shared_memory=True, floating=True)
+
+
+class CompactLayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker(compact=True)
+
+
+class IndexedLayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker(indexed=True)
+
+    def test_set_palette(self):
+        strip = self.make_strip(num=3)
+        strip.set_colors([(1, 2, 3), (4, 5, 6), (1, 2, 3)])
+        strip.dirty.clear()
+        strip.set_palette([(0, 0, 0), (7, 8, 9), (1, 1, 1)])
+        self.assert_colors(strip, [(7, 8, 9), (1, 1, 1), (7, 8, 9)])
+        self.assertEqual(strip.dirty.slice(0, 3), (0, 3))
+
+        with self.assertRaises(ValueError):
+            Strip(DriverBase(num=1)).set_palette([(0, 0, 0)])
+
+
+@unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+class NumpyLayoutTest(BaseLayoutTest):
+    maker = data_maker.Maker(use_numpy=True)
+
+
+del BaseLayoutTest  # http://stackoverflow.com/a/22836015/43839
@@ -156,12 +156,68 @@ class BaseMatrixTest(unittest.TestCase):
                     185, 186, 197]
         self.assert_changed(matrix, expected)
 
-    def DISABLED_test_fill_triangle(self):
+    def test_fill_triangle(self):
         matrix = self.make_matrix(width=16, height=16)
         matrix.fillTriangle(0, 0, 11, 4, 5, 12, WHITE)
-        expected = []
+        expected = [
+            0, 29, 30, 31, 32, 33, 34, 35, 36, 37, 55, 56, 57, 58, 59, 60, 61,
+            62, 65, 66, 67, 68, 69, 70, 71, 72, 73, 74, 75, 84, 85, 86, 87, 88,
+            89, 90, 91, 92, 93, 98, 99, 100, 101, 102, 103, 104, 105, 106, 118,
+            119, 120, 121, 122, 123, 124, 125, 131, 132, 133, 134, 135, 136,
+            151, 152, 153, 154, 155, 156, 164, 165, 166, 167, 185, 186, 187,
+            197]
         self.assert_changed(matrix, expected)
 
+    def test_fill_spans_texture(self):
+        # With a texture, spans go one pixel at a time through the setter.
+        for texture in False, True:
+            matrix = self.make_matrix(width=16, height=16)
+            if texture:
+                matrix.setTexture([[WHITE] * 16] * 16)
+            matrix.fillCircle(8, 8, 6)
+            matrix.fillRect(1, 1, 3, 2)
+            changed = [i for i, c in enumerate(matrix._colors) if c[0]]
+            if texture:
+                self.assertEqual(len(changed), 129 + 6)
+            else:
+                self.assertEqual(changed, [])
+
+    def test_fill_clipped(self):
+        matrix = self.make_matrix(width=4, height=4, serpentine=False)
+        matrix.fillRect(-2, 2, 3, 5, WHITE)
+        self.assert_changed(matrix, [8, 12])
+        matrix.fillScreen(WHITE)
+        self.assert_unchanged(matrix, [])
+
+    def test_set_many(self):
+        matrix = self.make_matrix(width=4, height=3)
+        matrix.set_many([(0, 0), (1, 1), (-1, 0), (4, 2)], [WHITE] * 4)
+        self.assert_changed(matrix, [0, 6])
+        self.assertEqual(tuple(matrix.get(1, 1)), WHITE)
+
+    def test_set_block(self):
+        matrix = self.make_matrix(width=4, height=3, serpentine=False)
+        block = [[(i + 1, j + 1, 0) for i in range(3)] for j in range(2)]
+        matrix.set_block(2, 1, block)
+        self.assert_changed(matrix, [6, 7, 10, 11])
+        self.assertEqual(tuple(matrix.get(3, 2)), (2, 2, 0))
+
+        rows = matrix.get_block(1, 1, 3, 3)
+        rows = [[tuple(int(i) for i in c) for c in row] for row in rows]
+        self.assertEqual(rows, [
+            [(0, 0, 0), (1, 1, 0), (2, 1, 0)],
+            [(0, 0, 0), (1, 2, 0), (2, 2, 0)],
+            [(0, 0, 0), (0, 0, 0), (0, 0, 0)]])
+
+    def test_set_block_bytes(self):
+        matrix = self.make_matrix(width=4, height=3, serpentine=False)
+        matrix.set_block(-1, 2, bytes(range(1, 13)), width=2)
+        self.assert_changed(matrix, [8])
+        self.assertEqual(tuple(matrix.get(0, 2)), (4, 5, 6))
+
+        with self.assertRaises(ValueError):
+            matrix.set_block(0, 0, bytes(6))
+
     def test_draw_text(self):
         matrix = self.make_matrix(width=32, height=10)
         matrix.drawText('abc', color=WHITE)
@@ -184,4 +240,17 @@ class SharedMatrixIntegerTest(BaseMatrixTest):
     maker = data_maker.Maker(shared_memory=True, floating=False)
 
 
+class CompactMatrixTest(BaseMatrixTest):
+    maker = data_maker.Maker(compact=True)
+
+
+class IndexedMatrixTest(BaseMatrixTest):
+    maker = data_maker.Maker(indexed=True)
+
+
+@unittest.skipIf(not data_maker.numpy, 'numpy is not installed')
+class NumpyMatrixTest(BaseMatrixTest):
+    maker = data_maker.Maker(use_numpy=True)
+
+
 del BaseMatrixTest  # http://stackoverflow.com/a/22836015/43839
@@ -0,0 +1,68 @@
+import unittest
+
+from bibliopixel.layout import Matrix, TextStrip, font
+from bibliopixel.drivers.driver_base import DriverBase
+
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def make_matrix(width=16, height=8):
+    return Matrix(DriverBase(num=width * height), width=width, height=height)
+
+
+class TextStripTest(unittest.TestCase):
+    def test_dimensions(self):
+        for text in 'Hi', 'Two\nlines', '\nlow', '':
+            strip = TextStrip(text, font_scale=2)
+            self.assertEqual((strip.width, strip.height),
+                             font.str_dim(text, font_scale=2))
+
+    def test_draw_matches_draw_text(self):
+        strip = TextStrip('Hello world', RED, BLUE)
+        for x, y in (0, 0), (-7, 2), (5, -3), (30, 0):
+            expected, actual = make_matrix(), make_matrix()
+            expected.drawText(strip.text, x, y, RED, BLUE)
+            strip.draw(actual, x, y)
+            self.assertEqual(actual._colors, expected._colors)
+
+    def test_draw_lines(self):
+        strip = TextStrip('Hi\n\nthere', RED, BLUE)
+        for x, y in (0, 0), (0, -9):
+            expected, actual = make_matrix(32, 24), make_matrix(32, 24)
+            expected.drawText(strip.text, x, y, RED, BLUE)
+            strip.draw(actual, x, y)
+            self.assertEqual(actual._colors, expected._colors)
+
+    def test_fonts(self):
+        fonts = dict(font.fonts)
+        fonts['tall'] = dict(fonts[font.default_font], height=10)
+        strip = TextStrip('Hi', RED, font='tall', fonts=fonts)
+        self.assertEqual(strip.height, 10)
+
+        matrix = make_matrix()
+        matrix.fonts = fonts
+        expected = make_matrix()
+        expected.fonts = fonts
+        expected.drawText(strip.text, 0, 0, RED, font='tall')
+        strip.draw(matrix)
+        self.assertEqual(matrix._colors, expected._colors)
+
+    def test_invalidate(self):
+        strip = TextStrip('A')
+        bitmap = strip.render()
+        strip.color = RED
+        strip.text = 'A'
+        self.assertIs(strip.render(), bitmap)
+
+        strip.text = 'AB'
+        self.assertIsNot(strip.render(), bitmap)
+        bitmap = strip.render()
+        strip.font_scale = 2
+        self.assertIsNot(strip.render(), bitmap)
+
+
+class StrDimTest(unittest.TestCase):
+    def test_final_sep(self):
+        self.assertEqual(font.str_dim('ABC'), (18, 8))
+        self.assertEqual(font.str_dim('ABC', final_sep=False), (17, 8))
+        self.assertEqual(font.str_dim('AB\nC', final_sep=False), (11, 16))
@@ -0,0 +1,52 @@
+import argparse, contextlib, io, unittest
+
+from bibliopixel.main import bench
+from bibliopixel.util import metrics
+
+PROJECT = {
+    'driver': {'typename': 'simpixel', 'num': 64},
+    'drivers': [{'width': 4, 'height': 4}, {'num': 48}],
+    'layout': {'typename': 'strip'},
+    'animation': {'typename': 'strip_test'},
+    'run': {'fps': 30, 'seconds': 10},
+}
+
+
+class BenchTest(unittest.TestCase):
+    def test_make_bench_project(self):
+        desc = bench.make_bench_project(PROJECT, 20, True)
+        self.assertEqual(desc['driver'], {'typename': 'dummy', 'num': 64})
+        self.assertEqual(desc['drivers'], [{'typename': 'dummy', 'num': 16},
+                                           {'typename': 'dummy', 'num': 48}])
+        self.assertEqual(desc['run'], {'max_steps': 20, 'sleep_time': 0,
+                                       'threaded': False})
+        self.assertEqual(PROJECT['run'], {'fps': 30, 'seconds': 10})
+
+    def test_bench(self):
+        parser = argparse.ArgumentParser()
+        bench.set_parser(parser)
+        args = parser.parse_args(['--dummy', '-f', '5'])
+        desc = dict(PROJECT, drivers=[{'num': 32}, {'num': 32}])
+
+        self.addCleanup(metrics.METRICS.clear)
+        summary, elapsed = bench.bench(args, desc)
+        self.assertEqual(summary['animation.step']['count'], 5)
+        stages = [name for mean, name in bench.stage_times(summary)]
+        self.assertEqual(sorted(stages), [
+            'animation.step',
+            'driver.Dummy.0.compute', 'driver.Dummy.0.send',
+            'driver.Dummy.1.compute', 'driver.Dummy.1.send'])
+
+    def test_report(self):
+        stats = {'count': 2, 'mean': 0.002, 'p95': 0.003, 'p99': 0.004,
+                 'max': None}
+        summary = {'animation.step': stats, 'driver.Dummy.0.bytes': stats}
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            bench.report(summary, 10, 0.5)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], '10 frames in 0.500 seconds: '
+                                   '20.0 frames per second')
+        self.assertEqual(lines[3].split(), [
+            'animation.step', '2.000ms', '3.000ms', '4.000ms', '0.000ms'])
+        self.assertNotIn('bytes', out.getvalue())
@@ -0,0 +1,107 @@
+import unittest
+
+from bibliopixel.project.color_list import ByteColorList, IndexedColorList
+
+
+class ByteColorListTest(unittest.TestCase):
+    def test_list(self):
+        colors, expected = ByteColorList(5), [(0, 0, 0)] * 5
+        self.assertEqual(colors, expected)
+
+        for c in colors, expected:
+            c[1] = (1, 2, 3)
+            c[2:4] = [(4, 5, 6), (7, 8, 9)]
+            c[::2] = [(9, 9, 9)] * 3
+            c[-1] = (1, 1, 1)
+
+        self.assertEqual(colors, expected)
+        for key in -2, slice(1, 3), slice(None, None, -2), slice(3, 1):
+            self.assertEqual(colors[key], expected[key])
+        self.assertEqual(colors.to_bytes(), bytes([9, 9, 9, 1, 2, 3, 9, 9, 9,
+                                                   7, 8, 9, 1, 1, 1]))
+
+        with self.assertRaises(IndexError):
+            colors[5]
+        with self.assertRaises(ValueError):
+            colors[::2] = [(1, 1, 1)]
+
+    def test_clip(self):
+        colors = ByteColorList(2)
+        colors[:] = [(1.7, 300, -4), [4, 5, 6]]
+        self.assertEqual(colors, [(1, 255, 0), (4, 5, 6)])
+
+    def test_copy(self):
+        colors = ByteColorList(3)
+        colors[:] = [(1, 1, 1), (2, 2, 2), (3, 3, 3)]
+        other = ByteColorList(3)
+        other[1:] = colors[:2]
+        self.assertEqual(other, [(0, 0, 0), (1, 1, 1), (2, 2, 2)])
+        self.assertEqual(colors.copy(), colors)
+
+
+class IndexedColorListTest(unittest.TestCase):
+    def test_list(self):
+        colors = IndexedColorList(4)
+        self.assertEqual(colors, [(0, 0, 0)] * 4)
+
+        colors[1] = (1, 2, 3)
+        colors[2:4] = [[4, 5, 6], (1, 2, 3)]
+        self.assertEqual(colors, [(0, 0, 0), (1, 2, 3), (4, 5, 6), (1, 2, 3)])
+        self.assertEqual(colors[-1], (1, 2, 3))
+        self.assertEqual(colors.indices, bytearray([0, 1, 2, 1]))
+        self.assertEqual(colors.to_bytes(), bytes([0, 0, 0, 1, 2, 3,
+                                                   4, 5, 6, 1, 2, 3]))
+
+    def test_slices(self):
+        colors = IndexedColorList(3)
+        colors[:] = [(1, 1, 1), (2, 2, 2), (3, 3, 3)]
+        part = colors[1:]
+        self.assertEqual(part, [(2, 2, 2), (3, 3, 3)])
+
+        other = IndexedColorList(3, [(3, 3, 3)])
+        other[:2] = part
+        self.assertEqual(other, [(2, 2, 2), (3, 3, 3), (3, 3, 3)])
+        self.assertEqual(other.palette, [(3, 3, 3), (2, 2, 2)])
+
+        copy = IndexedColorList(3)
+        copy[:] = colors
+        self.assertEqual(copy.palette, colors.palette)
+        self.assertEqual(copy.indices, colors.indices)
+
+    def test_palette(self):
+        colors = IndexedColorList(2)
+        colors[:] = [(1, 1, 1), (2, 2, 2)]
+        colors.set_palette([(0, 0, 0), (9, 9, 9)])
+        self.assertEqual(colors, [(9, 9, 9), (0, 0, 0)])
+
+        with self.assertRaises(ValueError):
+            colors.set_palette([])
+
+    def test_full_palette(self):
+        colors = IndexedColorList(256, [(i, i, i) for i in range(256)])
+        colors.indices[:] = range(256)
+        colors[0] = (10, 11, 13)
+        self.assertEqual(colors[0], (11, 11, 11))
+        self.assertEqual(len(colors.palette), 256)
+
+    def test_reuse_palette(self):
+        colors = IndexedColorList(4)
+        for i in range(256):
+            colors[:] = [(i, 0, 0)] * 4
+        colors[0] = (0, 0, 255)
+        self.assertEqual(colors, [(0, 0, 255)] + [(255, 0, 0)] * 3)
+
+        # Colors set in one slice keep their entries.
+        colors[:] = [(i, 1, 0) for i in range(4)]
+        self.assertEqual(colors, [(i, 1, 0) for i in range(4)])
+        colors[:] = [(0, 2, i) for i in range(4)]
+        self.assertEqual(colors, [(0, 2, i) for i in range(4)])
+        self.assertEqual(len(colors.palette), 256)
+        self.assertLessEqual(len(colors._lookup), 256)
+
+    def test_reuse_palette_slice(self):
+        colors = IndexedColorList(300)
+        colors[:] = [(i, 0, 0) for i in range(256)] + [(0, 0, 0)] * 44
+        colors[:] = [(0, i, 0) for i in range(300)]
+        self.assertEqual(colors[:256], [(0, i, 0) for i in range(256)])
+        self.assertEqual(colors[256], (0, 255, 0))
@@ -0,0 +1,86 @@
+import multiprocessing, os, unittest
+
+from bibliopixel.animation.animation import BaseAnimation, STATE
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Strip
+from bibliopixel.project import data_maker
+
+SHARED = data_maker.Maker(shared_memory=True, floating=False)
+HAS_FORK = 'fork' in multiprocessing.get_all_start_methods()
+
+
+class Recorder(DriverBase):
+    def _compute_packet(self):
+        self._render()
+
+    def _send_packet(self):
+        self.sent.append(bytes(self._buf))
+
+
+class Counter(BaseAnimation):
+    def __init__(self, layout, fail=False, die=False):
+        super().__init__(layout)
+        self.fail = fail
+        self.die = die
+        self.parent = os.getpid()
+        # Counts every step, in either process.
+        self.steps = multiprocessing.RawValue('i', 0)
+
+    def pre_run(self):
+        self.count = 0
+
+    def step(self, amt=1):
+        if self.fail:
+            raise ValueError('fail')
+        if self.die:
+            os._exit(3)
+        # The count only goes up in the worker.
+        self.steps.value += 1
+        self.count += amt
+        in_worker = os.getpid() != self.parent
+        self.layout.fill((self.count, in_worker, self.cur_step))
+        if self.count == 3:
+            self.completed = True
+
+
+@unittest.skipIf(not HAS_FORK, 'needs the fork start method')
+class AnimationProcessTest(unittest.TestCase):
+    def run_animation(self, maker=SHARED, run=None, **kwds):
+        driver = Recorder(num=2)
+        driver.sent = []
+        animation = Counter(Strip(driver, maker=maker), **kwds)
+        self.animation = animation
+        self.sent = driver.sent
+        animation.set_runner(dict(
+            run or {'until_complete': True}, process=True))
+        animation.start()
+        return animation, driver.sent
+
+    def test_process(self):
+        animation, sent = self.run_animation()
+        self.assertEqual(animation.state, STATE.ready)
+        self.assertEqual(animation.count, 0)
+        self.assertIsNone(animation.animation_process)
+        self.assertEqual(animation.steps.value, 3)
+        self.assertEqual(sent, [bytes((1, 1, 0)) * 2, bytes((2, 1, 1)) * 2,
+                                bytes((3, 1, 2)) * 2, bytes(6)])
+
+    def test_max_steps(self):
+        animation, sent = self.run_animation(run={'max_steps': 2})
+        self.assertEqual(animation.steps.value, 2)
+        self.assertEqual(len(sent), 3)
+
+    def test_failure(self):
+        with self.assertRaises(RuntimeError):
+            self.run_animation(fail=True)
+
+    def test_dead_worker(self):
+        with self.assertRaises(RuntimeError) as e:
+            self.run_animation(die=True)
+        self.assertIn('exit code 3', str(e.exception))
+
+    def test_not_shared(self):
+        with self.assertRaises(ValueError):
+            self.run_animation(maker=data_maker.Maker())
+        # The layout was still cleaned up.
+        self.assertEqual(self.sent, [bytes(6)])
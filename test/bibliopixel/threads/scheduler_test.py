@@ -0,0 +1,81 @@
+import threading, time, unittest
+
+from bibliopixel.threads.scheduler import Scheduler
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.time = 100.0
+
+    def clock(self):
+        return self.time
+
+    def sleep(self, t):
+        self.time += t
+
+
+class SchedulerTest(unittest.TestCase):
+    def make(self, **kwds):
+        self.fake = FakeClock()
+        return Scheduler(clock=self.fake.clock, sleep=self.fake.sleep, **kwds)
+
+    def run_frames(self, scheduler, frame_times, period=0.1):
+        starts = []
+        for t in frame_times:
+            starts.append(round(self.fake.time, 6))
+            self.fake.time += t
+            scheduler.wait(period)
+        return starts
+
+    def test_no_drift(self):
+        s = self.make()
+        starts = self.run_frames(s, [0.03, 0.05, 0.01, 0.07] * 25)
+        self.assertEqual(starts[-1], round(100.03 + 0.1 * 99, 6))
+        self.assertEqual(s.skipped, 0)
+        self.assertEqual(s.jitter['max'], 0)
+
+    def test_skip(self):
+        s = self.make()
+        starts = self.run_frames(s, [0.01, 0.25, 0.01, 0.01])
+        self.assertEqual(starts, [100.0, 100.11, 100.41, 100.51])
+        self.assertEqual(s.skipped, 2)
+
+    def test_catch_up(self):
+        s = self.make(overrun='catch_up')
+        starts = self.run_frames(s, [0.01, 0.25, 0.01, 0.01])
+        self.assertEqual(starts, [100.0, 100.11, 100.36, 100.37])
+        self.assertAlmostEqual(s.jitter['max'], 0.15)
+
+    def test_catch_up_late(self):
+        s = self.make(overrun='catch_up')
+        late = []
+        for t in 0.01, 0.25, 0.01, 0.01:
+            self.fake.time += t
+            late.append(s.wait(0.1))
+        self.assertEqual(late, [0, 2, 1, 0])
+        self.assertEqual(s.skipped, 0)
+
+    def test_period_change(self):
+        s = self.make()
+        self.run_frames(s, [0.01, 0.01])
+        starts = self.run_frames(s, [0.01, 0.01], period=0.5)
+        self.assertEqual(starts, [100.21, 100.72])
+
+    def test_bad_overrun(self):
+        with self.assertRaises(ValueError):
+            Scheduler(overrun='wait')
+
+    def test_spin(self):
+        s = Scheduler(spin_time=0.002)
+        s.wait(0.005)
+        s.wait(0.005)
+        self.assertGreaterEqual(time.perf_counter(), s.deadline)
+        self.assertLess(s.jitter['last'], 0.002)
+
+    def test_stop_event(self):
+        s = Scheduler()
+        stop = threading.Event()
+        stop.set()
+        start = time.perf_counter()
+        s.wait(10, stop)
+        self.assertLess(time.perf_counter() - start, 1)
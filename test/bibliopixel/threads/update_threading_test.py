@@ -0,0 +1,50 @@
+import threading, unittest
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Strip
+
+
+class UpdateThreadingTest(unittest.TestCase):
+    def make_layout(self, count):
+        self.events = []
+        lock = threading.Lock()
+        test = self
+
+        class Recorder(DriverBase):
+            def _send_packet(self):
+                with lock:
+                    test.events.append(('send', self, self._colors[0]))
+
+            def sync(self):
+                test.events.append(('sync', self))
+
+        self.drivers = [Recorder(num=2) for i in range(count)]
+        layout = Strip(self.drivers, threadedUpdate=True)
+        self.addCleanup(layout.threading.stop)
+        return layout
+
+    def test_frames(self):
+        layout = self.make_layout(4)
+        for i in range(5):
+            layout.fill((i, i, i))
+            layout.push_to_driver()
+            layout.threading.wait_for_update()
+
+            # Every driver sends the frame before any driver syncs.
+            frame = self.events[-8:]
+            self.assertEqual(sorted(e[0] for e in frame), 4 * ['send'] +
+                             4 * ['sync'])
+            self.assertEqual([e[0] for e in frame[:4]], 4 * ['send'])
+            self.assertEqual([e[1] for e in frame[4:]], self.drivers)
+            self.assertEqual({e[2] for e in frame[:4]}, {(i, i, i)})
+
+        self.assertEqual(len(self.events), 40)
+
+    def test_driver_exception(self):
+        layout = self.make_layout(2)
+        self.drivers[0]._send_packet = None  # Raises TypeError.
+        layout.push_to_driver()
+        layout.push_to_driver()
+        layout.threading.wait_for_update()
+        self.assertEqual([e[0] for e in self.events], 2 * ['send', 'sync',
+                                                           'sync'])
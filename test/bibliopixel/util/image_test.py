@@ -0,0 +1,126 @@
+import os, tempfile, unittest
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Matrix
+from bibliopixel.util import image
+
+RED, BLUE = (255, 0, 0), (0, 0, 255)
+
+
+def make_matrix(width=4, height=3):
+    return Matrix(DriverBase(num=width * height), width=width, height=height,
+                  serpentine=False)
+
+
+@unittest.skipIf(not image.Image, 'PIL is not installed')
+class ImageTest(unittest.TestCase):
+    def make_image(self):
+        img = image.Image.new('RGBA', (2, 2), RED + (255,))
+        img.putpixel((1, 0), (0, 255, 0, 0))
+        img.putpixel((0, 1), (0, 0, 254, 128))
+        return img
+
+    def test_render(self):
+        img = self.make_image()
+        self.assertEqual(
+            image.render_image(4, 3, image_obj=img, offset=(-1, 2),
+                               bgcolor=BLUE, brightness=128),
+            (0, 2, 1, bytes((0, 0, 127))))
+        self.assertEqual(image.render_image(4, 3, image_obj=img,
+                                            offset=(4, 0)), (0, 0, 0, b''))
+
+    def test_show_image(self):
+        matrix = make_matrix()
+        matrix.fill(BLUE)
+        image.showImage(matrix, imageObj=self.make_image(), offset=(1, 1))
+        self.assertEqual(matrix._colors, [
+            (0, 0, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0),
+            (0, 0, 0), RED, (0, 0, 0), (0, 0, 0),
+            (0, 0, 0), (0, 0, 127), RED, (0, 0, 0)])
+
+        texture = image.loadImage(matrix, imageObj=self.make_image(),
+                                  offset=(1, 1))
+        self.assertEqual(texture, [
+            [(0, 0, 0)] * 4,
+            [(0, 0, 0), RED, (0, 0, 0), (0, 0, 0)],
+            [(0, 0, 0), (0, 0, 127), RED, (0, 0, 0)]])
+
+        colors = []
+        image.show_image(lambda x, y, c: colors.append((x, y, c)), 4, 3,
+                         image_obj=self.make_image(), offset=(3, 2))
+        self.assertEqual(colors, [(3, 2, RED)])
+
+    def test_cache(self):
+        fd, path = tempfile.mkstemp(suffix='.png')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        self.make_image().save(path)
+        first = image.render_image(4, 3, path)
+        self.assertIs(image.render_image(4, 3, path), first)
+
+        image.Image.new('RGB', (2, 2), BLUE).save(path)
+        os.utime(path, (0, 0))
+        self.assertEqual(image.render_image(4, 3, path),
+                         (0, 0, 2, bytes(BLUE) * 4))
+
+
+@unittest.skipIf(not image.Image, 'PIL is not installed')
+class FramesTest(unittest.TestCase):
+    COLORS = [(i, 2 * i, 3 * i) for i in range(0, 80, 8)]
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def make_path(self, *parts):
+        return os.path.join(self.directory.name, *parts)
+
+    def make_gif(self):
+        path = self.make_path('test.gif')
+        frames = [image.Image.new('RGB', (4, 2), c) for c in self.COLORS]
+        frames[0].save(path, save_all=True, append_images=frames[1:])
+        return path
+
+    def test_gif(self):
+        frames = image.Frames(self.make_gif())
+        self.assertEqual(len(frames), 10)
+        self.assertEqual([bytes(f) for f in frames],
+                         [bytes(c) * 8 for c in self.COLORS])
+
+    def test_directory(self):
+        os.mkdir(self.make_path('frames'))
+        for i, c in enumerate(self.COLORS):
+            image.Image.new('RGB', (3, 3), c).save(
+                self.make_path('frames', 'frame%d.png' % i))
+
+        frames = image.Frames(self.make_path('frames'), size=(2, 1),
+                              stretch=True)
+        self.assertEqual(len(frames), 10)
+        self.assertEqual(list(frames), [bytes(c) * 2 for c in self.COLORS])
+
+    def test_cache(self):
+        cache_dir = self.make_path('cache')
+        frames = image.Frames(self.make_gif(), (4, 2), cache_dir, prefetch=1)
+
+        # Stopping part way through doesn't leave anything in the cache.
+        for f in frames:
+            break
+        self.assertEqual(os.listdir(cache_dir), [])
+
+        expected = [bytes(c) * 8 for c in self.COLORS]
+        self.assertEqual(list(frames), expected)
+        self.assertTrue(os.path.exists(frames.cache_file()))
+
+        frames._decode = None
+        cached = list(frames)
+        self.assertIsInstance(cached[0], memoryview)
+        self.assertEqual([bytes(f) for f in cached], expected)
+
+    def test_numbered_files(self):
+        for name in 'a10.png', 'a2.png', 'a1.png':
+            open(self.make_path(name), 'w').close()
+        os.mkdir(self.make_path('a3'))
+        files = image.numbered_files(self.directory.name)
+        self.assertEqual([os.path.basename(f) for f in files],
+                         ['a1.png', 'a2.png', 'a10.png'])
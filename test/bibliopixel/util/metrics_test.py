@@ -0,0 +1,61 @@
+import unittest
+
+from bibliopixel.drivers.driver_base import DriverBase
+from bibliopixel.layout import Strip
+from bibliopixel.util import metrics
+
+
+class HistogramTest(unittest.TestCase):
+    def test_empty(self):
+        h = metrics.Histogram()
+        self.assertIsNone(h.percentile(50))
+        self.assertEqual(h.summary()['count'], 0)
+
+    def test_percentiles(self):
+        h = metrics.Histogram()
+        for i in range(1, 1001):
+            h.record(i / 1000)
+
+        s = h.summary()
+        self.assertEqual((s['count'], s['min'], s['max']), (1000, 0.001, 1))
+        self.assertAlmostEqual(s['mean'], 0.5005)
+        for p in metrics.PERCENTILES:
+            # Buckets are about 9% wide.
+            self.assertGreaterEqual(s['p%d' % p], p / 100)
+            self.assertLess(s['p%d' % p], 1.1 * p / 100)
+
+    def test_range(self):
+        h = metrics.Histogram(minimum=1, octaves=4)
+        h.record(0)
+        h.record(1000)
+        self.assertEqual(h.percentile(50), 1)
+        self.assertEqual(h.percentile(100), 1000)
+        h.clear()
+        self.assertEqual(h.count, 0)
+
+
+class MetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = metrics.METRICS
+        self.metrics.clear()
+        self.addCleanup(metrics.disable)
+        self.addCleanup(self.metrics.clear)
+
+    def test_disabled(self):
+        self.metrics.record('test', 1)
+        with self.metrics.timer('timer'):
+            pass
+        self.assertEqual(self.metrics.summary(), {})
+
+    def test_drivers(self):
+        metrics.enable()
+        layout = Strip([DriverBase(num=2), DriverBase(num=3)])
+        for i in range(4):
+            layout.push_to_driver()
+
+        summary = self.metrics.summary('driver.DriverBase.1')
+        self.assertEqual(sorted(summary), [
+            'driver.DriverBase.1.bytes', 'driver.DriverBase.1.compute',
+            'driver.DriverBase.1.packets', 'driver.DriverBase.1.send'])
+        self.assertEqual(summary['driver.DriverBase.1.bytes']['max'], 9)
+        self.assertEqual(summary['driver.DriverBase.1.send']['count'], 4)